@@ -4,6 +4,15 @@ from flask_cors import CORS
 from typing import Optional
 from src.shared import db, migrate
 from src.shared.config import config
+from src.shared.query_profiler import QueryProfiler
+from src.shared.entity_cache import EntityCache
+from src.shared.password_hasher import PasswordHasher
+from src.shared.rate_limit import RateLimiter
+from src.shared.idempotency import Idempotency
+from src.raffle_service.services.hold_store import ReservationHoldStore
+from src.raffle_service.services.availability_index import AvailabilityIndex
+from src.prize_service.services.deadline_scheduler import DeadlineScheduler
+from src.prize_service.services.prize_catalog import PrizeCatalog
 from src.user_service.routes.user_routes import user_bp
 from src.raffle_service.routes.raffle_routes import raffle_bp
 from src.raffle_service.routes.admin_routes import raffle_admin_bp
@@ -32,8 +41,13 @@ def create_app(config_name: str = 'development') -> Flask:
              r"/api/*": {
                  "origins": ["http://localhost:5175"],
                  "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-                 "allow_headers": ["Content-Type", "Authorization", "Accept"],
-                 "expose_headers": ["Content-Type", "Authorization"],
+                 "allow_headers": ["Content-Type", "Authorization", "Accept", "X-Queue-Token",
+                                   "Idempotency-Key"],
+                 "expose_headers": [
+                     "Content-Type", "Authorization",
+                     "X-Query-Count", "X-Query-Time-Ms", "X-Query-Max-Repeats", "X-Entity-Cache-Hits",
+                     "Retry-After", "Idempotent-Replayed"
+                 ],
                  "supports_credentials": True,
                  "send_wildcard": False
              }
@@ -42,6 +56,15 @@ def create_app(config_name: str = 'development') -> Flask:
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
+    QueryProfiler.init_app(app)
+    EntityCache.init_app(app)
+    PasswordHasher.init_app(app)
+    RateLimiter.init_app(app)
+    Idempotency.init_app(app)
+    ReservationHoldStore.init_app(app)
+    DeadlineScheduler.init_app(app)
+    PrizeCatalog.init_app(app)
+    AvailabilityIndex.init_app(app)
     
     # Register blueprints with explicit prefixes
     app.register_blueprint(user_bp, url_prefix='/api/users')
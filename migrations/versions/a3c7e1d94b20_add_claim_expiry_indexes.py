@@ -0,0 +1,41 @@
+# migrations/versions/a3c7e1d94b20_add_claim_expiry_indexes.py
+
+"""add claim expiry indexes
+
+Revision ID: a3c7e1d94b20
+Revises: f278d4afccfc
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a3c7e1d94b20'
+down_revision = 'f278d4afccfc'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('prize_allocations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('instance_identifier', sa.String(length=100), nullable=True))
+        batch_op.create_index('idx_allocation_claim_deadline', ['claim_status', 'claim_deadline'], unique=False)
+        batch_op.create_index('idx_allocation_instance', ['instance_identifier'], unique=False)
+
+    with op.batch_alter_table('prize_instances', schema=None) as batch_op:
+        batch_op.create_index('idx_instance_claim_deadline', ['status', 'claim_deadline'], unique=False)
+
+    with op.batch_alter_table('instant_wins', schema=None) as batch_op:
+        batch_op.create_index('ix_instant_wins_prize_reference', ['prize_reference'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('instant_wins', schema=None) as batch_op:
+        batch_op.drop_index('ix_instant_wins_prize_reference')
+
+    with op.batch_alter_table('prize_instances', schema=None) as batch_op:
+        batch_op.drop_index('idx_instance_claim_deadline')
+
+    with op.batch_alter_table('prize_allocations', schema=None) as batch_op:
+        batch_op.drop_index('idx_allocation_instance')
+        batch_op.drop_index('idx_allocation_claim_deadline')
+        batch_op.drop_column('instance_identifier')
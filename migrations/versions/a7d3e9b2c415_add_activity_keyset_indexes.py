@@ -0,0 +1,29 @@
+# migrations/versions/a7d3e9b2c415_add_activity_keyset_indexes.py
+
+"""add user activity keyset indexes
+
+Revision ID: a7d3e9b2c415
+Revises: f6b2c9d4e803
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9b2c415'
+down_revision = 'f6b2c9d4e803'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('user_activities', schema=None) as batch_op:
+        batch_op.create_index('idx_activity_user_created', ['user_id', 'created_at'], unique=False)
+        batch_op.create_index('idx_activity_type_status_created', ['activity_type', 'status', 'created_at'], unique=False)
+        batch_op.create_index('idx_activity_created', ['created_at'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('user_activities', schema=None) as batch_op:
+        batch_op.drop_index('idx_activity_created')
+        batch_op.drop_index('idx_activity_type_status_created')
+        batch_op.drop_index('idx_activity_user_created')
@@ -0,0 +1,29 @@
+# migrations/versions/b81f5c2e7a44_add_leader_leases.py
+
+"""add leader leases
+
+Revision ID: b81f5c2e7a44
+Revises: a3c7e1d94b20
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b81f5c2e7a44'
+down_revision = 'a3c7e1d94b20'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('leader_leases',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('holder', sa.String(length=128), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('acquired_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+def downgrade():
+    op.drop_table('leader_leases')
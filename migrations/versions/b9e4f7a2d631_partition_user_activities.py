@@ -0,0 +1,142 @@
+# migrations/versions/b9e4f7a2d631_partition_user_activities.py
+
+"""partition user activities by month
+
+Revision ID: b9e4f7a2d631
+Revises: a7d3e9b2c415
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b9e4f7a2d631'
+down_revision = 'a7d3e9b2c415'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('idx_activity_user_created', 'user_id, created_at'),
+    ('idx_activity_type_status_created', 'activity_type, status, created_at'),
+    ('idx_activity_created', 'created_at'),
+)
+
+def _months(first, last):
+    current = first.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    while current <= last:
+        following = current.replace(year=current.year + current.month // 12, month=current.month % 12 + 1)
+        yield current, following
+        current = following
+
+def upgrade():
+    op.create_table('activity_partitions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('range_start', sa.DateTime(), nullable=False),
+        sa.Column('range_end', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('detached_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    with op.batch_alter_table('activity_partitions', schema=None) as batch_op:
+        batch_op.create_index('ix_activity_partitions_range_end', ['range_end'], unique=False)
+
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite rotates tables instead; AUTOINCREMENT keeps ids unique across rotations
+        with op.batch_alter_table('user_activities', recreate='always',
+                                  table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+            pass
+        return
+
+    # Native range partitioning; the primary key must include the partition key
+    op.execute("ALTER TABLE user_activities RENAME TO user_activities_legacy")
+    op.execute("ALTER SEQUENCE user_activities_id_seq OWNED BY NONE")
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("""
+        CREATE TABLE user_activities (
+            id INTEGER NOT NULL DEFAULT nextval('user_activities_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            activity_type VARCHAR(50) NOT NULL,
+            ip_address VARCHAR(45),
+            user_agent VARCHAR(255),
+            status VARCHAR(20),
+            details JSON,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE user_activities_id_seq OWNED BY user_activities.id")
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON user_activities ({columns})")
+
+    now = datetime.utcnow()
+    bounds = bind.execute(sa.text(
+        "SELECT MIN(created_at), MAX(created_at) FROM user_activities_legacy"
+    )).first()
+    first = bounds[0] or now
+    last = max(bounds[1] or now, now)
+    # One month of headroom; the maintenance job keeps creating them ahead
+    last = last.replace(year=last.year + last.month // 12, month=last.month % 12 + 1)
+
+    partitions = sa.table('activity_partitions',
+        sa.column('name', sa.String), sa.column('range_start', sa.DateTime),
+        sa.column('range_end', sa.DateTime), sa.column('status', sa.String),
+        sa.column('created_at', sa.DateTime)
+    )
+    rows = []
+    for start, end in _months(first, last):
+        name = f"user_activities_{start:%Y%m}"
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF user_activities "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        rows.append({'name': name, 'range_start': start, 'range_end': end,
+                     'status': 'attached', 'created_at': now})
+    op.bulk_insert(partitions, rows)
+    # Catches rows outside every month (backdated, or past the headroom if the
+    # maintenance job lapses); ensure_partitions moves them into their month
+    op.execute("CREATE TABLE user_activities_default PARTITION OF user_activities DEFAULT")
+
+    op.execute("""
+        INSERT INTO user_activities
+            (id, user_id, activity_type, ip_address, user_agent, status, details, created_at)
+        SELECT id, user_id, activity_type, ip_address, user_agent, status, details,
+               COALESCE(created_at, now() AT TIME ZONE 'utc')
+        FROM user_activities_legacy
+    """)
+    op.execute("DROP TABLE user_activities_legacy")
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("ALTER TABLE user_activities RENAME TO user_activities_partitioned")
+        op.execute("ALTER SEQUENCE user_activities_id_seq OWNED BY NONE")
+        for name, _ in INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+        op.execute("""
+            CREATE TABLE user_activities (
+                id INTEGER NOT NULL DEFAULT nextval('user_activities_id_seq') PRIMARY KEY,
+                user_id INTEGER NOT NULL REFERENCES users(id),
+                activity_type VARCHAR(50) NOT NULL,
+                ip_address VARCHAR(45),
+                user_agent VARCHAR(255),
+                status VARCHAR(20),
+                details JSON,
+                created_at TIMESTAMP WITHOUT TIME ZONE
+            )
+        """)
+        op.execute("ALTER SEQUENCE user_activities_id_seq OWNED BY user_activities.id")
+        for name, columns in INDEXES:
+            op.execute(f"CREATE INDEX {name} ON user_activities ({columns})")
+        op.execute("INSERT INTO user_activities SELECT * FROM user_activities_partitioned")
+        op.execute("DROP TABLE user_activities_partitioned CASCADE")
+
+    with op.batch_alter_table('activity_partitions', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_partitions_range_end')
+    op.drop_table('activity_partitions')
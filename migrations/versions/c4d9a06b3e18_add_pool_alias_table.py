@@ -0,0 +1,27 @@
+# migrations/versions/c4d9a06b3e18_add_pool_alias_table.py
+
+"""add pool alias table
+
+Revision ID: c4d9a06b3e18
+Revises: b81f5c2e7a44
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c4d9a06b3e18'
+down_revision = 'b81f5c2e7a44'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('prize_pools', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('alias_table', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('alias_version', sa.Integer(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table('prize_pools', schema=None) as batch_op:
+        batch_op.drop_column('alias_version')
+        batch_op.drop_column('alias_table')
@@ -0,0 +1,35 @@
+# migrations/versions/c4f8a1d7e390_add_idempotency_keys.py
+
+"""add idempotency keys
+
+Revision ID: c4f8a1d7e390
+Revises: b9e4f7a2d631
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c4f8a1d7e390'
+down_revision = 'b9e4f7a2d631'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('idempotency_keys',
+        sa.Column('key_hash', sa.LargeBinary(length=32), nullable=False),
+        sa.Column('fingerprint', sa.LargeBinary(length=32), nullable=False),
+        sa.Column('status_code', sa.SmallInteger(), nullable=True),
+        sa.Column('response', sa.LargeBinary(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key_hash')
+    )
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.create_index('ix_idempotency_keys_expires_at', ['expires_at'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.drop_index('ix_idempotency_keys_expires_at')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,45 @@
+# migrations/versions/d2e8b7f1c560_unique_prize_instance_id.py
+
+"""unique index on prize_instances.instance_id
+
+Replaces the column-level UNIQUE constraint (unnamed on SQLite,
+prize_instances_instance_id_key on PostgreSQL) with a named unique index,
+so the column is not indexed twice.
+
+Revision ID: d2e8b7f1c560
+Revises: c4d9a06b3e18
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd2e8b7f1c560'
+down_revision = 'c4d9a06b3e18'
+branch_labels = None
+depends_on = None
+
+# Names the unnamed SQLite constraint so batch mode can drop it
+naming_convention = {'uq': 'uq_%(table_name)s_%(column_0_name)s'}
+
+def _instance_id_constraint():
+    constraints = sa.inspect(op.get_bind()).get_unique_constraints('prize_instances')
+    for constraint in constraints:
+        if constraint['column_names'] == ['instance_id']:
+            return constraint['name'] or 'uq_prize_instances_instance_id'
+    return None
+
+def upgrade():
+    constraint = _instance_id_constraint()
+    with op.batch_alter_table('prize_instances', schema=None,
+                              naming_convention=naming_convention) as batch_op:
+        if constraint:
+            batch_op.drop_constraint(constraint, type_='unique')
+        batch_op.create_index('ux_prize_instances_instance_id', ['instance_id'], unique=True)
+
+def downgrade():
+    with op.batch_alter_table('prize_instances', schema=None,
+                              naming_convention=naming_convention) as batch_op:
+        batch_op.drop_index('ux_prize_instances_instance_id')
+        batch_op.create_unique_constraint('prize_instances_instance_id_key', ['instance_id'])
@@ -0,0 +1,38 @@
+# migrations/versions/d5a9c2e8f174_add_ticket_reservation_holds.py
+
+"""add ticket reservation holds
+
+Revision ID: d5a9c2e8f174
+Revises: c4f8a1d7e390
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9c2e8f174'
+down_revision = 'c4f8a1d7e390'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reservation_id', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('reserved_until', sa.DateTime(), nullable=True))
+        batch_op.create_foreign_key('fk_tickets_reservation_id', 'ticket_reservations',
+                                    ['reservation_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_index('idx_ticket_reservation', ['reservation_id'], unique=False)
+
+    with op.batch_alter_table('ticket_reservations', schema=None) as batch_op:
+        batch_op.create_index('idx_reservation_status_expires', ['status', 'expires_at'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('ticket_reservations', schema=None) as batch_op:
+        batch_op.drop_index('idx_reservation_status_expires')
+
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.drop_index('idx_ticket_reservation')
+        batch_op.drop_constraint('fk_tickets_reservation_id', type_='foreignkey')
+        batch_op.drop_column('reserved_until')
+        batch_op.drop_column('reservation_id')
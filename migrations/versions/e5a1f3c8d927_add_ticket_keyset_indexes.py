@@ -0,0 +1,27 @@
+# migrations/versions/e5a1f3c8d927_add_ticket_keyset_indexes.py
+
+"""add ticket keyset indexes
+
+Revision ID: e5a1f3c8d927
+Revises: d2e8b7f1c560
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5a1f3c8d927'
+down_revision = 'd2e8b7f1c560'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.create_index('idx_ticket_raffle_keyset', ['raffle_id', 'id'], unique=False)
+        batch_op.create_index('idx_ticket_raffle_status', ['raffle_id', 'status', 'id'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.drop_index('idx_ticket_raffle_status')
+        batch_op.drop_index('idx_ticket_raffle_keyset')
@@ -0,0 +1,54 @@
+# migrations/versions/e7b3d1f9a426_replace_ticket_strings_with_ordinal.py
+
+"""replace ticket_id/ticket_number strings with an integer ordinal
+
+Revision ID: e7b3d1f9a426
+Revises: d5a9c2e8f174
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3d1f9a426'
+down_revision = 'd5a9c2e8f174'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ordinal', sa.Integer(), nullable=True))
+
+    op.execute("UPDATE tickets SET ordinal = CAST(ticket_number AS INTEGER)")
+
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.alter_column('ordinal', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_index('idx_ticket_raffle_number')
+        batch_op.drop_index('idx_ticket_id')
+        batch_op.create_index('idx_ticket_raffle_ordinal', ['raffle_id', 'ordinal'], unique=True)
+        batch_op.drop_column('ticket_number')
+        batch_op.drop_column('ticket_id')
+
+def downgrade():
+    # ticket_number was String(3); raffles past 999 tickets cannot go back
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ticket_id', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('ticket_number', sa.String(length=3), nullable=True))
+
+    op.execute("""
+        UPDATE tickets SET ticket_number = CASE
+            WHEN ordinal < 10 THEN '00' || CAST(ordinal AS VARCHAR)
+            WHEN ordinal < 100 THEN '0' || CAST(ordinal AS VARCHAR)
+            ELSE CAST(ordinal AS VARCHAR)
+        END
+    """)
+    op.execute("UPDATE tickets SET ticket_id = CAST(raffle_id AS VARCHAR) || '-' || ticket_number")
+
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.alter_column('ticket_id', existing_type=sa.String(length=20), nullable=False)
+        batch_op.alter_column('ticket_number', existing_type=sa.String(length=3), nullable=False)
+        batch_op.drop_index('idx_ticket_raffle_ordinal')
+        batch_op.create_index('idx_ticket_id', ['ticket_id'], unique=True)
+        batch_op.create_index('idx_ticket_raffle_number', ['raffle_id', 'ticket_number'], unique=True)
+        batch_op.drop_column('ordinal')
@@ -0,0 +1,25 @@
+# migrations/versions/f6b2c9d4e803_add_ticket_user_raffle_index.py
+
+"""add ticket user/raffle index
+
+Revision ID: f6b2c9d4e803
+Revises: e5a1f3c8d927
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f6b2c9d4e803'
+down_revision = 'e5a1f3c8d927'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.create_index('idx_ticket_user_raffle', ['user_id', 'raffle_id'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.drop_index('idx_ticket_user_raffle')
@@ -0,0 +1,79 @@
+# scripts/benchmark_login.py
+"""Measure login latency through the bounded password hashing pool.
+
+    python scripts/benchmark_login.py --logins 50
+    python scripts/benchmark_login.py --burst 64
+
+Serial mode compares /api/users/login against calling werkzeug's
+check_password_hash inline, so the thread hand-off cost of the pool is
+visible next to the hash itself. Burst mode fires concurrent logins and
+reports how many were admitted and how many got a fast 429.
+"""
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from werkzeug.security import check_password_hash
+from app import create_app
+from src.shared import db
+from src.shared.password_hasher import FailedLoginCache
+from src.user_service.models import User
+
+PASSWORD = 'benchmark-password'
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    return (statistics.median(ordered) * 1000,
+            ordered[int(len(ordered) * 0.95) - 1] * 1000)
+
+def run(logins, burst):
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', auth_provider='local')
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+        password_hash = user.password_hash
+
+    client = app.test_client()
+    body = {'username': 'bench', 'password': PASSWORD}
+
+    inline, pooled = [], []
+    for _ in range(logins):
+        started = time.perf_counter()
+        check_password_hash(password_hash, PASSWORD)
+        inline.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        response = client.post('/api/users/login', json=body)
+        pooled.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.get_json()
+
+    print(f"inline hash     median {_percentiles(inline)[0]:7.1f} ms  p95 {_percentiles(inline)[1]:7.1f} ms")
+    print(f"login endpoint  median {_percentiles(pooled)[0]:7.1f} ms  p95 {_percentiles(pooled)[1]:7.1f} ms")
+
+    if burst:
+        FailedLoginCache.clear()
+        with ThreadPoolExecutor(max_workers=burst) as pool:
+            statuses = list(pool.map(
+                lambda _: app.test_client().post('/api/users/login', json=body).status_code,
+                range(burst)
+            ))
+        print(f"burst of {burst}: {statuses.count(200)} admitted, {statuses.count(429)} refused (429)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark login latency')
+    parser.add_argument('--logins', type=int, default=30)
+    parser.add_argument('--burst', type=int, default=0, help='Concurrent logins to fire afterwards')
+    args = parser.parse_args()
+    run(args.logins, args.burst)
+
+if __name__ == '__main__':
+    main()
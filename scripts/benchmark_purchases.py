@@ -0,0 +1,128 @@
+# scripts/benchmark_purchases.py
+"""Compare per-request ticket purchases against per-raffle coalescing.
+
+    python scripts/benchmark_purchases.py --buyers 200 --concurrency 32
+
+Both modes run the same burst of single-raffle purchases against a file
+SQLite database. Per-request mode opens one transaction per buyer (limit
+claim upsert, locked random fetch, row updates); coalesced mode
+submits through PurchaseCoalescer so one writer serves each batch.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from src.shared import db
+from src.shared.config import config
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus
+from src.raffle_service.services.purchase_coalescer import PurchaseCoalescer
+from src.raffle_service.services.purchase_limit_service import PurchaseLimitService
+from src.user_service.models import User
+
+def _setup(app, buyers, quantity):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        users = [User(username=f'buyer{n}', email=f'buyer{n}@example.com') for n in range(buyers)]
+        db.session.add_all(users)
+        db.session.flush()
+        raffle = Raffle(
+            title='Benchmark', total_tickets=buyers * quantity, ticket_price=1.0,
+            start_time=datetime.now(timezone.utc) - timedelta(hours=1),
+            end_time=datetime.now(timezone.utc) + timedelta(days=1),
+            status=RaffleStatus.ACTIVE.value, max_tickets_per_user=quantity,
+            created_by_id=users[0].id
+        )
+        db.session.add(raffle)
+        db.session.flush()
+        db.session.add_all([
+            Ticket(raffle_id=raffle.id, ordinal=n, status=TicketStatus.AVAILABLE.value)
+            for n in range(1, buyers * quantity + 1)
+        ])
+        db.session.commit()
+        return raffle.id, [u.id for u in users]
+
+def _per_request(raffle_id, user_id, quantity):
+    """One transaction per buyer, as TicketService does without coalescing"""
+    error = None
+    for attempt in range(50):
+        try:
+            _, error = PurchaseLimitService.claim_purchase(user_id, raffle_id, quantity)
+            if error and not error.startswith('Database error'):
+                return error
+            if error:
+                raise OperationalError(error, None, None)
+            tickets = Ticket.query.filter_by(
+                raffle_id=raffle_id, status=TicketStatus.AVAILABLE.value
+            ).with_for_update().order_by(func.random()).limit(quantity).all()
+            now = datetime.now(timezone.utc)
+            for ticket in tickets:
+                ticket.user_id = user_id
+                ticket.status = TicketStatus.SOLD.value
+                ticket.purchase_time = now
+            db.session.commit()
+            return None
+        except OperationalError:
+            # SQLite allows one writer; back off and retry like a client would
+            db.session.rollback()
+            time.sleep(0.005 * (attempt + 1))
+    return error
+
+def _run(app, mode, buyers, quantity, concurrency):
+    raffle_id, user_ids = _setup(app, buyers, quantity)
+
+    def buy(user_id):
+        with app.app_context():
+            started = time.perf_counter()
+            if mode == 'coalesced':
+                _, error = PurchaseCoalescer.submit(raffle_id, user_id, quantity)
+            else:
+                error = _per_request(raffle_id, user_id, quantity)
+            db.session.remove()
+            return time.perf_counter() - started, error
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(buy, user_ids))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = [error for _, error in results if error]
+    with app.app_context():
+        sold = Ticket.query.filter_by(raffle_id=raffle_id, status=TicketStatus.SOLD.value).count()
+    print(f"{mode:<12} {buyers / elapsed:8.0f} purchases/s  "
+          f"median {statistics.median(latencies) * 1000:7.1f} ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.1f} ms  "
+          f"sold {sold}  errors {len(errors)}")
+
+def run(buyers, quantity, concurrency):
+    with tempfile.TemporaryDirectory() as tmp:
+        testing = config['testing']
+        testing.SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        testing.SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 1, 'check_same_thread': False}}
+        testing.QUERY_PROFILING = False
+        app = create_app('testing')
+        for mode in ('per-request', 'coalesced'):
+            _run(app, mode, buyers, quantity, concurrency)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent ticket purchases')
+    parser.add_argument('--buyers', type=int, default=200)
+    parser.add_argument('--quantity', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+    run(args.buyers, args.quantity, args.concurrency)
+
+if __name__ == '__main__':
+    main()
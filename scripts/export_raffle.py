@@ -0,0 +1,71 @@
+# scripts/export_raffle.py
+"""Export a raffle's tickets, instant wins and draw results.
+
+    python scripts/export_raffle.py 12 --format ndjson --gzip
+    python scripts/export_raffle.py 12 --format csv --datasets tickets --cursor <token>
+
+Memory stays flat regardless of raffle size; pass the last row's cursor
+back with --cursor to resume an interrupted export.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import create_app
+from src.raffle_service.services.export_service import (
+    ExportService, ExportStats, EXPORT_DATASETS, EXPORT_FORMATS
+)
+
+def export_raffle(raffle_id, fmt, datasets, output_dir, compress, cursor=None):
+    """Write one file per dataset for CSV, a single file for NDJSON"""
+    app = create_app(os.getenv('FLASK_CONFIG', 'development'))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    suffix = f".{fmt}" + ('.gz' if compress else '')
+    groups = [[d] for d in datasets] if fmt == 'csv' else [datasets]
+
+    with app.app_context():
+        for group in groups:
+            group_cursor = cursor if cursor and ExportService.decode_cursor(cursor)[0][0] in group else None
+            if cursor and fmt == 'csv' and group_cursor is None:
+                continue
+            error = ExportService.validate(fmt, group, group_cursor)
+            if error:
+                print(f"Error: {error}")
+                return 1
+
+            path = output_dir / f"raffle_{raffle_id}_{'_'.join(group)}{suffix}"
+            stats = ExportStats()
+            # Append when resuming so the file continues where it stopped
+            with open(path, 'ab' if group_cursor else 'wb') as out:
+                for chunk in ExportService.stream(
+                    raffle_id, fmt=fmt, datasets=group, cursor=group_cursor,
+                    compress=compress, stats=stats
+                ):
+                    out.write(chunk)
+
+            print(f"{path}: {stats.rows} rows in {stats.elapsed:.2f}s "
+                  f"({stats.rows_per_second:,.0f} rows/s)")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Export raffle ledger data')
+    parser.add_argument('raffle_id', type=int)
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+    parser.add_argument('--datasets', default=','.join(EXPORT_DATASETS),
+                        help='Comma separated subset of: ' + ', '.join(EXPORT_DATASETS))
+    parser.add_argument('--output', default=str(project_root / 'data' / 'exports'))
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('--cursor', help='Resume after the row carrying this cursor')
+    args = parser.parse_args()
+
+    datasets = [d.strip() for d in args.datasets.split(',') if d.strip()]
+    if args.cursor and ExportService.decode_cursor(args.cursor)[1]:
+        parser.error('invalid --cursor')
+    sys.exit(export_raffle(args.raffle_id, args.format, datasets, Path(args.output), args.gzip, args.cursor))
+
+if __name__ == '__main__':
+    main()
@@ -34,7 +34,7 @@ def inspect_database():
             # Get instant win tickets for this raffle
             print("\n--- Instant Win Tickets ---")
             cur.execute("""
-                SELECT t.ticket_id, t.status, iw.status, iw.prize_reference
+                SELECT t.raffle_id || '-' || printf('%03d', t.ordinal), t.status, iw.status, iw.prize_reference
                 FROM tickets t
                 JOIN instant_wins iw ON t.id = iw.ticket_id
                 WHERE t.raffle_id = ? AND t.instant_win = TRUE
@@ -0,0 +1,58 @@
+# scripts/maintain_activity_partitions.py
+"""Create upcoming user activity partitions and apply retention.
+
+    python scripts/maintain_activity_partitions.py
+    python scripts/maintain_activity_partitions.py --retention-months 6 --mode detach
+
+Run daily from cron. On SQLite this also rotates the live table once a
+month has ended. Retention removes whole partitions older than the horizon;
+`detach` keeps the tables for archiving but stops querying them.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import create_app
+from src.user_service.services.activity_partitions import (
+    ActivityPartitionService, RETENTION_MODES
+)
+
+def maintain(retention_months=None, mode=None):
+    app = create_app(os.getenv('FLASK_CONFIG', 'development'))
+    with app.app_context():
+        created, error = ActivityPartitionService.ensure_partitions(
+            months_ahead=app.config['ACTIVITY_PARTITIONS_AHEAD']
+        )
+        if error:
+            print(f"Error: {error}")
+            return 1
+        for name in created:
+            print(f"created {name}")
+
+        purged, error = ActivityPartitionService.purge(
+            retention_months if retention_months is not None else app.config['ACTIVITY_RETENTION_MONTHS'],
+            mode=mode or app.config['ACTIVITY_RETENTION_MODE']
+        )
+        if error:
+            print(f"Error: {error}")
+            return 1
+        for partition in purged:
+            print(f"{partition['action']} {partition['name']} "
+                  f"({partition['range_start']} - {partition['range_end']})")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain user activity partitions')
+    parser.add_argument('--retention-months', type=int,
+                        help='Override ACTIVITY_RETENTION_MONTHS')
+    parser.add_argument('--mode', choices=RETENTION_MODES,
+                        help='Override ACTIVITY_RETENTION_MODE')
+    args = parser.parse_args()
+    sys.exit(maintain(args.retention_months, args.mode))
+
+if __name__ == '__main__':
+    main()
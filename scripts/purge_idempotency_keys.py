@@ -0,0 +1,24 @@
+# scripts/purge_idempotency_keys.py
+"""Delete Idempotency-Key records whose replay window has lapsed.
+
+    python scripts/purge_idempotency_keys.py
+
+Run daily from cron alongside the partition maintenance job.
+"""
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import create_app
+from src.shared.idempotency import Idempotency
+
+def main():
+    app = create_app(os.getenv('FLASK_CONFIG', 'development'))
+    with app.app_context():
+        print(f"purged {Idempotency.purge_expired()} idempotency keys")
+
+if __name__ == '__main__':
+    main()
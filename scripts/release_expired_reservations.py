@@ -0,0 +1,45 @@
+# scripts/release_expired_reservations.py
+"""Expire lapsed ticket reservations and put their tickets back on sale.
+
+    python scripts/release_expired_reservations.py
+    python scripts/release_expired_reservations.py --loop 15
+
+Run every minute from cron, or keep one instance running with --loop.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import create_app
+from src.raffle_service.services.reservation_service import ReservationService, RELEASE_CHUNK_SIZE
+
+def sweep(chunk_size):
+    released, error = ReservationService.release_expired(chunk_size=chunk_size)
+    if error:
+        print(f"Error: {error}")
+        return 1
+    print(f"released {released} reservations")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Release expired ticket reservations')
+    parser.add_argument('--chunk-size', type=int, default=RELEASE_CHUNK_SIZE)
+    parser.add_argument('--loop', type=float, metavar='SECONDS',
+                        help='Keep sweeping at this interval instead of exiting')
+    args = parser.parse_args()
+
+    app = create_app(os.getenv('FLASK_CONFIG', 'development'))
+    with app.app_context():
+        if not args.loop:
+            sys.exit(sweep(args.chunk_size))
+        while True:
+            sweep(args.chunk_size)
+            time.sleep(args.loop)
+
+if __name__ == '__main__':
+    main()
@@ -55,8 +55,7 @@ CREATE TABLE IF NOT EXISTS raffle_status_changes (
 CREATE TABLE IF NOT EXISTS tickets (
     id INTEGER PRIMARY KEY,
     raffle_id INTEGER NOT NULL,
-    ticket_id VARCHAR(20) NOT NULL UNIQUE,
-    ticket_number VARCHAR(3) NOT NULL,
+    ordinal INTEGER NOT NULL,
     user_id INTEGER,
     purchase_time DATETIME,
     status VARCHAR(20) NOT NULL,
@@ -73,8 +72,7 @@ CREATE TABLE IF NOT EXISTS tickets (
 );
 
 -- Create ticket indices
-CREATE INDEX IF NOT EXISTS idx_ticket_id ON tickets(ticket_id);
-CREATE UNIQUE INDEX IF NOT EXISTS idx_ticket_raffle_number ON tickets(raffle_id, ticket_number);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ticket_raffle_ordinal ON tickets(raffle_id, ordinal);
 CREATE INDEX IF NOT EXISTS idx_ticket_reveal ON tickets(raffle_id, user_id, reveal_time);
 
 -- Instant Wins table
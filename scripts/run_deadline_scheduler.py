@@ -0,0 +1,44 @@
+# scripts/run_deadline_scheduler.py
+"""Run the claim deadline scheduler as a dedicated worker process.
+
+Safe to run on several hosts: only the lease holder processes deadlines.
+"""
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import create_app
+from src.prize_service.services.deadline_scheduler import DeadlineScheduler
+
+def run_scheduler():
+    config_name = os.getenv('FLASK_CONFIG', 'development')
+    app = create_app(config_name)
+
+    scheduler = app.extensions.get('deadline_scheduler')
+    if scheduler is None:
+        scheduler = DeadlineScheduler(
+            app,
+            batch_size=app.config['DEADLINE_SCHEDULER_BATCH_SIZE'],
+            reload_interval=app.config['DEADLINE_SCHEDULER_RELOAD_INTERVAL'],
+            leader_lock=app.config['DEADLINE_SCHEDULER_LEADER_LOCK'],
+            lease_ttl=app.config['DEADLINE_SCHEDULER_LEASE_TTL']
+        )
+        scheduler.start()
+
+    print(f"Deadline scheduler running as {scheduler.holder} ({config_name})")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    stop.wait()
+
+    print("Stopping deadline scheduler...")
+    scheduler.stop(timeout=10)
+
+if __name__ == '__main__':
+    run_scheduler()
@@ -45,15 +45,13 @@ def test_instant_win_setup():
             # Create tickets
             print("Creating tickets...")
             for i in range(100):
-                ticket_number = str(i+1).zfill(3)
-                ticket_id = f"{raffle_id}-{ticket_number}"
                 cur.execute("""
                     INSERT INTO tickets (
-                        raffle_id, ticket_id, ticket_number,
+                        raffle_id, ordinal,
                         status, instant_win, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    ) VALUES (?, ?, ?, ?, ?)
                 """, (
-                    raffle_id, ticket_id, ticket_number,
+                    raffle_id, i + 1,
                     'available', False, datetime.now(timezone.utc).isoformat()
                 ))
             
@@ -4,6 +4,7 @@ from flask import Flask
 from flask_migrate import Migrate
 from src.shared import db
 from src.shared.config import config
+from src.shared.query_profiler import QueryProfiler
 import logging
 
 # Configure logging
@@ -18,6 +19,7 @@ def create_app(config_name='default'):
     
     db.init_app(app)
     migrate.init_app(app, db)
+    QueryProfiler.init_app(app)
     
     # Register blueprints
     from src.user_service.routes.user_routes import user_bp
@@ -18,12 +18,17 @@ class ClaimStatus(str, Enum):
     EXPIRED = 'expired'
     CANCELLED = 'cancelled'
 
+# Auto-claim fires once the claim window has less than this remaining
+AUTO_CLAIM_WINDOW = timedelta(hours=1)
+
 class PrizeAllocation(db.Model):
     """Enhanced prize allocation tracking"""
     __tablename__ = 'prize_allocations'
     __table_args__ = (
         Index('idx_allocation_reference', 'reference_type', 'reference_id'),
         Index('idx_allocation_user', 'winner_user_id', 'claim_status'),
+        Index('idx_allocation_claim_deadline', 'claim_status', 'claim_deadline'),
+        Index('idx_allocation_instance', 'instance_identifier'),
         {'extend_existing': True}
     )
 
@@ -36,6 +41,7 @@ class PrizeAllocation(db.Model):
     reference_type = db.Column(db.String(50), nullable=False)  # 'raffle', 'ticket'
     reference_id = db.Column(db.String(100), nullable=False)   # ID of raffle/ticket
     sequence_number = db.Column(db.Integer)  # For ordered draws
+    instance_identifier = db.Column(db.String(100))  # PrizeInstance.instance_id won
     
     # Winner tracking
     winner_user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -70,6 +76,13 @@ class PrizeAllocation(db.Model):
         if 'allocation_config' not in kwargs:
             self.allocation_config = {}
 
+    @property
+    def deadline_utc(self):
+        """Claim deadline as an aware UTC datetime (SQLite returns naive values)"""
+        if self.claim_deadline is None or self.claim_deadline.tzinfo is not None:
+            return self.claim_deadline
+        return self.claim_deadline.replace(tzinfo=timezone.utc)
+
     def record_win(self, user_id: int, odds: float):
         """Record a prize win"""
         self.winner_user_id = user_id
@@ -87,7 +100,7 @@ class PrizeAllocation(db.Model):
         if self.claim_status != ClaimStatus.PENDING.value:
             raise ValueError(f"Cannot initiate claim in {self.claim_status} status")
             
-        if datetime.now(timezone.utc) > self.claim_deadline:
+        if datetime.now(timezone.utc) > self.deadline_utc:
             self.claim_status = ClaimStatus.EXPIRED.value
             raise ValueError("Claim deadline has passed")
             
@@ -112,8 +125,8 @@ class PrizeAllocation(db.Model):
         if not self.prize.auto_claim_credit:
             return False
             
-        time_remaining = self.claim_deadline - datetime.now(timezone.utc)
-        if time_remaining.total_seconds() > 3600:  # More than 1 hour remaining
+        time_remaining = self.deadline_utc - datetime.now(timezone.utc)
+        if time_remaining > AUTO_CLAIM_WINDOW:
             return False
             
         try:
@@ -133,6 +146,7 @@ class PrizeAllocation(db.Model):
             'reference_type': self.reference_type,
             'reference_id': self.reference_id,
             'sequence_number': self.sequence_number,
+            'instance_identifier': self.instance_identifier,
             'winner_user_id': self.winner_user_id,
             'won_at': self.won_at.isoformat() if self.won_at else None,
             'winning_odds': self.winning_odds,
@@ -3,6 +3,7 @@
 from enum import Enum
 from datetime import datetime, timezone
 from sqlalchemy.orm import validates, relationship
+from sqlalchemy import Index
 from src.shared import db
 
 class InstanceStatus(str, Enum):
@@ -13,10 +14,14 @@ class InstanceStatus(str, Enum):
 class PrizeInstance(db.Model):
     """Model for prize instances in pools"""
     __tablename__ = 'prize_instances'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ux_prize_instances_instance_id', 'instance_id', unique=True),
+        Index('idx_instance_claim_deadline', 'status', 'claim_deadline'),
+        {'extend_existing': True}
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    instance_id = db.Column(db.String(100), unique=True, nullable=False)
+    instance_id = db.Column(db.String(100), nullable=False)  # unique, see __table_args__
     pool_id = db.Column(db.Integer, db.ForeignKey('prize_pools.id'), nullable=False)
     prize_id = db.Column(db.Integer, db.ForeignKey('prizes.id'), nullable=False)
     
@@ -34,6 +34,10 @@ class PrizePool(db.Model):
     retail_total = db.Column(db.Numeric(10, 2), default=0)
     cash_total = db.Column(db.Numeric(10, 2), default=0)
     credit_total = db.Column(db.Numeric(10, 2), default=0)
+
+    # Persisted alias table over available instant-win instances (see PrizeSampler)
+    alias_table = db.Column(db.JSON)
+    alias_version = db.Column(db.Integer)
     
     # Relationships
     raffle_id = db.Column(db.Integer, db.ForeignKey('raffles.id'), unique=True)
@@ -74,6 +78,34 @@ class PrizePool(db.Model):
         """Calculate total odds across all instances"""
         return sum(instance.individual_odds for instance in self.instances)
 
+    @property
+    def odds_configuration(self):
+        """Read-only snapshot of prizes and instance states, derived from prize_instances.
+
+        Instance state lives only in the prize_instances table; this view is
+        rebuilt on each access and must not be written back.
+        """
+        from .prize_instance import PrizeInstance
+        rows = db.session.query(
+            PrizeInstance.prize_id,
+            PrizeInstance.instance_id,
+            PrizeInstance.status,
+            PrizeInstance.individual_odds
+        ).filter(PrizeInstance.pool_id == self.id)\
+            .order_by(PrizeInstance.prize_id, PrizeInstance.id)\
+            .all()
+
+        prizes = {}
+        for row in rows:
+            entry = prizes.setdefault(row.prize_id, {'prize_id': row.prize_id, 'odds': 0.0, 'instances': []})
+            entry['odds'] += row.individual_odds
+            entry['instances'].append({
+                'instance_id': row.instance_id,
+                'status': row.status,
+                'individual_odds': row.individual_odds
+            })
+        return {'prizes': list(prizes.values())}
+
     def validate_for_lock(self):
         """Validate pool can be locked"""
         # Check has instances
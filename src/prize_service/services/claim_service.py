@@ -3,10 +3,15 @@
 from typing import Optional, Tuple, Dict, List  
 from datetime import datetime, timezone
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, update, func
 from src.shared import db
-from src.prize_service.models import Prize, PrizeAllocation, ClaimStatus, AllocationType
+from src.prize_service.models import (
+    Prize, PrizeAllocation, PrizeInstance,
+    ClaimStatus, AllocationType, InstanceStatus
+)
 from src.user_service.services.user_service import UserService
+from src.prize_service.services.expiry_service import ExpiryService
+from src.prize_service.services.prize_catalog import PrizeCatalog, PrizeTemplate
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,13 +40,13 @@ class ClaimService:
 
             # Check expiry
             current_time = datetime.now(timezone.utc)
-            if allocation.claim_deadline and current_time > allocation.claim_deadline:
+            if allocation.claim_deadline and current_time > allocation.deadline_utc:
                 allocation.claim_status = ClaimStatus.EXPIRED.value
                 db.session.commit()
                 return None, "Prize claim has expired"
 
             # Get prize details
-            prize = Prize.query.get(allocation.prize_id)
+            prize = PrizeCatalog.prize(allocation.prize_id)
             if not prize:
                 return None, "Prize configuration not found"
 
@@ -69,45 +74,65 @@ class ClaimService:
             logger.error(f"Database error in initiate_claim: {str(e)}")
             return None, str(e)
 
+    @staticmethod
+    def _claim_instance(instance_identifier: Optional[str], user_id: int) -> bool:
+        """Move a DISCOVERED instance to CLAIMED with one indexed conditional update.
+
+        Returns False if a concurrent claim or a reset got there first. An
+        allocation without an instance has nothing to claim.
+        """
+        if not instance_identifier:
+            return True
+        result = db.session.execute(
+            update(PrizeInstance)
+            .where(
+                PrizeInstance.instance_id == instance_identifier,
+                PrizeInstance.status == InstanceStatus.DISCOVERED.value
+            )
+            .values(
+                status=InstanceStatus.CLAIMED.value,
+                claimed_by_id=user_id,
+                claimed_at=datetime.now(timezone.utc)
+            ),
+            execution_options={'synchronize_session': False}
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def _count_claim(prize_id: int) -> None:
+        db.session.execute(
+            update(Prize)
+            .where(Prize.id == prize_id)
+            .values(total_claimed=func.coalesce(Prize.total_claimed, 0) + 1),
+            execution_options={'synchronize_session': False}
+        )
+
     @staticmethod
     def _process_credit_claim(
         allocation: PrizeAllocation,
-        prize: Prize,
+        prize: PrizeTemplate,
         user_id: int
     ) -> Tuple[Optional[Dict], Optional[str]]:
         """Process a credit-based prize claim with instance update"""
         try:
-            # Verify instance is still valid
-            if allocation.instance_identifier:
-                pool = allocation.pool
-                if pool and pool.odds_configuration:
-                    instance_found = False
-                    for prize_config in pool.odds_configuration.get('prizes', []):
-                        for instance in prize_config.get('instances', []):
-                            if instance.get('instance_id') == allocation.instance_identifier:
-                                if instance.get('status') != 'allocated':
-                                    return None, "Prize instance no longer available"
-                                instance_found = True
-                                instance['status'] = 'claimed'
-                                break
-                        if instance_found:
-                            break
-                    if not instance_found:
-                        return None, "Prize instance not found"
+            if not ClaimService._claim_instance(allocation.instance_identifier, user_id):
+                db.session.rollback()
+                return None, "Prize instance no longer available"
 
             credit_amount = float(prize.credit_value)
 
-            # Award credits to user
-            user, error = UserService.update_credits(
+            # Award credits in this transaction: the instance, the credits, the
+            # allocation and the prize stats commit together or not at all
+            _, error = UserService.add_credits(
                 user_id=user_id,
                 amount=credit_amount,
-                transaction_type='add',
                 reference_type='prize_claim',
                 reference_id=str(allocation.id),
                 notes=f'Prize claim: {prize.name}'
             )
 
             if error:
+                db.session.rollback()
                 return None, f"Failed to award credits: {error}"
 
             # Update allocation
@@ -115,8 +140,7 @@ class ClaimService:
             allocation.claimed_at = datetime.now(timezone.utc)
             allocation.value_claimed = credit_amount
 
-            # Update prize stats
-            prize.total_claimed += 1
+            ClaimService._count_claim(prize.id)
 
             db.session.commit()
 
@@ -148,7 +172,7 @@ class ClaimService:
             if allocation.winner_user_id != user_id:
                 return None, "Not authorized to view this claim"
 
-            prize = Prize.query.get(allocation.prize_id)
+            prize = PrizeCatalog.prize(allocation.prize_id)
             if not prize:
                 return None, "Prize not found"
 
@@ -170,45 +194,58 @@ class ClaimService:
             return None, str(e)
 
     @staticmethod
-    def expire_stale_claims() -> Tuple[int, Optional[str]]:
+    def expire_stale_claims(chunk_size: int = ExpiryService.DEFAULT_CHUNK_SIZE) -> Tuple[int, Optional[str]]:
         """Expire unclaimed prizes and update instance statuses"""
+        return ExpiryService.expire_allocations(chunk_size=chunk_size)
+
+    @staticmethod
+    def process_auto_claims(allocation_ids: List[int]) -> Tuple[int, Optional[str]]:
+        """Auto-claim credit prizes whose deadline is inside the auto-claim window"""
         try:
-            current_time = datetime.now(timezone.utc)
-            
-            # Find pending claims past deadline
-            expired = PrizeAllocation.query.filter(
-                and_(
-                    PrizeAllocation.claim_status == ClaimStatus.PENDING.value,
-                    PrizeAllocation.claim_deadline < current_time
-                )
+            allocations = PrizeAllocation.query.filter(
+                PrizeAllocation.id.in_(allocation_ids),
+                PrizeAllocation.claim_status == ClaimStatus.PENDING.value,
+                PrizeAllocation.auto_claim_attempted.isnot(True)
             ).all()
 
-            expire_count = 0
-            for allocation in expired:
-                allocation.claim_status = ClaimStatus.EXPIRED.value
-                
-                # Update instance status if applicable
-                if allocation.instance_identifier and allocation.pool:
-                    pool = allocation.pool
-                    if pool.odds_configuration:
-                        for prize in pool.odds_configuration.get('prizes', []):
-                            for instance in prize.get('instances', []):
-                                if instance.get('instance_id') == allocation.instance_identifier:
-                                    instance['status'] = 'expired'
-                                    break
-
-                expire_count += 1
-                logger.info(
-                    f"Expired allocation {allocation.id} for prize {allocation.prize_id}"
-                    f" won by user {allocation.winner_user_id}"
+            claimed = 0
+            for allocation in allocations:
+                # Each allocation's claim and credits share a savepoint, and the
+                # whole batch commits once below
+                savepoint = db.session.begin_nested()
+                if not allocation.attempt_auto_claim():
+                    savepoint.rollback()
+                    continue
+                # Without this the instance stays DISCOVERED and the expiry
+                # sweep would return an already-paid prize to the pool
+                if not ClaimService._claim_instance(allocation.instance_identifier, allocation.winner_user_id):
+                    savepoint.rollback()
+                    logger.warning(f"Auto-claim skipped allocation {allocation.id}: instance no longer available")
+                    continue
+
+                _, error = UserService.add_credits(
+                    user_id=allocation.winner_user_id,
+                    amount=float(allocation.value_claimed or 0),
+                    reference_type='prize_auto_claim',
+                    reference_id=str(allocation.id),
+                    notes=f'Prize auto-claim: allocation {allocation.id}'
                 )
+                if error:
+                    savepoint.rollback()
+                    logger.error(f"Auto-claim failed for allocation {allocation.id}: {error}")
+                    continue
+                ClaimService._count_claim(allocation.prize_id)
+                savepoint.commit()
+                claimed += 1
 
             db.session.commit()
-            return expire_count, None
+            if claimed:
+                logger.info(f"Auto-claimed {claimed} of {len(allocation_ids)} due allocations")
+            return claimed, None
 
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Database error in expire_stale_claims: {str(e)}")
+            logger.error(f"Database error in process_auto_claims: {str(e)}")
             return 0, str(e)
 
     @staticmethod
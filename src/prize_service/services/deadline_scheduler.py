@@ -0,0 +1,279 @@
+# src/prize_service/services/deadline_scheduler.py
+
+import heapq
+import os
+import socket
+import threading
+from typing import Optional, Dict, List, Tuple
+from datetime import datetime, timezone, timedelta
+from flask import Flask
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from src.shared import db
+from src.shared.leader_lease import LeaderLease
+from src.prize_service.models import Prize, PrizeAllocation, ClaimStatus
+from src.prize_service.models.prize_allocation import AUTO_CLAIM_WINDOW
+from src.prize_service.services.expiry_service import ExpiryService
+from src.prize_service.services.claim_service import ClaimService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Scheduler running in this process; the commit hook feeds new allocations to it
+_active_scheduler: Optional['DeadlineScheduler'] = None
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+class DeadlineScheduler:
+    """Timer heap of claim deadlines.
+
+    Holds one (due_at, kind, allocation_id) entry per pending allocation and
+    sleeps until the earliest one is due, so expiry and auto-claim cost
+    O(log n) per allocation instead of a table scan per poll. Due entries are
+    handed to ExpiryService / ClaimService in batches; both re-check status,
+    so stale entries (claimed early, processed by another worker) are no-ops.
+    """
+    EXPIRE = 'expire'
+    AUTO_CLAIM = 'auto_claim'
+    LEASE_NAME = 'prize_deadline_scheduler'
+    RETRY_DELAY = timedelta(seconds=30)
+
+    def __init__(
+        self,
+        app: Flask,
+        batch_size: int = ExpiryService.DEFAULT_CHUNK_SIZE,
+        reload_interval: int = 300,
+        leader_lock: bool = True,
+        lease_ttl: int = 30
+    ):
+        self.app = app
+        self.batch_size = batch_size
+        self.reload_interval = reload_interval
+        self.leader_lock = leader_lock
+        self.lease_ttl = lease_ttl
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+
+        self._heap: List[Tuple[datetime, str, int]] = []
+        self._queued = set()
+        self._cond = threading.Condition()
+        self._watermark: Optional[datetime] = None
+        self._is_leader = False
+        self._reload_now = True
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, allocation_id: int, deadline: datetime, auto_claim: bool = True) -> None:
+        """Queue expiry (and optionally auto-claim) for one allocation"""
+        deadline = _as_utc(deadline)
+        entries = [(deadline, self.EXPIRE, allocation_id)]
+        if auto_claim:
+            entries.append((deadline - AUTO_CLAIM_WINDOW, self.AUTO_CLAIM, allocation_id))
+
+        with self._cond:
+            wake = False
+            for entry in entries:
+                key = entry[1:]
+                if key in self._queued:
+                    continue
+                self._queued.add(key)
+                heapq.heappush(self._heap, entry)
+                wake = wake or self._heap[0] is entry
+            if wake:
+                self._cond.notify()
+
+    def next_due(self) -> Optional[datetime]:
+        with self._cond:
+            return self._heap[0][0] if self._heap else None
+
+    def load(self) -> int:
+        """Add pending allocations created or changed since the last load"""
+        changed_at = func.coalesce(PrizeAllocation.updated_at, PrizeAllocation.created_at)
+        query = select(
+            PrizeAllocation.id,
+            PrizeAllocation.claim_deadline,
+            Prize.auto_claim_credit,
+            changed_at.label('changed_at')
+        ).join(Prize, Prize.id == PrizeAllocation.prize_id).where(
+            PrizeAllocation.claim_status == ClaimStatus.PENDING.value,
+            PrizeAllocation.claim_deadline.isnot(None)
+        )
+        # >= so rows sharing the watermark timestamp aren't missed; _queued dedupes
+        if self._watermark is not None:
+            query = query.where(changed_at >= self._watermark)
+
+        rows = db.session.execute(query).all()
+        for row in rows:
+            self.schedule(row.id, row.claim_deadline, auto_claim=bool(row.auto_claim_credit))
+            if row.changed_at and (self._watermark is None or row.changed_at > self._watermark):
+                self._watermark = row.changed_at
+
+        if rows:
+            logger.info(f"Deadline scheduler loaded {len(rows)} allocations ({len(self)} queued)")
+        return len(rows)
+
+    def run_due(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Process every entry due at `now` in batches"""
+        now = now or datetime.now(timezone.utc)
+        due = {self.AUTO_CLAIM: [], self.EXPIRE: []}
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                _, kind, allocation_id = heapq.heappop(self._heap)
+                self._queued.discard((kind, allocation_id))
+                due[kind].append(allocation_id)
+
+        processed = {self.AUTO_CLAIM: 0, self.EXPIRE: 0}
+        # Auto-claim first so an allocation due for both is claimed, not expired
+        for kind in (self.AUTO_CLAIM, self.EXPIRE):
+            ids = due[kind]
+            for start in range(0, len(ids), self.batch_size):
+                batch = ids[start:start + self.batch_size]
+                if kind == self.AUTO_CLAIM:
+                    count, error = ClaimService.process_auto_claims(batch)
+                else:
+                    count, error = ExpiryService.expire_allocations(
+                        chunk_size=self.batch_size, now=now, allocation_ids=batch
+                    )
+                processed[kind] += count
+                if error:
+                    logger.error(f"Deadline scheduler {kind} batch failed: {error}")
+                    self._retry(kind, batch, now)
+        return processed
+
+    def _retry(self, kind: str, allocation_ids: List[int], now: datetime) -> None:
+        with self._cond:
+            for allocation_id in allocation_ids:
+                if (kind, allocation_id) not in self._queued:
+                    self._queued.add((kind, allocation_id))
+                    heapq.heappush(self._heap, (now + self.RETRY_DELAY, kind, allocation_id))
+
+    def start(self) -> None:
+        global _active_scheduler
+        if self._thread is not None:
+            return
+        DeadlineScheduler.install_hooks()
+        _active_scheduler = self
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='deadline-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        global _active_scheduler
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if _active_scheduler is self:
+            _active_scheduler = None
+
+    def _run(self) -> None:
+        next_reload = datetime.now(timezone.utc)
+        with self.app.app_context():
+            while not self._stopped:
+                try:
+                    if not self._hold_lease():
+                        self._sleep(self.lease_ttl / 2)
+                        continue
+
+                    now = datetime.now(timezone.utc)
+                    if self._reload_now or now >= next_reload:
+                        self._reload_now = False
+                        self.load()
+                        next_reload = now + timedelta(seconds=self.reload_interval)
+                    self.run_due()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    logger.error(f"Deadline scheduler iteration failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+                timeout = (next_reload - datetime.now(timezone.utc)).total_seconds()
+                if self.leader_lock:
+                    timeout = min(timeout, self.lease_ttl / 2)
+                next_due = self.next_due()
+                if next_due is not None:
+                    timeout = min(timeout, (next_due - datetime.now(timezone.utc)).total_seconds())
+                self._sleep(timeout)
+
+            if self.leader_lock and self._is_leader:
+                LeaderLease.release(self.LEASE_NAME, self.holder)
+                db.session.remove()
+
+    def _hold_lease(self) -> bool:
+        if not self.leader_lock:
+            return True
+        leader = LeaderLease.acquire(self.LEASE_NAME, self.holder, self.lease_ttl)
+        if leader and not self._is_leader:
+            # Rebuild from scratch: the previous leader drained what it could
+            logger.info(f"Deadline scheduler leadership acquired by {self.holder}")
+            self._watermark = None
+            self._reload_now = True
+        elif not leader:
+            with self._cond:
+                self._heap.clear()
+                self._queued.clear()
+        self._is_leader = leader
+        return leader
+
+    def _sleep(self, timeout: float) -> None:
+        with self._cond:
+            if not self._stopped and timeout > 0:
+                self._cond.wait(timeout)
+
+    @staticmethod
+    def install_hooks() -> None:
+        """Feed newly committed allocations to the running scheduler (idempotent)"""
+        if event.contains(PrizeAllocation, 'after_insert', _remember_allocation):
+            return
+        event.listen(PrizeAllocation, 'after_insert', _remember_allocation)
+        event.listen(Session, 'after_commit', _schedule_committed)
+        event.listen(Session, 'after_rollback', _forget_uncommitted)
+
+    @staticmethod
+    def init_app(app: Flask) -> Optional['DeadlineScheduler']:
+        """Start the scheduler thread when DEADLINE_SCHEDULER_ENABLED is set"""
+        app.config.setdefault('DEADLINE_SCHEDULER_ENABLED', False)
+        app.config.setdefault('DEADLINE_SCHEDULER_LEADER_LOCK', True)
+        app.config.setdefault('DEADLINE_SCHEDULER_LEASE_TTL', 30)
+        app.config.setdefault('DEADLINE_SCHEDULER_RELOAD_INTERVAL', 300)
+        app.config.setdefault('DEADLINE_SCHEDULER_BATCH_SIZE', ExpiryService.DEFAULT_CHUNK_SIZE)
+
+        if not app.config['DEADLINE_SCHEDULER_ENABLED']:
+            return None
+
+        scheduler = DeadlineScheduler(
+            app,
+            batch_size=app.config['DEADLINE_SCHEDULER_BATCH_SIZE'],
+            reload_interval=app.config['DEADLINE_SCHEDULER_RELOAD_INTERVAL'],
+            leader_lock=app.config['DEADLINE_SCHEDULER_LEADER_LOCK'],
+            lease_ttl=app.config['DEADLINE_SCHEDULER_LEASE_TTL']
+        )
+        app.extensions['deadline_scheduler'] = scheduler
+        scheduler.start()
+        return scheduler
+
+def _remember_allocation(mapper, connection, target: PrizeAllocation) -> None:
+    if target.claim_deadline is None or _active_scheduler is None:
+        return
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('new_deadlines', []).append((target.id, target.claim_deadline))
+
+def _schedule_committed(session: Session) -> None:
+    pending = session.info.pop('new_deadlines', None)
+    if not pending or _active_scheduler is None:
+        return
+    # Followers leave it to the leader's next incremental load
+    if _active_scheduler.leader_lock and not _active_scheduler._is_leader:
+        return
+    for allocation_id, deadline in pending:
+        _active_scheduler.schedule(allocation_id, deadline)
+
+def _forget_uncommitted(session: Session) -> None:
+    session.info.pop('new_deadlines', None)
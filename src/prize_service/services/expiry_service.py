@@ -0,0 +1,185 @@
+# src/prize_service/services/expiry_service.py
+
+from typing import Optional, Tuple, List, Iterable
+from datetime import datetime, timezone
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import select, update
+from src.shared import db
+from src.prize_service.models import (
+    PrizeAllocation, PrizeInstance,
+    ClaimStatus, InstanceStatus
+)
+from src.raffle_service.models import InstantWin, InstantWinStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ExpiryService:
+    """Set-based claim expiry.
+
+    Each chunk is a single conditional UPDATE ... RETURNING over the
+    (status, claim_deadline) index, followed by bulk updates of the dependent
+    InstantWin and PrizeInstance rows and one commit. The status predicate on
+    the UPDATE (plus SKIP LOCKED on databases that support it) means several
+    workers can run this concurrently without expiring a row twice.
+    """
+    DEFAULT_CHUNK_SIZE = 500
+
+    @staticmethod
+    def expire_allocations(
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        now: Optional[datetime] = None,
+        allocation_ids: Optional[Iterable[int]] = None
+    ) -> Tuple[int, Optional[str]]:
+        """Expire pending allocations past their claim deadline"""
+        now = now or datetime.now(timezone.utc)
+        ids_filter = list(allocation_ids) if allocation_ids is not None else None
+        total = 0
+
+        try:
+            while True:
+                candidates = select(PrizeAllocation.id).where(
+                    PrizeAllocation.claim_status == ClaimStatus.PENDING.value,
+                    PrizeAllocation.claim_deadline < now
+                )
+                if ids_filter is not None:
+                    candidates = candidates.where(PrizeAllocation.id.in_(ids_filter))
+                candidates = candidates.order_by(PrizeAllocation.claim_deadline)\
+                    .limit(chunk_size)\
+                    .with_for_update(skip_locked=True)
+
+                expired = db.session.execute(
+                    update(PrizeAllocation)
+                    .where(
+                        PrizeAllocation.id.in_(candidates),
+                        PrizeAllocation.claim_status == ClaimStatus.PENDING.value
+                    )
+                    .values(claim_status=ClaimStatus.EXPIRED.value)
+                    .returning(PrizeAllocation.id, PrizeAllocation.instance_identifier),
+                    execution_options={'synchronize_session': False}
+                ).all()
+
+                if not expired:
+                    break
+
+                allocation_ids_chunk = [row.id for row in expired]
+                instance_ids = [row.instance_identifier for row in expired if row.instance_identifier]
+
+                wins = ExpiryService._expire_instant_wins(allocation_ids_chunk)
+                instances = ExpiryService._release_instances(instance_ids)
+
+                db.session.commit()
+                total += len(expired)
+
+                logger.info(
+                    f"Expired {len(expired)} allocations "
+                    f"({wins} instant wins, {instances} instances released)"
+                )
+
+                if len(expired) < chunk_size:
+                    break
+
+            return total, None
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Database error in expire_allocations: {str(e)}")
+            return total, str(e)
+
+    @staticmethod
+    def reset_expired_instances(
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        now: Optional[datetime] = None
+    ) -> Tuple[int, Optional[str]]:
+        """Return discovered-but-unclaimed instances past their deadline to the pool"""
+        now = now or datetime.now(timezone.utc)
+        total = 0
+
+        try:
+            while True:
+                candidates = select(PrizeInstance.id).where(
+                    PrizeInstance.status == InstanceStatus.DISCOVERED.value,
+                    PrizeInstance.claim_deadline < now
+                ).order_by(PrizeInstance.claim_deadline)\
+                    .limit(chunk_size)\
+                    .with_for_update(skip_locked=True)
+
+                released = db.session.execute(
+                    update(PrizeInstance)
+                    .where(
+                        PrizeInstance.id.in_(candidates),
+                        PrizeInstance.status == InstanceStatus.DISCOVERED.value
+                    )
+                    .values(status=InstanceStatus.AVAILABLE.value, claim_attempts=0)
+                    .returning(PrizeInstance.instance_id),
+                    execution_options={'synchronize_session': False}
+                ).scalars().all()
+
+                if not released:
+                    break
+
+                # Pending allocations on a released instance can no longer be claimed
+                allocation_ids = db.session.execute(
+                    update(PrizeAllocation)
+                    .where(
+                        PrizeAllocation.instance_identifier.in_(released),
+                        PrizeAllocation.claim_status == ClaimStatus.PENDING.value
+                    )
+                    .values(claim_status=ClaimStatus.EXPIRED.value)
+                    .returning(PrizeAllocation.id),
+                    execution_options={'synchronize_session': False}
+                ).scalars().all()
+                wins = ExpiryService._expire_instant_wins(allocation_ids)
+
+                db.session.commit()
+                total += len(released)
+
+                logger.info(
+                    f"Reset {len(released)} expired instances "
+                    f"({len(allocation_ids)} allocations, {wins} instant wins expired)"
+                )
+
+                if len(released) < chunk_size:
+                    break
+
+            return total, None
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Database error in reset_expired_instances: {str(e)}")
+            return total, str(e)
+
+    @staticmethod
+    def _expire_instant_wins(allocation_ids: List[int]) -> int:
+        """Expire open instant wins that point at the given allocations"""
+        if not allocation_ids:
+            return 0
+        result = db.session.execute(
+            update(InstantWin)
+            .where(
+                InstantWin.prize_reference.in_([str(i) for i in allocation_ids]),
+                InstantWin.status.in_([
+                    InstantWinStatus.DISCOVERED.value,
+                    InstantWinStatus.PENDING.value
+                ])
+            )
+            .values(status=InstantWinStatus.EXPIRED.value),
+            execution_options={'synchronize_session': False}
+        )
+        return result.rowcount
+
+    @staticmethod
+    def _release_instances(instance_ids: List[str]) -> int:
+        """Return the discovered instances behind expired allocations to the pool"""
+        if not instance_ids:
+            return 0
+        result = db.session.execute(
+            update(PrizeInstance)
+            .where(
+                PrizeInstance.instance_id.in_(instance_ids),
+                PrizeInstance.status == InstanceStatus.DISCOVERED.value
+            )
+            .values(status=InstanceStatus.AVAILABLE.value, claim_attempts=0),
+            execution_options={'synchronize_session': False}
+        )
+        return result.rowcount
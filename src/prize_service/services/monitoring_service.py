@@ -6,6 +6,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import and_, or_, func
 from src.shared import db
 from src.prize_service.models import Prize, PrizePool, PrizeInstance
+from src.prize_service.services.prize_catalog import PrizeCatalog
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,7 +16,7 @@ class PrizeMonitoringService:
     def get_pool_health(pool_id: int) -> Tuple[Optional[Dict], Optional[str]]:
         """Get comprehensive pool health data"""
         try:
-            pool = db.session.get(PrizePool, pool_id)
+            pool = PrizeCatalog.pool(pool_id)
             if not pool:
                 return None, "Pool not found"
 
@@ -64,7 +65,7 @@ class PrizeMonitoringService:
             # Calculate instance health
             instances = PrizeInstance.query.filter_by(pool_id=pool_id).all()
             for instance in instances:
-                prize = db.session.get(Prize, instance.prize_id)
+                prize = PrizeCatalog.prize(instance.prize_id)
                 if not prize:
                     continue
 
@@ -0,0 +1,176 @@
+# src/prize_service/services/prize_catalog.py
+
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, NamedTuple, Optional, Tuple
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import select, exists
+from sqlalchemy.exc import SQLAlchemyError
+from src.shared import db
+from src.prize_service.models import Prize, PrizePool, PrizeInstance, PoolStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PrizeTemplate(NamedTuple):
+    """Read-only copy of the Prize columns claim paths need"""
+    id: int
+    name: str
+    type: str
+    tier: str
+    retail_value: Decimal
+    cash_value: Decimal
+    credit_value: Decimal
+    expiry_days: int
+    claim_processor_type: str
+    claim_deadline_hours: Optional[int]
+    auto_claim_credit: bool
+
+class PoolConfig(NamedTuple):
+    """Read-only copy of a pool's configuration; live counters are left out"""
+    id: int
+    name: str
+    status: str
+    raffle_id: Optional[int]
+    total_instances: int
+    instant_win_count: int
+    draw_win_count: int
+    retail_total: Decimal
+    cash_total: Decimal
+    credit_total: Decimal
+    created_at: datetime
+    created_by_id: int
+
+_PRIZE_COLUMNS = [getattr(Prize, field) for field in PrizeTemplate._fields]
+_POOL_COLUMNS = [getattr(PrizePool, field) for field in PoolConfig._fields]
+_FROZEN_POOL_STATUSES = (PoolStatus.LOCKED.value, PoolStatus.USED.value)
+
+class PrizeCatalog:
+    """Process-wide read-through cache of Prize templates and locked pool configuration.
+
+    A prize is cached once it has instances in a pool (update_prize refuses
+    to edit it from then on) and a pool once it is LOCKED or USED, so the
+    claim paths read them from memory after the first use. USED is final;
+    a LOCKED pool can still be unlocked by another worker, so its entry is
+    re-read after PRIZE_CATALOG_POOL_TTL seconds. update_prize, lock_pool,
+    unlock_pool and the other pool transitions invalidate locally. Each
+    invalidation bumps a generation, and a load that raced with one is not
+    stored. warm() preloads everything cacheable, e.g. at startup.
+    """
+    POOL_TTL = 60
+
+    _prizes: Dict[int, PrizeTemplate] = {}
+    _pools: Dict[int, Tuple[PoolConfig, Optional[float]]] = {}
+    _generation = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def clear() -> None:
+        with PrizeCatalog._lock:
+            PrizeCatalog._prizes.clear()
+            PrizeCatalog._pools.clear()
+            PrizeCatalog._generation += 1
+
+    @staticmethod
+    def invalidate_prize(prize_id: int) -> None:
+        with PrizeCatalog._lock:
+            PrizeCatalog._prizes.pop(prize_id, None)
+            PrizeCatalog._generation += 1
+
+    @staticmethod
+    def invalidate_pool(pool_id: int) -> None:
+        with PrizeCatalog._lock:
+            PrizeCatalog._pools.pop(pool_id, None)
+            PrizeCatalog._generation += 1
+
+    @staticmethod
+    def _pool_expiry(status: str) -> Optional[float]:
+        return None if status == PoolStatus.USED.value else time.monotonic() + PrizeCatalog.POOL_TTL
+
+    @staticmethod
+    def prize(prize_id: int) -> Optional[PrizeTemplate]:
+        """Prize template by id; raises SQLAlchemyError on a failed load like a query would"""
+        with PrizeCatalog._lock:
+            cached = PrizeCatalog._prizes.get(prize_id)
+            generation = PrizeCatalog._generation
+        if cached is not None:
+            return cached
+
+        frozen = exists().where(PrizeInstance.prize_id == Prize.id)
+        row = db.session.execute(
+            select(*_PRIZE_COLUMNS, frozen.label('frozen')).where(Prize.id == prize_id)
+        ).first()
+        if row is None:
+            return None
+
+        template = PrizeTemplate(*row[:-1])
+        if row.frozen:
+            with PrizeCatalog._lock:
+                if PrizeCatalog._generation == generation:
+                    PrizeCatalog._prizes[prize_id] = template
+        return template
+
+    @staticmethod
+    def pool(pool_id: int) -> Optional[PoolConfig]:
+        """Pool configuration by id; cached only once the pool is locked"""
+        with PrizeCatalog._lock:
+            cached = PrizeCatalog._pools.get(pool_id)
+            generation = PrizeCatalog._generation
+        if cached is not None:
+            config, expires = cached
+            if expires is None or time.monotonic() < expires:
+                return config
+
+        row = db.session.execute(select(*_POOL_COLUMNS).where(PrizePool.id == pool_id)).first()
+        if row is None:
+            return None
+
+        config = PoolConfig(*row)
+        if config.status in _FROZEN_POOL_STATUSES:
+            with PrizeCatalog._lock:
+                if PrizeCatalog._generation == generation:
+                    PrizeCatalog._pools[pool_id] = (config, PrizeCatalog._pool_expiry(config.status))
+        return config
+
+    @staticmethod
+    def warm() -> Tuple[int, Optional[str]]:
+        """Preload every frozen prize and locked/used pool; returns entries loaded"""
+        try:
+            with PrizeCatalog._lock:
+                generation = PrizeCatalog._generation
+
+            prizes = db.session.execute(
+                select(*_PRIZE_COLUMNS).where(exists().where(PrizeInstance.prize_id == Prize.id))
+            ).all()
+            pools = db.session.execute(
+                select(*_POOL_COLUMNS).where(PrizePool.status.in_(_FROZEN_POOL_STATUSES))
+            ).all()
+
+            with PrizeCatalog._lock:
+                if PrizeCatalog._generation != generation:
+                    return 0, None
+                for row in prizes:
+                    PrizeCatalog._prizes[row.id] = PrizeTemplate(*row)
+                for row in pools:
+                    config = PoolConfig(*row)
+                    PrizeCatalog._pools[row.id] = (config, PrizeCatalog._pool_expiry(config.status))
+            return len(prizes) + len(pools), None
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error warming prize catalog: {str(e)}")
+            return 0, str(e)
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        app.config.setdefault('PRIZE_CATALOG_WARM', False)
+        app.config.setdefault('PRIZE_CATALOG_POOL_TTL', PrizeCatalog.POOL_TTL)
+        PrizeCatalog.POOL_TTL = app.config['PRIZE_CATALOG_POOL_TTL']
+        if not app.config['PRIZE_CATALOG_WARM']:
+            return
+
+        with app.app_context():
+            loaded, error = PrizeCatalog.warm()
+        if not error:
+            logger.info(f"Warmed prize catalog with {loaded} entries")
@@ -0,0 +1,246 @@
+# src/prize_service/services/prize_sampler.py
+
+import random
+import threading
+from typing import Optional, Tuple, List, Dict, Sequence
+from datetime import datetime, timezone
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import SQLAlchemyError
+from src.shared import db
+from src.prize_service.models import (
+    Prize, PrizePool, PrizeInstance,
+    PrizeType, InstanceStatus
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+_rng = random.SystemRandom()
+
+class AliasTable:
+    """Vose alias table: O(n) build, O(1) weighted draw"""
+
+    def __init__(self, prob: List[float], alias: List[int]):
+        self.prob = prob
+        self.alias = alias
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    @classmethod
+    def build(cls, weights: Sequence[float]) -> 'AliasTable':
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("Alias table needs at least one positive weight")
+
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # Leftovers are 1.0 up to float rounding
+        for i in large + small:
+            prob[i] = 1.0
+
+        return cls(prob, alias)
+
+    def sample(self, rng: random.Random = _rng) -> int:
+        column = int(rng.random() * len(self.prob))
+        return column if rng.random() < self.prob[column] else self.alias[column]
+
+    def to_dict(self) -> Dict:
+        return {'prob': self.prob, 'alias': self.alias}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AliasTable':
+        return cls(list(data['prob']), list(data['alias']))
+
+class _PoolSampler:
+    """Process-local copy of a pool's persisted table plus the entries seen consumed"""
+
+    def __init__(self, version: int, instance_ids: List[str], weights: List[float], table: AliasTable):
+        self.version = version
+        self.instance_ids = instance_ids
+        self.positions = {instance_id: i for i, instance_id in enumerate(instance_ids)}
+        self.weights = weights
+        self.table = table
+        self.total_weight = sum(weights)
+        self.consumed = set()
+        self.consumed_weight = 0.0
+
+    def mark_consumed(self, index: int) -> None:
+        if index not in self.consumed:
+            self.consumed.add(index)
+            self.consumed_weight += self.weights[index]
+
+    @property
+    def live_fraction(self) -> float:
+        if self.total_weight <= 0:
+            return 0.0
+        return 1.0 - self.consumed_weight / self.total_weight
+
+class PrizeSampler:
+    """Weighted selection of available instant-win instances by individual_odds.
+
+    The alias table is built when the pool is locked and persisted on
+    prize_pools.alias_table, so workers load it instead of rebuilding.
+    Consumed instances are handled by rejection: a draw that lands on an
+    instance someone else already took is retried, which keeps the draw
+    distribution proportional to the odds of what is left. Once more than
+    REBUILD_BELOW of the weight is gone, the table is rebuilt from the
+    remaining instances and its version bumped.
+    """
+    REBUILD_BELOW = 0.5
+    MAX_REJECTIONS = 32
+
+    _cache: Dict[int, _PoolSampler] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def build_for_pool(pool_id: int) -> Tuple[Optional[int], Optional[str]]:
+        """Build and persist the table for a pool's available instant-win instances.
+
+        Flushes but does not commit; callers own the transaction.
+        """
+        try:
+            rows = db.session.execute(
+                select(PrizeInstance.instance_id, PrizeInstance.individual_odds)
+                .join(Prize, Prize.id == PrizeInstance.prize_id)
+                .where(
+                    PrizeInstance.pool_id == pool_id,
+                    PrizeInstance.status == InstanceStatus.AVAILABLE.value,
+                    PrizeInstance.individual_odds > 0,
+                    Prize.type == PrizeType.INSTANT_WIN.value
+                )
+                .order_by(PrizeInstance.id)
+            ).all()
+
+            current = db.session.execute(
+                select(PrizePool.alias_version).where(PrizePool.id == pool_id)
+            ).scalar_one_or_none()
+            version = (current or 0) + 1
+
+            data = None
+            if rows:
+                instance_ids = [row.instance_id for row in rows]
+                weights = [float(row.individual_odds) for row in rows]
+                data = {
+                    'instance_ids': instance_ids,
+                    'weights': weights,
+                    'built_at': datetime.now(timezone.utc).isoformat(),
+                    **AliasTable.build(weights).to_dict()
+                }
+
+            # Conditional on the version we read so concurrent rebuilds don't interleave
+            result = db.session.execute(
+                update(PrizePool)
+                .where(
+                    PrizePool.id == pool_id,
+                    PrizePool.alias_version.is_(None) if current is None
+                    else PrizePool.alias_version == current
+                )
+                .values(alias_table=data, alias_version=version),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.flush()
+
+            if result.rowcount:
+                logger.info(f"Built alias table v{version} for pool {pool_id} ({len(rows)} instances)")
+            with PrizeSampler._lock:
+                PrizeSampler._cache.pop(pool_id, None)
+            return version, None
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error building alias table for pool {pool_id}: {str(e)}")
+            return None, str(e)
+
+    @staticmethod
+    def clear_pool(pool_id: int) -> None:
+        """Drop the persisted table (pool unlocked and open for edits again)"""
+        db.session.execute(
+            update(PrizePool)
+            .where(PrizePool.id == pool_id)
+            .values(alias_table=None, alias_version=func.coalesce(PrizePool.alias_version, 0) + 1),
+            execution_options={'synchronize_session': False}
+        )
+        with PrizeSampler._lock:
+            PrizeSampler._cache.pop(pool_id, None)
+
+    @staticmethod
+    def _load(pool_id: int) -> Optional[_PoolSampler]:
+        version = db.session.execute(
+            select(PrizePool.alias_version).where(PrizePool.id == pool_id)
+        ).scalar_one_or_none()
+        if version is None:
+            return None
+
+        with PrizeSampler._lock:
+            cached = PrizeSampler._cache.get(pool_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+        data = db.session.execute(
+            select(PrizePool.alias_table).where(PrizePool.id == pool_id)
+        ).scalar_one_or_none()
+        if not data:
+            return None
+
+        sampler = _PoolSampler(
+            version=version,
+            instance_ids=list(data['instance_ids']),
+            weights=list(data['weights']),
+            table=AliasTable.from_dict(data)
+        )
+        with PrizeSampler._lock:
+            PrizeSampler._cache[pool_id] = sampler
+        return sampler
+
+    @staticmethod
+    def draw(pool_id: int, rng: random.Random = _rng) -> Tuple[Optional[str], Optional[str]]:
+        """Pick an available instance id with probability proportional to its odds.
+
+        The pick is not reserved; callers flip the instance out of AVAILABLE
+        with a conditional update and report a lost race via mark_consumed.
+        """
+        try:
+            sampler = PrizeSampler._load(pool_id)
+            if sampler is None:
+                return None, "Pool has no instant win sampler; lock the pool first"
+
+            if sampler.live_fraction < PrizeSampler.REBUILD_BELOW:
+                PrizeSampler.build_for_pool(pool_id)
+                sampler = PrizeSampler._load(pool_id)
+                if sampler is None:
+                    return None, "No instant win prizes available"
+
+            for _ in range(PrizeSampler.MAX_REJECTIONS):
+                index = sampler.table.sample(rng)
+                if index not in sampler.consumed:
+                    return sampler.instance_ids[index], None
+
+            return None, "No instant win prizes available"
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error drawing from pool {pool_id}: {str(e)}")
+            return None, str(e)
+
+    @staticmethod
+    def mark_consumed(pool_id: int, instance_id: str) -> None:
+        """Record that an instance is no longer drawable in this process"""
+        with PrizeSampler._lock:
+            sampler = PrizeSampler._cache.get(pool_id)
+            if sampler is None:
+                return
+            index = sampler.positions.get(instance_id)
+            if index is not None:
+                sampler.mark_consumed(index)
@@ -1,15 +1,19 @@
 # src/prize_service/services/prize_service.py
 
 from typing import Optional, Tuple, Dict, Any, List
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, update
 from decimal import Decimal
 from src.prize_service.services.credit_service import CreditService
+from src.prize_service.services.expiry_service import ExpiryService
+from src.prize_service.services.prize_sampler import PrizeSampler
+from src.prize_service.services.prize_catalog import PrizeCatalog
 from src.shared import db
+from src.shared.entity_cache import EntityCache
 from src.prize_service.models import (
-    Prize, PrizePool, PrizeInstance,
-    PrizeStatus, PoolStatus, InstanceStatus, PrizeType
+    Prize, PrizePool, PrizeInstance, PrizeAllocation,
+    PrizeStatus, PoolStatus, InstanceStatus, PrizeType, AllocationType
 )
 import logging
 
@@ -83,6 +87,7 @@ class PrizeService:
             
             prize.updated_at = datetime.now(timezone.utc)
             db.session.commit()
+            PrizeCatalog.invalidate_prize(prize_id)
             
             return prize, None
 
@@ -94,7 +99,7 @@ class PrizeService:
     @staticmethod
     def get_prize(prize_id: int) -> Optional[Prize]:
         """Get prize by ID"""
-        return db.session.get(Prize, prize_id)
+        return EntityCache.get(Prize, prize_id)
 
     @staticmethod
     def list_prizes() -> List[Prize]:
@@ -279,37 +284,84 @@ class PrizeService:
             return None, str(e)
 
     @staticmethod
-    def process_expired_claims() -> Tuple[int, Optional[str]]:
-        """Process expired claims and reset instances"""
+    def allocate_instant_win(
+        pool_id: int,
+        ticket_id: str,
+        user_id: int
+    ) -> Tuple[Optional[PrizeAllocation], Optional[str]]:
+        """Allocate an instant win prize instance weighted by individual_odds.
+
+        Flushes but does not commit; the caller commits with the ticket reveal.
+        """
         try:
-            current_time = datetime.now(timezone.utc)
-            expired_count = 0
-
-            # Find expired but unclaimed instances
-            expired_instances = PrizeInstance.query.filter(
-                and_(
-                    PrizeInstance.status == InstanceStatus.DISCOVERED.value,
-                    PrizeInstance.claim_deadline < current_time
-                )
-            ).all()
+            for _ in range(PrizeSampler.MAX_REJECTIONS):
+                instance_id, error = PrizeSampler.draw(pool_id)
+                if error:
+                    return None, error
+
+                # Only one caller can move an instance out of AVAILABLE
+                claimed = db.session.execute(
+                    update(PrizeInstance)
+                    .where(
+                        PrizeInstance.instance_id == instance_id,
+                        PrizeInstance.status == InstanceStatus.AVAILABLE.value
+                    )
+                    .values(status=InstanceStatus.DISCOVERED.value)
+                    .returning(PrizeInstance.id, PrizeInstance.prize_id, PrizeInstance.individual_odds),
+                    execution_options={'synchronize_session': False}
+                ).first()
+                PrizeSampler.mark_consumed(pool_id, instance_id)
+                if claimed is not None:
+                    break
+            else:
+                return None, "No instant win prizes available"
 
-            for instance in expired_instances:
-                instance.status = InstanceStatus.AVAILABLE.value
-                instance.claim_attempts = 0
-                expired_count += 1
-                logger.info(f"Reset expired instance {instance.instance_id}")
+            prize = PrizeCatalog.prize(claimed.prize_id)
+            won_at = datetime.now(timezone.utc)
+            claim_deadline = won_at + timedelta(hours=prize.claim_deadline_hours or 24)
 
-            db.session.commit()
-            
-            if expired_count > 0:
-                logger.info(f"Processed {expired_count} expired claims")
-                
-            return expired_count, None
+            db.session.execute(
+                update(PrizeInstance)
+                .where(PrizeInstance.id == claimed.id)
+                .values(claim_deadline=claim_deadline),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.execute(
+                update(PrizePool)
+                .where(PrizePool.id == pool_id, PrizePool.available_instances > 0)
+                .values(available_instances=PrizePool.available_instances - 1),
+                execution_options={'synchronize_session': False}
+            )
+
+            allocation = PrizeAllocation(
+                prize_id=prize.id,
+                pool_id=pool_id,
+                allocation_type=AllocationType.INSTANT_WIN.value,
+                reference_type='ticket',
+                reference_id=str(ticket_id),
+                instance_identifier=instance_id,
+                winner_user_id=user_id,
+                won_at=won_at,
+                winning_odds=claimed.individual_odds,
+                claim_deadline=claim_deadline,
+                original_value=prize.credit_value,
+                created_by_id=user_id
+            )
+            db.session.add(allocation)
+            db.session.flush()
+
+            logger.info(f"Allocated instance {instance_id} from pool {pool_id} to ticket {ticket_id}")
+            return allocation, None
 
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error processing expired claims: {str(e)}")
-            return 0, str(e)
+            logger.error(f"Error allocating instant win: {str(e)}")
+            return None, str(e)
+
+    @staticmethod
+    def process_expired_claims(chunk_size: int = ExpiryService.DEFAULT_CHUNK_SIZE) -> Tuple[int, Optional[str]]:
+        """Process expired claims and reset instances"""
+        return ExpiryService.reset_expired_instances(chunk_size=chunk_size)
 
     @staticmethod
     def get_prize_values(instance_id: int) -> Tuple[Optional[Dict[str, float]], Optional[str]]:
@@ -333,7 +385,7 @@ class PrizeService:
     def validate_prize_selection(prize_id: int, selected_value: str) -> Tuple[bool, Optional[str]]:
         """Validate selected prize value option"""
         try:
-            prize = Prize.query.get(prize_id)
+            prize = PrizeCatalog.prize(prize_id)
             if not prize:
                 return False, "Prize not found"
 
@@ -372,7 +424,15 @@ class PrizeService:
             # Lock pool
             pool.status = PoolStatus.LOCKED.value
             pool.updated_at = datetime.now(timezone.utc)
+
+            # Odds are frozen from here on; persist the instant win sampler
+            _, error = PrizeSampler.build_for_pool(pool_id)
+            if error:
+                db.session.rollback()
+                return None, error
+
             db.session.commit()
+            PrizeCatalog.invalidate_pool(pool_id)
             
             logger.info(f"Successfully locked pool {pool_id}")
             return pool.to_dict(), None
@@ -398,7 +458,9 @@ class PrizeService:
 
             pool.status = PoolStatus.UNLOCKED.value
             pool.updated_at = datetime.now(timezone.utc)
+            PrizeSampler.clear_pool(pool_id)
             db.session.commit()
+            PrizeCatalog.invalidate_pool(pool_id)
             
             logger.info(f"Successfully unlocked pool {pool_id}")
             return pool.to_dict(), None
@@ -412,7 +474,7 @@ class PrizeService:
     def get_pool_stats(pool_id: int) -> Tuple[Optional[Dict], Optional[str]]:
         """Get comprehensive pool statistics"""
         try:
-            pool = db.session.get(PrizePool, pool_id)
+            pool = EntityCache.get(PrizePool, pool_id)
             if not pool:
                 return None, "Pool not found"
 
@@ -483,6 +545,7 @@ class PrizeService:
             pool.status = PoolStatus.USED.value
             pool.updated_at = datetime.now(timezone.utc)
             db.session.commit()
+            PrizeCatalog.invalidate_pool(pool_id)
             
             logger.info(f"Marked pool {pool_id} as USED by raffle {raffle_id}")
             return pool.to_dict(), None
@@ -496,7 +559,7 @@ class PrizeService:
     def get_pool_claim_stats(pool_id: int) -> Tuple[Optional[Dict], Optional[str]]:
         """Get detailed claim statistics for a pool"""
         try:
-            pool = db.session.get(PrizePool, pool_id)
+            pool = EntityCache.get(PrizePool, pool_id)
             if not pool:
                 return None, "Pool not found"
 
@@ -565,6 +628,7 @@ class PrizeService:
             pool.raffle_id = raffle_id
             pool.updated_at = datetime.now(timezone.utc)
             db.session.commit()
+            PrizeCatalog.invalidate_pool(pool_id)
             
             logger.info(f"Assigned pool {pool_id} to raffle {raffle_id}")
             return pool.to_dict(), None
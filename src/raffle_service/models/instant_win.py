@@ -40,6 +40,7 @@ class InstantWin(db.Model):
     __table_args__ = (
         UniqueConstraint('ticket_id', name='uq_one_win_per_ticket'),
         Index('ix_instant_wins_raffle_id_status', 'raffle_id', 'status'),
+        Index('ix_instant_wins_prize_reference', 'prize_reference'),
     )
     
     def __init__(self, **kwargs):
@@ -2,12 +2,38 @@
 from datetime import datetime, timezone
 from src.shared import db
 from enum import Enum
-from sqlalchemy import Index, event
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import Index, String, case, cast, event, false, literal, tuple_, update
+from sqlalchemy.ext.hybrid import hybrid_property
+
+# Display numbers are zero-padded to at least this many digits ("007");
+# ordinals past 999 simply print wider
+TICKET_NUMBER_WIDTH = 3
+
+def format_ticket_number(ordinal: int) -> str:
+    return str(ordinal).zfill(TICKET_NUMBER_WIDTH)
+
+def parse_ticket_number(ticket_number) -> Optional[int]:
+    """'007' -> 7; None for anything that is not a positive number"""
+    try:
+        ordinal = int(ticket_number)
+    except (TypeError, ValueError):
+        return None
+    return ordinal if ordinal > 0 else None
+
+def parse_ticket_id(ticket_id) -> Optional[Tuple[int, int]]:
+    """'12-007' -> (12, 7); None if it is not a raffle-number pair"""
+    raffle_part, _, number_part = str(ticket_id).partition('-')
+    ordinal = parse_ticket_number(number_part)
+    if not raffle_part.isdigit() or ordinal is None:
+        return None
+    return int(raffle_part), ordinal
 
 class TicketStatus(str, Enum):
     AVAILABLE = 'available'
     SOLD = 'sold'
     REVEALED = 'revealed'    # New status for revealed tickets
+    RESERVED = 'reserved'    # Held by an active reservation until reserved_until
     CANCELLED = 'cancelled'
     VOID = 'void'
 
@@ -15,16 +41,18 @@ class Ticket(db.Model):
     """Ticket model for raffles with enhanced reveal mechanism"""
     __tablename__ = 'tickets'
     __table_args__ = (
-        Index('idx_ticket_id', 'ticket_id', unique=True),
-        Index('idx_ticket_raffle_number', 'raffle_id', 'ticket_number', unique=True),
+        Index('idx_ticket_raffle_ordinal', 'raffle_id', 'ordinal', unique=True),
         Index('idx_ticket_reveal', 'raffle_id', 'user_id', 'reveal_time'),  # New index for reveal queries
+        Index('idx_ticket_raffle_keyset', 'raffle_id', 'id'),  # Admin listing pages
+        Index('idx_ticket_raffle_status', 'raffle_id', 'status', 'id'),
+        Index('idx_ticket_user_raffle', 'user_id', 'raffle_id'),  # "My tickets" grouping
+        Index('idx_ticket_reservation', 'reservation_id'),  # Hold release by reservation
         {'extend_existing': True}
     )
 
     id = db.Column(db.Integer, primary_key=True)
     raffle_id = db.Column(db.Integer, db.ForeignKey('raffles.id'), nullable=False)
-    ticket_id = db.Column(db.String(20), nullable=False, unique=True)
-    ticket_number = db.Column(db.String(3), nullable=False)
+    ordinal = db.Column(db.Integer, nullable=False)  # 1-based position within the raffle
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     purchase_time = db.Column(db.DateTime, nullable=True)
     status = db.Column(db.String(20), nullable=False, default=TicketStatus.AVAILABLE.value)
@@ -38,17 +66,69 @@ class Ticket(db.Model):
     instant_win = db.Column(db.Boolean, default=False)
     instant_win_eligible = db.Column(db.Boolean, default=False)  # New field
     transaction_id = db.Column(db.Integer, db.ForeignKey('credit_transactions.id'), nullable=True)
+
+    # Reservation hold; reserved_until is naive UTC like TicketReservation.expires_at
+    reservation_id = db.Column(db.String(50), db.ForeignKey('ticket_reservations.id', ondelete='SET NULL'), nullable=True)
+    reserved_until = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        if not self.ticket_id and self.raffle_id and self.ticket_number:
-            self.ticket_id = self.formatted_ticket_id
+    # ticket_number and ticket_id are derived from (raffle_id, ordinal) rather
+    # than stored. Both still accept the string forms on assignment, and in
+    # SQL they render the same strings the old columns held. Filter with
+    # match_ticket_ids / ordinal so lookups use idx_ticket_raffle_ordinal.
+    @hybrid_property
+    def ticket_number(self) -> Optional[str]:
+        return format_ticket_number(self.ordinal) if self.ordinal is not None else None
+
+    @ticket_number.inplace.setter
+    def _ticket_number_setter(self, value) -> None:
+        ordinal = parse_ticket_number(value)
+        if ordinal is None:
+            raise ValueError(f"Invalid ticket number: {value!r}")
+        self.ordinal = ordinal
+
+    @ticket_number.inplace.expression
+    @classmethod
+    def _ticket_number_expression(cls):
+        digits = cast(cls.ordinal, String)
+        padded = [
+            (cls.ordinal < 10 ** width, literal('0' * (TICKET_NUMBER_WIDTH - width)) + digits)
+            for width in range(1, TICKET_NUMBER_WIDTH)
+        ]
+        return case(*padded, else_=digits).label('ticket_number')
+
+    @hybrid_property
+    def ticket_id(self) -> Optional[str]:
+        if self.raffle_id is None or self.ordinal is None:
+            return None
+        return f"{self.raffle_id}-{self.ticket_number}"
+
+    @ticket_id.inplace.setter
+    def _ticket_id_setter(self, value) -> None:
+        parsed = parse_ticket_id(value)
+        if parsed is None:
+            raise ValueError(f"Invalid ticket id: {value!r}")
+        raffle_id, self.ordinal = parsed
+        if self.raffle_id is None:
+            self.raffle_id = raffle_id
+
+    @ticket_id.inplace.expression
+    @classmethod
+    def _ticket_id_expression(cls):
+        return (cast(cls.raffle_id, String) + '-' + cls.ticket_number.element).label('ticket_id')
 
     @property
     def formatted_ticket_id(self) -> str:
         """Generate the formatted ticket ID"""
-        return f"{self.raffle_id}-{self.ticket_number}"
+        return self.ticket_id
+
+    @classmethod
+    def match_ticket_ids(cls, ticket_ids: Iterable[str]):
+        """Indexed filter for display ids; malformed ids match nothing"""
+        keys = [key for key in map(parse_ticket_id, ticket_ids) if key is not None]
+        if not keys:
+            return false()
+        return tuple_(cls.raffle_id, cls.ordinal).in_(keys)
 
     def reveal(self) -> bool:
         """
@@ -67,6 +147,25 @@ class Ticket(db.Model):
         
         return True
 
+    @classmethod
+    def bulk_set_status(cls, criteria, status: str, **values):
+        """Move every ticket matching `criteria` to `status` in one UPDATE.
+
+        Returns (id, ticket_id, ticket_number, ordinal) rows for the tickets changed.
+        Bulk statements bypass the status 'set' listener below, so its side
+        effects are applied here as column values.
+        """
+        values['status'] = status
+        if status == TicketStatus.REVEALED.value:
+            values.setdefault('reveal_time', datetime.now(timezone.utc))
+        return db.session.execute(
+            update(cls)
+            .where(*criteria)
+            .values(**values)
+            .returning(cls.id, cls.ticket_id, cls.ticket_number, cls.ordinal),
+            execution_options={'synchronize_session': False}
+        ).all()
+
     def mark_instant_win_eligible(self):
         """Mark ticket as eligible for instant win"""
         if self.status != TicketStatus.AVAILABLE.value:
@@ -79,6 +178,7 @@ class Ticket(db.Model):
             'id': self.id,
             'ticket_id': self.ticket_id,
             'ticket_number': self.ticket_number,
+            'ordinal': self.ordinal,
             'raffle_id': self.raffle_id,
             'user_id': self.user_id,
             'purchase_time': self.purchase_time.isoformat() if self.purchase_time else None,
@@ -2,8 +2,14 @@
 
 from enum import Enum
 from datetime import datetime, timezone
+from sqlalchemy.ext.hybrid import hybrid_method
+from sqlalchemy.orm import validates
 from src.shared import db
 
+def utcnow() -> datetime:
+    """Naive UTC: the form reservation expiry is stored and compared in"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class ReservationStatus(str, Enum):
     PENDING = 'pending'
     ACTIVE = 'active'
@@ -15,7 +21,10 @@ class ReservationStatus(str, Enum):
 class TicketReservation(db.Model):
     """Model for temporary ticket reservations"""
     __tablename__ = 'ticket_reservations'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        db.Index('idx_reservation_status_expires', 'status', 'expires_at'),
+        {'extend_existing': True}
+    )
 
     id = db.Column(db.String(50), primary_key=True)
     raffle_id = db.Column(db.Integer, db.ForeignKey('raffles.id'), nullable=False)
@@ -42,9 +51,16 @@ class TicketReservation(db.Model):
         if not self.id:
             self.id = f"res_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{kwargs.get('user_id')}"
 
-    def is_expired(self) -> bool:
-        """Check if reservation has expired"""
-        return datetime.now(timezone.utc) > self.expires_at
+    @validates('expires_at')
+    def _store_naive_utc(self, key, value: datetime) -> datetime:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @hybrid_method
+    def is_expired(self, now: datetime = None) -> bool:
+        """Check if reservation has expired; also usable as a SQL filter"""
+        return self.expires_at <= (now or utcnow())
 
     def can_be_confirmed(self) -> bool:
         """Check if reservation can be confirmed"""
@@ -1,17 +1,17 @@
 # src/raffle_service/routes/admin_routes.py
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from src.shared.auth import admin_required
 from src.raffle_service.services.raffle_service import RaffleService
-from src.raffle_service.services.ticket_service import TicketService
+from src.raffle_service.services.ticket_service import TicketService, ADMIN_TICKET_PAGE_SIZE
 from src.raffle_service.services.instant_win_service import InstantWinService
 from src.raffle_service.services.draw_service import DrawService
+from src.raffle_service.services.export_service import ExportService, EXPORT_DATASETS
 from src.raffle_service.schemas.raffle_schema import RaffleCreateSchema
 from marshmallow import ValidationError
 from src.raffle_service.models.raffle import RaffleStatus
 from src.raffle_service.models.ticket import Ticket
 from src.raffle_service.models import InstantWin
-from src.user_service.models.user import User
 from src.raffle_service.services.ticket_service import TicketService
 from src.raffle_service.services.purchase_limit_service import PurchaseLimitService
 
@@ -122,41 +122,72 @@ def execute_draw(raffle_id):
 @raffle_admin_bp.route('/raffles/<int:raffle_id>/tickets', methods=['GET'])
 @admin_required
 def get_raffle_tickets(raffle_id):
-    """Get all tickets for a raffle with detailed information"""
+    """Get a page of tickets for a raffle with owner details
+
+    Query params: after (cursor from next_cursor), limit, status, user_id,
+    instant_win (true/false), fields (comma separated).
+    """
     try:
-        tickets = Ticket.query.filter_by(raffle_id=raffle_id).all()
-        
-        if not tickets:
+        instant_win = request.args.get('instant_win')
+        if instant_win is not None:
+            instant_win = instant_win.lower() in ('1', 'true', 'yes')
+        fields = request.args.get('fields')
+
+        page, error = TicketService.list_raffle_tickets(
+            raffle_id=raffle_id,
+            after_id=request.args.get('after', type=int),
+            limit=request.args.get('limit', ADMIN_TICKET_PAGE_SIZE, type=int),
+            status=request.args.get('status'),
+            user_id=request.args.get('user_id', type=int),
+            instant_win=instant_win,
+            fields=[f.strip() for f in fields.split(',') if f.strip()] if fields else None
+        )
+
+        if error:
+            return jsonify({'error': error}), 400
+
+        filtered = any(request.args.get(k) is not None for k in ('after', 'status', 'user_id', 'instant_win'))
+        if not page['tickets'] and not filtered:
             return jsonify({'error': 'No tickets found for this raffle'}), 404
-            
-        ticket_details = []
-        for ticket in tickets:
-            detail = ticket.to_dict()
-            detail.update({
-                'paid': ticket.transaction_id is not None,
-                'user': None  # Will be populated if ticket is sold
-            })
-            
-            if ticket.user_id:
-                user = User.query.get(ticket.user_id)
-                if user:
-                    detail['user'] = {
-                        'id': user.id,
-                        'username': user.username,
-                        'email': user.email
-                    }
-            
-            ticket_details.append(detail)
-            
-        return jsonify({
-            'total_count': len(tickets),
-            'tickets': ticket_details
-        })
+
+        return jsonify(page)
         
     except Exception as e:
         logger.error(f"Error getting raffle tickets: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@raffle_admin_bp.route('/raffles/<int:raffle_id>/export', methods=['GET'])
+@admin_required
+def export_raffle(raffle_id):
+    """Stream a raffle's tickets, instant wins and draws as NDJSON or CSV
+
+    Query params: format (ndjson|csv), datasets (comma separated),
+    cursor (resume after the row carrying this token), gzip (true/false).
+    """
+    fmt = request.args.get('format', 'ndjson').lower()
+    datasets = request.args.get('datasets')
+    datasets = [d.strip() for d in datasets.split(',') if d.strip()] if datasets else list(EXPORT_DATASETS)
+    cursor = request.args.get('cursor')
+    compress = request.args.get('gzip', 'false').lower() in ('1', 'true', 'yes')
+
+    error = ExportService.validate(fmt, datasets, cursor)
+    if error:
+        return jsonify({'error': error}), 400
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    filename = f"raffle_{raffle_id}_{'_'.join(datasets)}.{fmt}"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(
+        stream_with_context(ExportService.stream(
+            raffle_id, fmt=fmt, datasets=datasets, cursor=cursor, compress=compress
+        )),
+        mimetype=mimetype,
+        headers=headers
+    )
+
 @raffle_admin_bp.route('/tickets/<int:ticket_id>/void', methods=['POST'])
 @admin_required
 def void_ticket(ticket_id):
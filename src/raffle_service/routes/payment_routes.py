@@ -2,6 +2,7 @@
 
 from flask import Blueprint, request, jsonify
 from src.shared.auth import token_required
+from src.shared.idempotency import idempotent
 from src.raffle_service.services.payment_service import PaymentService
 
 payment_bp = Blueprint('payment', __name__, url_prefix='/api/payments')
@@ -32,6 +33,7 @@ def create_payment_intent():
 
 @payment_bp.route('/intents/<intent_id>/confirm', methods=['POST'])
 @token_required
+@idempotent
 def confirm_payment(intent_id):
     """Confirm payment and finalize ticket purchase"""
     try:
@@ -45,5 +47,30 @@ def confirm_payment(intent_id):
 
         return jsonify(result), 200
 
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@payment_bp.route('/checkout', methods=['POST'])
+@token_required
+@idempotent
+def checkout():
+    """Pay for a reservation with site credits and finalize it in one step"""
+    try:
+        data = request.get_json() or {}
+        reservation_id = data.get('reservation_id')
+
+        if not reservation_id:
+            return jsonify({'error': 'reservation_id is required'}), 400
+
+        result, error = PaymentService.checkout(
+            reservation_id=reservation_id,
+            user_id=request.current_user.id
+        )
+
+        if error:
+            return jsonify({'error': error}), 400
+
+        return jsonify(result), 200
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -1,10 +1,14 @@
 # src/raffle_service/routes/raffle_routes.py
 from flask import Blueprint, request, jsonify, current_app
 from src.shared.auth import token_required, admin_required
+from src.shared.idempotency import idempotent
 from src.raffle_service.services.raffle_service import RaffleService
 from src.raffle_service.services.ticket_service import TicketService
 from src.raffle_service.services.purchase_limit_service import PurchaseLimitService
 from src.raffle_service.services.instant_win_service import InstantWinService
+from src.raffle_service.services.waiting_room import (
+    WaitingRoomService, queue_admission_required, QUEUE_TOKEN_HEADER
+)
 from src.raffle_service.models.raffle import RaffleStatus
 from src.raffle_service.models import InstantWin, Ticket, Raffle, RaffleStatus
 from src.user_service.services.user_service import UserService
@@ -49,8 +53,32 @@ def get_raffle_stats(raffle_id):
     
     return jsonify(stats)
 
+@raffle_bp.route('/<int:raffle_id>/queue', methods=['POST'])
+@token_required
+def join_waiting_room(raffle_id):
+    """Join the raffle's launch waiting room; returns a queue token and position"""
+    status, error = WaitingRoomService.join(raffle_id, request.current_user.id)
+    if error:
+        return jsonify({'error': error}), 400
+    return jsonify(status), 200
+
+@raffle_bp.route('/<int:raffle_id>/queue', methods=['GET'])
+@token_required
+def get_waiting_room_status(raffle_id):
+    """Position and remaining wait for the queue token in X-Queue-Token"""
+    token = request.headers.get(QUEUE_TOKEN_HEADER)
+    if not token:
+        return jsonify({'error': f'{QUEUE_TOKEN_HEADER} header required'}), 400
+
+    status, error = WaitingRoomService.status(raffle_id, request.current_user.id, token)
+    if error:
+        return jsonify({'error': error, 'queue_required': True}), 403
+    return jsonify(status), 200
+
 @raffle_bp.route('/<int:raffle_id>/tickets', methods=['POST'])
 @token_required
+@idempotent
+@queue_admission_required
 def purchase_tickets(raffle_id):
     """Purchase tickets for a raffle"""
     try:
@@ -77,7 +105,17 @@ def purchase_tickets(raffle_id):
         # Calculate total cost
         total_cost = raffle.ticket_price * quantity
 
-        # Process credit transaction first
+        # Fail fast on purchase limits; purchase_tickets enforces them atomically
+        allowed, error_message = PurchaseLimitService.check_purchase_limit(
+            user_id=request.current_user.id,
+            raffle_id=raffle_id,
+            requested_quantity=quantity
+        )
+        
+        if not allowed:
+            return jsonify({'error': error_message}), 400
+
+        # Process credit transaction
         user, error = UserService.update_credits(
             user_id=request.current_user.id,
             amount=total_cost,
@@ -94,16 +132,6 @@ def purchase_tickets(raffle_id):
         transactions = UserService.get_user_credit_transactions(request.current_user.id)[0]
         transaction_id = transactions[0]['id'] if transactions else None
 
-        # Check purchase limits
-        allowed, error_message = PurchaseLimitService.check_purchase_limit(
-            user_id=request.current_user.id,
-            raffle_id=raffle_id,
-            requested_quantity=quantity
-        )
-        
-        if not allowed:
-            return jsonify({'error': error_message}), 400
-
         tickets, error = RaffleService.purchase_tickets(
             raffle_id=raffle_id,
             user_id=request.current_user.id,
@@ -123,14 +151,7 @@ def purchase_tickets(raffle_id):
             )
             return jsonify({'error': error}), 400
         
-        # Update purchase count after successful purchase
-        PurchaseLimitService.update_purchase_count(
-            user_id=request.current_user.id,
-            raffle_id=raffle_id,
-            quantity=quantity
-        )
-        
-        return jsonify([ticket.to_dict() for ticket in tickets]), 201
+        return jsonify(tickets), 201
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,11 +1,15 @@
 from flask import Blueprint, request, jsonify
 from src.shared.auth import token_required
+from src.shared.idempotency import idempotent
 from src.raffle_service.services.reservation_service import ReservationService
+from src.raffle_service.services.waiting_room import queue_admission_required
 
 reservation_bp = Blueprint('reservation', __name__, url_prefix='/api/reservations')
 
 @reservation_bp.route('/tickets', methods=['POST'])
 @token_required
+@idempotent
+@queue_admission_required
 def create_reservation():
     """Create a ticket reservation"""
     try:
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
 from src.shared.auth import token_required
-from src.raffle_service.services.ticket_service import TicketService
+from src.shared.entity_cache import EntityCache
+from src.shared.idempotency import idempotent
+from src.raffle_service.services.ticket_service import TicketService, USER_RAFFLE_PAGE_SIZE
 from src.raffle_service.models import Raffle
+from src.raffle_service.services.waiting_room import queue_admission_required
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,48 +14,31 @@ ticket_bp = Blueprint('tickets', __name__)
 @ticket_bp.route('/api/raffles/tickets', methods=['GET'])
 @token_required
 def get_user_tickets():
-    """Get all tickets for the current user"""
+    """Get the current user's tickets grouped by raffle, one page of raffles at a time
+
+    Query params: raffle_id, after (cursor from next_cursor), limit,
+    summary (true for per-raffle counts only).
+    """
     try:
         user_id = request.current_user.id
         raffle_id = request.args.get('raffle_id', type=int)
-        
-        logger.debug(f"Fetching tickets for user_id: {user_id}, raffle_id: {raffle_id}")
-        
-        tickets, error = TicketService.get_user_tickets(user_id, raffle_id)
-        
+        summary = request.args.get('summary', 'false').lower() in ('1', 'true', 'yes')
+
+        logger.debug("Fetching tickets for user_id: %s, raffle_id: %s", user_id, raffle_id)
+
+        page, error = TicketService.get_user_ticket_groups(
+            user_id=user_id,
+            raffle_id=raffle_id,
+            after_raffle_id=request.args.get('after', type=int),
+            limit=request.args.get('limit', USER_RAFFLE_PAGE_SIZE, type=int),
+            summary=summary
+        )
+
         if error:
             logger.error(f"Error fetching tickets for user {user_id}: {error}")
             return jsonify({'error': error}), 400
-            
-        logger.debug(f"Total tickets fetched: {len(tickets) if tickets else 0}")
-            
-        # Transform tickets to include raffle information
-        response_tickets = []
-        for ticket in tickets:
-            logger.debug(f"Processing ticket: {ticket.ticket_id}, raffle_id: {ticket.raffle_id}")
-            raffle = Raffle.query.get(ticket.raffle_id)
-            logger.debug(f"Raffle found for ticket {ticket.ticket_id}: {raffle.title if raffle else 'Not found'}")
-            
-            ticket_data = {
-                'id': ticket.ticket_id,
-                'ticketId': ticket.ticket_id,
-                'ticketNumber': ticket.ticket_number,
-                'raffleId': ticket.raffle_id,
-                'raffleTitle': raffle.title if raffle else 'Unknown Raffle',
-                'userId': ticket.user_id,
-                'purchaseTime': ticket.purchase_time.isoformat() if ticket.purchase_time else None,
-                'endTime': raffle.end_time.isoformat() if raffle and raffle.end_time else None,
-                'status': ticket.status,
-                'isRevealed': ticket.is_revealed,
-                'revealTime': ticket.reveal_time.isoformat() if ticket.reveal_time else None,
-                'instantWin': ticket.instant_win,
-                'transactionId': ticket.transaction_id
-            }
-            logger.debug(f"Transformed ticket data: {ticket_data}")
-            response_tickets.append(ticket_data)
 
-        logger.debug(f"Final response tickets count: {len(response_tickets)}")
-        return jsonify(response_tickets), 200
+        return jsonify(page), 200
 
     except Exception as e:
         logger.exception("Unexpected error in get_user_tickets")
@@ -60,6 +46,8 @@ def get_user_tickets():
 
 @ticket_bp.route('/api/raffles/<int:raffle_id>/tickets', methods=['POST'])
 @token_required
+@idempotent
+@queue_admission_required
 def purchase_tickets(raffle_id: int):
     """Purchase tickets for a specific raffle"""
     try:
@@ -149,7 +137,7 @@ def get_ticket(raffle_id: int, ticket_number: str):
         if error:
             return jsonify({'error': error}), 404
 
-        raffle = Raffle.query.get(ticket.raffle_id)
+        raffle = EntityCache.get(Raffle, ticket.raffle_id)
         response = {
             'id': ticket.ticket_id,
             'ticketId': ticket.ticket_id,
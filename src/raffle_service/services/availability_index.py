@@ -0,0 +1,290 @@
+# src/raffle_service/services/availability_index.py
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+from src.shared import db
+from src.raffle_service.models import Ticket, TicketStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = 'availability_index_pending'
+CLAIM_ATTEMPTS = 3
+REBUILD_BATCH_SIZE = 10000
+
+class _Bitmap:
+    """One bit per ticket ordinal of a raffle; a set bit means AVAILABLE"""
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.count = 0
+        self.loaded_at = time.monotonic()
+
+    def __contains__(self, ordinal: int) -> bool:
+        byte = ordinal >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (ordinal & 7)))
+
+    def set(self, ordinal: int, available: bool) -> None:
+        byte, mask = ordinal >> 3, 1 << (ordinal & 7)
+        if byte >= len(self.bits):
+            if not available:
+                return
+            self.bits.extend(bytes(byte + 1 - len(self.bits)))
+        if bool(self.bits[byte] & mask) == available:
+            return
+        self.bits[byte] ^= mask
+        self.count += 1 if available else -1
+
+    def ordinals(self) -> List[int]:
+        found = []
+        for byte, value in enumerate(self.bits):
+            if value:
+                found.extend((byte << 3) + bit for bit in range(8) if value & (1 << bit))
+        return found
+
+    def sample(self, count: int, exclude: Set[int] = frozenset()) -> List[int]:
+        """Up to `count` distinct set ordinals not in `exclude`, uniformly at random.
+
+        Rejection sampling over the ordinal range while at least a quarter
+        of it is available; a sparse bitmap is scanned once instead.
+        """
+        remaining = self.count - sum(1 for ordinal in exclude if ordinal in self)
+        count = min(count, remaining)
+        if count <= 0:
+            return []
+
+        span = len(self.bits) << 3
+        if self.count * 4 < span or count * 2 > remaining:
+            return random.sample([o for o in self.ordinals() if o not in exclude], count)
+
+        picked: Set[int] = set()
+        while len(picked) < count:
+            ordinal = random.randrange(span)
+            if ordinal in self and ordinal not in exclude:
+                picked.add(ordinal)
+        return list(picked)
+
+class AvailabilityIndex:
+    """Process-wide bitmap of each raffle's AVAILABLE tickets, by ordinal.
+
+    Picking random tickets with ORDER BY random() sorts every available
+    row of the raffle. With AVAILABILITY_INDEX_ENABLED, claim() samples
+    ordinals from the bitmap instead and hands them to a conditional
+    UPDATE that only touches those rows by (raffle_id, ordinal). The DB
+    stays authoritative: a sampled ticket that turns out to be taken
+    marks the bitmap stale, and the next round samples again.
+
+    Changes are recorded on the session and applied to the bitmap after
+    commit (dropped on rollback); ORM status changes are picked up by a
+    listener, bulk statements call record() themselves. A raffle's bitmap
+    is rebuilt from the tickets table in one streaming pass when first
+    used, after AVAILABILITY_INDEX_TTL seconds (other workers' sales), and
+    once more before reporting a shortfall.
+    """
+    TTL = 300
+
+    _bitmaps: Dict[int, _Bitmap] = {}
+    # Bumped by clear()/invalidate() only, so a rebuild racing them is dropped
+    _generation = 0
+    # Changes committed while a raffle is being rebuilt, replayed onto the result
+    _replays: Dict[int, List[List[Tuple[int, bool]]]] = {}
+    _lock = threading.Lock()
+    _listening = False
+
+    @staticmethod
+    def enabled() -> bool:
+        return has_app_context() and bool(current_app.config.get('AVAILABILITY_INDEX_ENABLED'))
+
+    @staticmethod
+    def clear() -> None:
+        with AvailabilityIndex._lock:
+            AvailabilityIndex._bitmaps.clear()
+            AvailabilityIndex._generation += 1
+
+    @staticmethod
+    def invalidate(raffle_id: int) -> None:
+        with AvailabilityIndex._lock:
+            AvailabilityIndex._bitmaps.pop(raffle_id, None)
+            AvailabilityIndex._generation += 1
+
+    @staticmethod
+    def rebuild(raffle_id: int) -> _Bitmap:
+        """Reload one raffle's bitmap from the tickets table.
+
+        Commits that land while the rows stream in may be missing from the
+        read, so they are logged and replayed onto the new bitmap before it
+        is stored.
+        """
+        replay: List[Tuple[int, bool]] = []
+        with AvailabilityIndex._lock:
+            generation = AvailabilityIndex._generation
+            AvailabilityIndex._replays.setdefault(raffle_id, []).append(replay)
+
+        bitmap = _Bitmap()
+        try:
+            ordinals = db.session.execute(
+                select(Ticket.ordinal)
+                .where(Ticket.raffle_id == raffle_id, Ticket.status == TicketStatus.AVAILABLE.value)
+                .execution_options(yield_per=REBUILD_BATCH_SIZE)
+            ).scalars()
+            for ordinal in ordinals:
+                bitmap.set(ordinal, True)
+        except BaseException:
+            with AvailabilityIndex._lock:
+                AvailabilityIndex._end_replay(raffle_id, replay)
+            raise
+
+        with AvailabilityIndex._lock:
+            AvailabilityIndex._end_replay(raffle_id, replay)
+            for ordinal, available in replay:
+                bitmap.set(ordinal, available)
+            if AvailabilityIndex._generation == generation:
+                AvailabilityIndex._bitmaps[raffle_id] = bitmap
+        return bitmap
+
+    @staticmethod
+    def _end_replay(raffle_id: int, replay: List[Tuple[int, bool]]) -> None:
+        """Stop logging commits for one rebuild; caller holds _lock"""
+        replays = AvailabilityIndex._replays[raffle_id]
+        replays.remove(replay)
+        if not replays:
+            del AvailabilityIndex._replays[raffle_id]
+
+    @staticmethod
+    def _bitmap(raffle_id: int) -> Tuple[_Bitmap, bool]:
+        with AvailabilityIndex._lock:
+            bitmap = AvailabilityIndex._bitmaps.get(raffle_id)
+        if bitmap is not None and time.monotonic() - bitmap.loaded_at < AvailabilityIndex.TTL:
+            return bitmap, False
+        return AvailabilityIndex.rebuild(raffle_id), True
+
+    @staticmethod
+    def _pending_taken(raffle_id: int) -> Set[int]:
+        """Ordinals this session has taken but not yet committed"""
+        taken = set()
+        for pending_raffle, ordinal, available in db.session.info.get(_PENDING_KEY, ()):
+            if pending_raffle == raffle_id:
+                (taken.discard if available else taken.add)(ordinal)
+        return taken
+
+    @staticmethod
+    def sample(raffle_id: int, count: int, exclude: Iterable[int] = ()) -> List[int]:
+        """Up to `count` random available ordinals; rebuilds once before coming up short"""
+        exclude = AvailabilityIndex._pending_taken(raffle_id) | set(exclude)
+        bitmap, fresh = AvailabilityIndex._bitmap(raffle_id)
+        picked = bitmap.sample(count, exclude)
+        if len(picked) < count and not fresh:
+            picked = AvailabilityIndex.rebuild(raffle_id).sample(count, exclude)
+        return picked
+
+    @staticmethod
+    def claim(raffle_id: int, quantity: int, apply: Callable[[list], list], consumes: bool = True) -> list:
+        """Sample tickets and run `apply` on them until `quantity` rows were changed.
+
+        `apply(criteria)` runs a conditional UPDATE over the tickets matching
+        `criteria` and returns the changed rows, each with an `ordinal`.
+        With `consumes`, the changed tickets leave the index on commit and
+        sampled ones the UPDATE skipped are treated as already taken: the
+        first miss rebuilds the bitmap, later ones just clear their bits.
+        """
+        changed, tried, rebuilt = [], set(), False
+        for _ in range(CLAIM_ATTEMPTS):
+            ordinals = AvailabilityIndex.sample(raffle_id, quantity - len(changed), exclude=tried)
+            if not ordinals:
+                break
+            rows = apply([Ticket.raffle_id == raffle_id, Ticket.ordinal.in_(ordinals)])
+            changed.extend(rows)
+            tried.update(ordinals)
+            if len(changed) >= quantity:
+                break
+            if consumes:
+                hit = {row.ordinal for row in rows}
+                missed = [ordinal for ordinal in ordinals if ordinal not in hit]
+                if rebuilt:
+                    AvailabilityIndex.discard(raffle_id, missed)
+                else:
+                    AvailabilityIndex.rebuild(raffle_id)
+                    rebuilt = True
+
+        if consumes:
+            AvailabilityIndex.record((raffle_id, row.ordinal) for row in changed)
+        return changed
+
+    @staticmethod
+    def discard(raffle_id: int, ordinals: Iterable[int]) -> None:
+        """Clear bits the DB has shown to be stale"""
+        with AvailabilityIndex._lock:
+            bitmap = AvailabilityIndex._bitmaps.get(raffle_id)
+            if bitmap is not None:
+                for ordinal in ordinals:
+                    bitmap.set(ordinal, False)
+
+    @staticmethod
+    def record(tickets: Iterable[Tuple[int, int]], available: bool = False, session: Session = None) -> None:
+        """Queue (raffle_id, ordinal) status changes for the bitmap until the session commits"""
+        if not AvailabilityIndex._listening:
+            return
+        session = session or db.session()
+        session.info.setdefault(_PENDING_KEY, []).extend(
+            (raffle_id, ordinal, available) for raffle_id, ordinal in tickets
+        )
+
+    @staticmethod
+    def checkpoint() -> int:
+        """Position in this session's queued changes, for rewind() after a savepoint rollback"""
+        return len(db.session.info.get(_PENDING_KEY, ()))
+
+    @staticmethod
+    def rewind(checkpoint: int) -> None:
+        del db.session.info.get(_PENDING_KEY, [])[checkpoint:]
+
+    @staticmethod
+    def _after_commit(session) -> None:
+        pending = session.info.pop(_PENDING_KEY, None)
+        if not pending:
+            return
+        with AvailabilityIndex._lock:
+            for raffle_id, ordinal, available in pending:
+                bitmap = AvailabilityIndex._bitmaps.get(raffle_id)
+                if bitmap is not None:
+                    bitmap.set(ordinal, available)
+                for replay in AvailabilityIndex._replays.get(raffle_id, ()):
+                    replay.append((ordinal, available))
+
+    @staticmethod
+    def _after_rollback(session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+    @staticmethod
+    def _status_set(target, value, oldvalue, initiator) -> None:
+        if (value == TicketStatus.AVAILABLE.value) == (oldvalue == TicketStatus.AVAILABLE.value):
+            return
+        session = object_session(target)
+        state = inspect(target).dict
+        if session is None or state.get('ordinal') is None or state.get('raffle_id') is None:
+            return
+        AvailabilityIndex.record(
+            [(state['raffle_id'], state['ordinal'])], value == TicketStatus.AVAILABLE.value, session
+        )
+
+    @staticmethod
+    def install() -> None:
+        """Attach the commit/rollback hooks and the status listener (idempotent)"""
+        if AvailabilityIndex._listening:
+            return
+        event.listen(Session, 'after_commit', AvailabilityIndex._after_commit)
+        event.listen(Session, 'after_rollback', AvailabilityIndex._after_rollback)
+        event.listen(Ticket.status, 'set', AvailabilityIndex._status_set)
+        AvailabilityIndex._listening = True
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        app.config.setdefault('AVAILABILITY_INDEX_ENABLED', False)
+        app.config.setdefault('AVAILABILITY_INDEX_TTL', AvailabilityIndex.TTL)
+        AvailabilityIndex.TTL = app.config['AVAILABILITY_INDEX_TTL']
+        AvailabilityIndex.install()
@@ -0,0 +1,190 @@
+# src/raffle_service/services/export_service.py
+
+import base64
+import csv
+import io
+import json
+import time
+import zlib
+from decimal import Decimal
+from typing import Optional, Tuple, List, Dict, Any, Iterator
+from datetime import datetime
+from sqlalchemy import select
+from src.shared import db
+from src.raffle_service.models import Ticket, InstantWin
+from src.prize_service.models import PrizeAllocation, AllocationType
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _raffle_filter(model, raffle_id: int):
+    if model is PrizeAllocation:
+        # DrawService does not persist draws separately; draw wins are the record
+        return (
+            PrizeAllocation.allocation_type == AllocationType.RAFFLE_DRAW.value,
+            PrizeAllocation.reference_type == 'raffle',
+            PrizeAllocation.reference_id == str(raffle_id)
+        )
+    return (model.raffle_id == raffle_id,)
+
+# Dataset name -> (model, exported columns), in export order
+EXPORT_DATASETS = {
+    'tickets': (Ticket, [
+        'id', 'ticket_id', 'ticket_number', 'user_id', 'status', 'purchase_time',
+        'is_revealed', 'reveal_time', 'instant_win', 'transaction_id', 'created_at'
+    ]),
+    'instant_wins': (InstantWin, [
+        'id', 'ticket_id', 'prize_reference', 'status', 'discovered_at',
+        'claim_deadline', 'created_at'
+    ]),
+    'draws': (PrizeAllocation, [
+        'id', 'prize_id', 'pool_id', 'sequence_number', 'winner_user_id', 'won_at',
+        'claim_status', 'claimed_at', 'value_claimed'
+    ]),
+}
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+class ExportStats:
+    """Running row count and throughput for one export"""
+
+    def __init__(self):
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+class ExportService:
+    """Streams raffle ledgers as NDJSON or CSV with flat memory use.
+
+    Rows are read through yield_per server-side cursors and encoded as they
+    arrive. Every row carries a cursor token; passing the last token received
+    back as `cursor` resumes after that row.
+    """
+    YIELD_PER = 1000
+    FLUSH_BYTES = 64 * 1024
+
+    @staticmethod
+    def encode_cursor(dataset: str, last_id: int) -> str:
+        return base64.urlsafe_b64encode(f"{dataset}:{last_id}".encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token: str) -> Tuple[Optional[Tuple[str, int]], Optional[str]]:
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            dataset, last_id = base64.urlsafe_b64decode(padded).decode().split(':')
+            if dataset not in EXPORT_DATASETS:
+                raise ValueError(dataset)
+            return (dataset, int(last_id)), None
+        except (ValueError, UnicodeDecodeError):
+            return None, "Invalid export cursor"
+
+    @staticmethod
+    def validate(fmt: str, datasets: List[str], cursor: Optional[str] = None) -> Optional[str]:
+        """Return an error message for an unusable request, else None"""
+        if fmt not in EXPORT_FORMATS:
+            return f"Format must be one of: {', '.join(EXPORT_FORMATS)}"
+        unknown = [d for d in datasets if d not in EXPORT_DATASETS]
+        if unknown or not datasets:
+            return f"Datasets must be from: {', '.join(EXPORT_DATASETS)}"
+        if fmt == 'csv' and len(datasets) > 1:
+            return "CSV exports one dataset at a time"
+        if cursor:
+            position, error = ExportService.decode_cursor(cursor)
+            if error:
+                return error
+            if position[0] not in datasets:
+                return "Cursor does not belong to the requested datasets"
+        return None
+
+    @staticmethod
+    def iter_rows(
+        raffle_id: int,
+        datasets: List[str],
+        cursor: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (dataset, row) in dataset order, then id order"""
+        ordered = [d for d in EXPORT_DATASETS if d in datasets]
+        resume_dataset, resume_after = None, None
+        if cursor:
+            (resume_dataset, resume_after), _ = ExportService.decode_cursor(cursor)
+            ordered = ordered[ordered.index(resume_dataset):]
+
+        for dataset in ordered:
+            model, columns = EXPORT_DATASETS[dataset]
+            query = select(*[getattr(model, c) for c in columns])\
+                .where(*_raffle_filter(model, raffle_id))
+            if dataset == resume_dataset:
+                query = query.where(model.id > resume_after)
+            query = query.order_by(model.id)\
+                .execution_options(yield_per=ExportService.YIELD_PER, stream_results=True)
+
+            for row in db.session.execute(query).mappings():
+                yield dataset, dict(row)
+
+    @staticmethod
+    def stream(
+        raffle_id: int,
+        fmt: str = 'ndjson',
+        datasets: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        compress: bool = False,
+        stats: Optional[ExportStats] = None
+    ) -> Iterator[bytes]:
+        """Encode rows into byte chunks of roughly FLUSH_BYTES, gzipped if asked"""
+        datasets = datasets or list(EXPORT_DATASETS)
+        stats = stats or ExportStats()
+        gzipper = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+        buffer = io.StringIO()
+        writer = None
+
+        def drain() -> bytes:
+            data = buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            return gzipper.compress(data) if gzipper else data
+
+        for dataset, row in ExportService.iter_rows(raffle_id, datasets, cursor):
+            token = ExportService.encode_cursor(dataset, row['id'])
+            values = {k: _plain(v) for k, v in row.items()}
+
+            if fmt == 'csv':
+                if writer is None:
+                    writer = csv.DictWriter(buffer, fieldnames=list(values) + ['cursor'])
+                    if not cursor:  # a resumed export continues an existing file
+                        writer.writeheader()
+                writer.writerow({**values, 'cursor': token})
+            else:
+                buffer.write(json.dumps({'dataset': dataset, **values, 'cursor': token}))
+                buffer.write('\n')
+
+            stats.rows += 1
+            if buffer.tell() >= ExportService.FLUSH_BYTES:
+                chunk = drain()
+                if chunk:
+                    yield chunk
+
+        tail = drain()
+        if gzipper:
+            tail += gzipper.flush()
+        if tail:
+            yield tail
+
+        stats.finished = time.perf_counter()
+        logger.info(
+            f"Exported {stats.rows} rows for raffle {raffle_id} "
+            f"in {stats.elapsed:.2f}s ({stats.rows_per_second:,.0f} rows/s)"
+        )
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
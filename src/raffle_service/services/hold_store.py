@@ -0,0 +1,358 @@
+# src/raffle_service/services/hold_store.py
+
+import heapq
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+from flask import Flask, current_app
+from sqlalchemy import select, update, insert
+from sqlalchemy.exc import SQLAlchemyError
+from src.shared import db
+from src.raffle_service.models import Ticket, TicketStatus
+from src.raffle_service.models.ticket_reservation import TicketReservation, ReservedTicket, ReservationStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+@dataclass
+class Hold:
+    reservation_id: str
+    raffle_id: int
+    user_id: int
+    ticket_ids: List[int]
+    total_amount: float
+    expires_at: float   # epoch seconds, so snapshots survive a restart
+
+class _FreeTickets:
+    """Unheld ticket ids of one raffle shard: O(1) add, remove and random pick"""
+
+    def __init__(self, ticket_ids=()):
+        self.ids: List[int] = []
+        self.pos: Dict[int, int] = {}
+        for ticket_id in ticket_ids:
+            self.add(ticket_id)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ticket_id: int) -> None:
+        if ticket_id not in self.pos:
+            self.pos[ticket_id] = len(self.ids)
+            self.ids.append(ticket_id)
+
+    def discard(self, ticket_id: int) -> None:
+        index = self.pos.pop(ticket_id, None)
+        if index is None:
+            return
+        last = self.ids.pop()
+        if last != ticket_id:
+            self.ids[index] = last
+            self.pos[last] = index
+
+    def take(self, count: int) -> List[int]:
+        taken = []
+        for _ in range(count):
+            ticket_id = self.ids[random.randrange(len(self.ids))]
+            self.discard(ticket_id)
+            taken.append(ticket_id)
+        return taken
+
+class _RaffleShard:
+    def __init__(self):
+        self.free = _FreeTickets()
+        self.loaded_at: Optional[float] = None
+
+class ReservationHoldStore:
+    """In-memory reservation holds, one shard of each raffle per worker.
+
+    With RESERVATION_HOLD_STORE_ENABLED, create_reservation keeps the hold
+    (reservation id -> ticket ids, expiry) in this process instead of
+    writing TicketReservation/ReservedTicket rows and flipping tickets to
+    RESERVED. Worker HOLD_STORE_WORKER_INDEX of HOLD_STORE_WORKER_COUNT only
+    hands out tickets with id % count == index, so workers never hold the
+    same ticket. A hold reaches the database only when PaymentService picks
+    it up (materialize); abandoned holds simply lapse in memory. Live holds
+    are snapshotted to a file every HOLD_STORE_SNAPSHOT_INTERVAL seconds
+    and reloaded on start, so a restart does not drop carts mid-checkout.
+    Payment requests must reach the worker that issued the reservation.
+
+    Held tickets are still AVAILABLE in the tickets table, so direct
+    purchases (TicketService.purchase_tickets and the purchase coalescer)
+    exclude held_ticket_ids() while this store is on. Only this worker's
+    holds are visible, so direct purchases for a raffle must be routed to
+    the workers that hold its tickets as well.
+    """
+    REFRESH_SECONDS = 30
+
+    _holds: Dict[str, Hold] = {}
+    _expiry: List[Tuple[float, str]] = []
+    _shards: Dict[int, _RaffleShard] = {}
+    _lock = threading.Lock()
+    _dirty = False
+    _snapshot_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(current_app.config.get('RESERVATION_HOLD_STORE_ENABLED'))
+
+    @staticmethod
+    def reset() -> None:
+        with ReservationHoldStore._lock:
+            ReservationHoldStore._holds.clear()
+            ReservationHoldStore._expiry.clear()
+            ReservationHoldStore._shards.clear()
+            ReservationHoldStore._dirty = False
+
+    @staticmethod
+    def _shard_filter():
+        count = current_app.config['HOLD_STORE_WORKER_COUNT']
+        index = current_app.config['HOLD_STORE_WORKER_INDEX']
+        return Ticket.id % count == index
+
+    @staticmethod
+    def _expire_due(now: float) -> None:
+        """Return lapsed holds' tickets to their shard; caller holds _lock"""
+        expiry = ReservationHoldStore._expiry
+        while expiry and expiry[0][0] <= now:
+            _, reservation_id = heapq.heappop(expiry)
+            hold = ReservationHoldStore._holds.get(reservation_id)
+            if hold is None or hold.expires_at > now:
+                continue
+            del ReservationHoldStore._holds[reservation_id]
+            shard = ReservationHoldStore._shards.get(hold.raffle_id)
+            if shard is not None:
+                for ticket_id in hold.ticket_ids:
+                    shard.free.add(ticket_id)
+            ReservationHoldStore._dirty = True
+
+    @staticmethod
+    def _load_shard(raffle_id: int) -> _RaffleShard:
+        """Fetch this worker's available tickets, minus live holds; caller holds _lock"""
+        shard = ReservationHoldStore._shards.setdefault(raffle_id, _RaffleShard())
+        available = db.session.execute(
+            select(Ticket.id).where(
+                Ticket.raffle_id == raffle_id,
+                Ticket.status == TicketStatus.AVAILABLE.value,
+                ReservationHoldStore._shard_filter()
+            )
+        ).scalars().all()
+        held = {
+            ticket_id for hold in ReservationHoldStore._holds.values()
+            if hold.raffle_id == raffle_id for ticket_id in hold.ticket_ids
+        }
+        shard.free = _FreeTickets(t for t in available if t not in held)
+        shard.loaded_at = time.monotonic()
+        return shard
+
+    @staticmethod
+    def hold(reservation_id: str, raffle_id: int, user_id: int, quantity: int,
+             total_amount: float, expires_at: datetime) -> Tuple[Optional[Hold], Optional[str]]:
+        now = time.time()
+        with ReservationHoldStore._lock:
+            ReservationHoldStore._expire_due(now)
+            shard = ReservationHoldStore._shards.get(raffle_id)
+            stale = (shard is None or shard.loaded_at is None or
+                     time.monotonic() - shard.loaded_at > ReservationHoldStore.REFRESH_SECONDS)
+            if stale or len(shard.free) < quantity:
+                shard = ReservationHoldStore._load_shard(raffle_id)
+            if len(shard.free) < quantity:
+                return None, "Not enough tickets available"
+
+            hold = Hold(
+                reservation_id=reservation_id,
+                raffle_id=raffle_id,
+                user_id=user_id,
+                ticket_ids=shard.free.take(quantity),
+                total_amount=float(total_amount),
+                expires_at=_as_utc(expires_at).timestamp()
+            )
+            ReservationHoldStore._holds[reservation_id] = hold
+            heapq.heappush(ReservationHoldStore._expiry, (hold.expires_at, reservation_id))
+            ReservationHoldStore._dirty = True
+            return hold, None
+
+    @staticmethod
+    def get(reservation_id: str) -> Optional[Hold]:
+        with ReservationHoldStore._lock:
+            ReservationHoldStore._expire_due(time.time())
+            return ReservationHoldStore._holds.get(reservation_id)
+
+    @staticmethod
+    def held_ticket_ids(raffle_id: int) -> Set[int]:
+        """Ids of this raffle's tickets in live holds; empty while the store is off"""
+        if not ReservationHoldStore.enabled():
+            return set()
+        with ReservationHoldStore._lock:
+            ReservationHoldStore._expire_due(time.time())
+            return {
+                ticket_id for hold in ReservationHoldStore._holds.values()
+                if hold.raffle_id == raffle_id for ticket_id in hold.ticket_ids
+            }
+
+    @staticmethod
+    def _pop(reservation_id: str, user_id: int) -> Optional[Hold]:
+        """Take the hold out of the store if `user_id` owns it; another user's hold is returned but kept"""
+        with ReservationHoldStore._lock:
+            ReservationHoldStore._expire_due(time.time())
+            hold = ReservationHoldStore._holds.get(reservation_id)
+            if hold is not None and hold.user_id == user_id:
+                del ReservationHoldStore._holds[reservation_id]
+                ReservationHoldStore._dirty = True
+            return hold
+
+    @staticmethod
+    def _restore(hold: Hold) -> None:
+        with ReservationHoldStore._lock:
+            ReservationHoldStore._holds[hold.reservation_id] = hold
+            heapq.heappush(ReservationHoldStore._expiry, (hold.expires_at, hold.reservation_id))
+            ReservationHoldStore._dirty = True
+
+    @staticmethod
+    def _release(hold: Hold) -> None:
+        """Return a failed hold's still-available tickets to its shard"""
+        available = db.session.execute(
+            select(Ticket.id).where(
+                Ticket.id.in_(hold.ticket_ids),
+                Ticket.status == TicketStatus.AVAILABLE.value
+            )
+        ).scalars().all()
+        with ReservationHoldStore._lock:
+            shard = ReservationHoldStore._shards.get(hold.raffle_id)
+            if shard is not None:
+                for ticket_id in available:
+                    shard.free.add(ticket_id)
+
+    @staticmethod
+    def materialize(reservation_id: str, user_id: int) -> Optional[str]:
+        """Write an in-memory hold through to the reservation tables.
+
+        Creates the ACTIVE TicketReservation and its ReservedTicket rows and
+        moves the tickets to RESERVED with one conditional UPDATE, then
+        commits, so PaymentService continues on the regular DB path. Returns
+        an error if any held ticket was sold from under the hold meanwhile,
+        in which case the rest of its tickets go back to the shard. Only the
+        holder may materialize a hold. A reservation that is not held here
+        is left to the DB path.
+        """
+        hold = ReservationHoldStore._pop(reservation_id, user_id)
+        if hold is None:
+            return None
+        if hold.user_id != user_id:
+            return "Not authorized to pay for this reservation"
+
+        expires_at = datetime.fromtimestamp(hold.expires_at, tz=timezone.utc).replace(tzinfo=None)
+        try:
+            db.session.add(TicketReservation(
+                id=hold.reservation_id,
+                user_id=hold.user_id,
+                raffle_id=hold.raffle_id,
+                quantity=len(hold.ticket_ids),
+                total_amount=hold.total_amount,
+                status=ReservationStatus.ACTIVE.value,
+                expires_at=expires_at
+            ))
+            db.session.flush()
+            result = db.session.execute(
+                update(Ticket)
+                .where(Ticket.id.in_(hold.ticket_ids), Ticket.status == TicketStatus.AVAILABLE.value)
+                .values(status=TicketStatus.RESERVED.value, reservation_id=hold.reservation_id,
+                        reserved_until=expires_at),
+                execution_options={'synchronize_session': False}
+            )
+            if result.rowcount != len(hold.ticket_ids):
+                db.session.rollback()
+                ReservationHoldStore._release(hold)
+                return "Reserved tickets are no longer available"
+
+            db.session.execute(insert(ReservedTicket), [
+                {'reservation_id': hold.reservation_id, 'ticket_id': ticket_id,
+                 'status': TicketStatus.RESERVED.value}
+                for ticket_id in hold.ticket_ids
+            ])
+            db.session.commit()
+            return None
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            ReservationHoldStore._restore(hold)
+            logger.error(f"Error materializing hold {reservation_id}: {str(e)}")
+            return str(e)
+
+    @staticmethod
+    def snapshot(path: Path) -> bool:
+        """Atomically write live holds to `path`; False if nothing changed"""
+        with ReservationHoldStore._lock:
+            if not ReservationHoldStore._dirty:
+                return False
+            ReservationHoldStore._expire_due(time.time())
+            payload = [asdict(hold) for hold in ReservationHoldStore._holds.values()]
+            ReservationHoldStore._dirty = False
+
+        temp = path.with_suffix('.tmp')
+        with open(temp, 'w') as f:
+            json.dump(payload, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+        return True
+
+    @staticmethod
+    def recover(path: Path) -> int:
+        """Reload unexpired holds from a snapshot; returns how many came back"""
+        if not path.exists():
+            return 0
+        with open(path) as f:
+            payload = json.load(f)
+        now = time.time()
+        with ReservationHoldStore._lock:
+            for data in payload:
+                hold = Hold(**data)
+                if hold.expires_at > now:
+                    ReservationHoldStore._holds[hold.reservation_id] = hold
+                    heapq.heappush(ReservationHoldStore._expiry, (hold.expires_at, hold.reservation_id))
+            # Shards reload lazily and exclude these holds
+            ReservationHoldStore._shards.clear()
+            return len(ReservationHoldStore._holds)
+
+    @staticmethod
+    def snapshot_path(app: Flask) -> Path:
+        directory = Path(app.config['HOLD_STORE_SNAPSHOT_DIR'])
+        return directory / f"holds-{app.config['HOLD_STORE_WORKER_INDEX']}.json"
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        app.config.setdefault('RESERVATION_HOLD_STORE_ENABLED', False)
+        app.config.setdefault('HOLD_STORE_WORKER_INDEX', 0)
+        app.config.setdefault('HOLD_STORE_WORKER_COUNT', 1)
+        app.config.setdefault('HOLD_STORE_SNAPSHOT_DIR', str(Path(app.config['PROJECT_ROOT']) / 'data'))
+        app.config.setdefault('HOLD_STORE_SNAPSHOT_INTERVAL', 5)
+        if not app.config['RESERVATION_HOLD_STORE_ENABLED'] or ReservationHoldStore._snapshot_thread:
+            return
+
+        path = ReservationHoldStore.snapshot_path(app)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        recovered = ReservationHoldStore.recover(path)
+        if recovered:
+            logger.info(f"Recovered {recovered} reservation holds from {path}")
+
+        interval = app.config['HOLD_STORE_SNAPSHOT_INTERVAL']
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    ReservationHoldStore.snapshot(path)
+                except OSError as e:
+                    logger.error(f"Error writing hold snapshot: {str(e)}")
+
+        ReservationHoldStore._snapshot_thread = threading.Thread(target=run, name='hold-snapshot', daemon=True)
+        ReservationHoldStore._snapshot_thread.start()
@@ -11,6 +11,7 @@ from src.raffle_service.models.ticket import Ticket, TicketStatus
 from src.raffle_service.models.raffle import Raffle, RaffleStatus
 from src.prize_service.models import PrizeAllocation, AllocationType, ClaimStatus, PrizePool
 from src.prize_service.services.prize_service import PrizeService
+from src.prize_service.services.prize_catalog import PrizeCatalog
 import logging
 
 logger = logging.getLogger(__name__)
@@ -180,7 +181,7 @@ class InstantWinService:
             db.session.commit()
 
             # Get prize instance details for UI
-            prize = allocation.prize
+            prize = PrizeCatalog.prize(allocation.prize_id)
             if not prize:
                 return None, "Prize details not found"
 
@@ -1,11 +1,13 @@
 from typing import Optional, Tuple, Dict
 from datetime import datetime, timezone
+from sqlalchemy import select, update
 from sqlalchemy.exc import SQLAlchemyError
 from src.shared import db
 from decimal import Decimal
 from src.raffle_service.models.ticket_reservation import TicketReservation, ReservationStatus, ReservedTicket
 from src.raffle_service.models.ticket import Ticket, TicketStatus
 from src.user_service.models import User, CreditTransaction
+from src.raffle_service.services.hold_store import ReservationHoldStore
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +20,11 @@ class PaymentService:
     ) -> Tuple[Optional[Dict], Optional[str]]:
         """Create a payment intent for a reservation"""
         try:
+            if ReservationHoldStore.enabled():
+                error = ReservationHoldStore.materialize(reservation_id, user_id)
+                if error:
+                    return None, error
+
             # Get reservation with locking
             reservation = db.session.query(TicketReservation).with_for_update().get(reservation_id)
             if not reservation:
@@ -30,12 +37,7 @@ class PaymentService:
             if reservation.user_id != user_id:
                 return None, "Not authorized to pay for this reservation"
 
-            # Check if reservation is expired
-            expires_at = reservation.expires_at
-            if expires_at.tzinfo is None:
-                expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-            if datetime.now(timezone.utc) > expires_at:
+            if reservation.is_expired():
                 return None, "Reservation has expired"
 
             # Get user's available credits
@@ -122,6 +124,10 @@ class PaymentService:
         try:
             # Extract reservation_id from payment_intent_id
             reservation_id = payment_intent_id.replace('pi_', '')
+            if ReservationHoldStore.enabled():
+                error = ReservationHoldStore.materialize(reservation_id, user_id)
+                if error:
+                    return None, error
             
             reservation = db.session.query(TicketReservation).with_for_update().get(reservation_id)
             if not reservation:
@@ -136,37 +142,141 @@ class PaymentService:
             if reservation.user_id != user_id:
                 return None, "Not authorized to confirm this payment"
 
-            # Get reserved tickets
-            reserved_tickets = db.session.query(Ticket).join(
-                ReservedTicket,
-                ReservedTicket.ticket_id == Ticket.id
-            ).filter(
-                ReservedTicket.reservation_id == reservation_id
-            ).with_for_update().all()
+            # Sell the reserved tickets still held for this reservation in one statement
+            now = datetime.now(timezone.utc)
+            sold = Ticket.bulk_set_status(
+                [
+                    Ticket.id.in_(
+                        select(ReservedTicket.ticket_id).where(ReservedTicket.reservation_id == reservation_id)
+                    ),
+                    Ticket.reservation_id == reservation_id,
+                    Ticket.status == TicketStatus.RESERVED.value
+                ],
+                TicketStatus.SOLD.value,
+                user_id=user_id,
+                purchase_time=now,
+                reserved_until=None
+            )
 
-            # Update tickets status
-            for ticket in reserved_tickets:
-                ticket.status = TicketStatus.SOLD.value
-                ticket.user_id = user_id
-                ticket.purchase_time = datetime.now(timezone.utc)
+            if len(sold) < reservation.quantity:
+                db.session.rollback()
+                return None, "Reservation has expired"
 
             # Update reservation status
             reservation.status = ReservationStatus.COMPLETED.value
-            reservation.completed_at = datetime.now(timezone.utc)
+            reservation.completed_at = now
 
             db.session.commit()
 
             return {
                 "status": "succeeded",
                 "reservation_id": reservation_id,
-                "completed_at": reservation.completed_at.isoformat(),
+                "completed_at": now.isoformat(),
                 "tickets": [{
                     "ticket_id": ticket.ticket_id,
                     "ticket_number": ticket.ticket_number
-                } for ticket in reserved_tickets]
+                } for ticket in sold]
             }, None
 
         except SQLAlchemyError as e:
             db.session.rollback()
             logger.error(f"Database error in confirm_payment: {str(e)}")
-            return None, str(e)
\ No newline at end of file
+            return None, str(e)
+
+    @staticmethod
+    def checkout(
+        reservation_id: str,
+        user_id: int
+    ) -> Tuple[Optional[Dict], Optional[str]]:
+        """Pay for a reservation with site credits and sell its tickets in one transaction.
+
+        One lock on the reservation, a conditional debit (only if the
+        balance covers it), one bulk UPDATE of the held tickets and the
+        reservation's move to COMPLETED, committed together. Reservations
+        that need another payment method still go through
+        create_payment_intent / confirm_payment.
+        """
+        try:
+            if ReservationHoldStore.enabled():
+                error = ReservationHoldStore.materialize(reservation_id, user_id)
+                if error:
+                    return None, error
+
+            reservation = db.session.execute(
+                select(TicketReservation).where(TicketReservation.id == reservation_id).with_for_update()
+            ).scalar_one_or_none()
+            if not reservation:
+                return None, "Reservation not found"
+
+            if reservation.user_id != user_id:
+                return None, "Not authorized to pay for this reservation"
+
+            if reservation.status not in [ReservationStatus.PENDING.value, ReservationStatus.ACTIVE.value]:
+                return None, f"Cannot check out reservation in {reservation.status} status"
+
+            if reservation.is_expired():
+                return None, "Reservation has expired"
+
+            total_amount = float(reservation.total_amount)
+            balance_after = db.session.execute(
+                update(User)
+                .where(User.id == user_id, User.site_credits >= total_amount)
+                .values(site_credits=User.site_credits - total_amount)
+                .returning(User.site_credits),
+                execution_options={'synchronize_session': False}
+            ).scalar()
+            if balance_after is None:
+                db.session.rollback()
+                return None, "Insufficient site credits; use a payment intent instead"
+
+            transaction = CreditTransaction(
+                user_id=user_id,
+                amount=-total_amount,
+                transaction_type='subtract',
+                balance_after=balance_after,
+                reference_type='ticket_purchase',
+                reference_id=reservation_id,
+                created_by_id=user_id
+            )
+            db.session.add(transaction)
+            db.session.flush()
+
+            now = datetime.now(timezone.utc)
+            sold = Ticket.bulk_set_status(
+                [Ticket.reservation_id == reservation_id, Ticket.status == TicketStatus.RESERVED.value],
+                TicketStatus.SOLD.value,
+                user_id=user_id,
+                purchase_time=now,
+                reserved_until=None,
+                transaction_id=transaction.id
+            )
+            if len(sold) < reservation.quantity:
+                db.session.rollback()
+                return None, "Reservation has expired"
+
+            reservation.status = ReservationStatus.COMPLETED.value
+            reservation.completed_at = now
+
+            db.session.commit()
+
+            return {
+                "status": "succeeded",
+                "reservation_id": reservation_id,
+                "completed_at": now.isoformat(),
+                "payment_breakdown": {
+                    "site_credit": {
+                        "amount": total_amount,
+                        "status": "applied"
+                    }
+                },
+                "balance_after": balance_after,
+                "tickets": [{
+                    "ticket_id": ticket.ticket_id,
+                    "ticket_number": ticket.ticket_number
+                } for ticket in sold]
+            }, None
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Database error in checkout: {str(e)}")
+            return None, str(e)
@@ -0,0 +1,258 @@
+# src/raffle_service/services/purchase_coalescer.py
+
+import threading
+from collections import deque
+from typing import Optional, Tuple, List, Dict
+from datetime import datetime, timezone
+from flask import Flask, current_app
+from sqlalchemy import select, func
+from sqlalchemy.exc import SQLAlchemyError
+from src.shared import db
+from src.raffle_service.models import Ticket, TicketStatus, Raffle
+from src.raffle_service.services.purchase_limit_service import PurchaseLimitService
+from src.raffle_service.services.availability_index import AvailabilityIndex
+from src.raffle_service.services.hold_store import ReservationHoldStore
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PurchaseRequest:
+    """One caller's queued purchase; the worker fills in ticket_ids or error"""
+
+    def __init__(self, user_id: int, quantity: int, transaction_id: Optional[int] = None):
+        self.user_id = user_id
+        self.quantity = quantity
+        self.transaction_id = transaction_id
+        self.ticket_ids: Optional[List[int]] = None
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+        # Both guarded by the worker's lock: once started it can no longer be cancelled
+        self.started = False
+        self.cancelled = False
+
+    def succeed(self, ticket_ids: List[int]) -> None:
+        self.ticket_ids = ticket_ids
+        self.done.set()
+
+    def fail(self, error: str) -> None:
+        self.error = error
+        self.done.set()
+
+class _RaffleWorker:
+    """Single writer for one raffle's purchases in this process"""
+
+    def __init__(self, app: Flask, raffle_id: int, window: float, max_batch: int, idle_timeout: float):
+        self.app = app
+        self.raffle_id = raffle_id
+        self.window = window
+        self.max_batch = max_batch
+        self.idle_timeout = idle_timeout
+        self.queue: deque = deque()
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name=f'purchase-coalescer-{raffle_id}', daemon=True)
+
+    def submit(self, request: PurchaseRequest) -> None:
+        with self.cond:
+            self.queue.append(request)
+            self.cond.notify()
+
+    def cancel(self, request: PurchaseRequest) -> bool:
+        """Withdraw a request no batch has taken yet; False once it is being processed"""
+        with self.cond:
+            if request.started:
+                return False
+            request.cancelled = True
+            if request in self.queue:
+                self.queue.remove(request)
+            return True
+
+    def _take_batch(self) -> List[PurchaseRequest]:
+        with self.cond:
+            if not self.queue:
+                self.cond.wait(self.idle_timeout)
+                if not self.queue:
+                    return []
+            # Give concurrent callers a few milliseconds to join this batch
+            self.cond.wait(self.window)
+            batch = []
+            while self.queue and len(batch) < self.max_batch:
+                request = self.queue.popleft()
+                if not request.cancelled:
+                    request.started = True
+                    batch.append(request)
+            return batch
+
+    def _run(self) -> None:
+        with self.app.app_context():
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    if PurchaseCoalescer._retire(self):
+                        return
+                    continue
+                try:
+                    PurchaseCoalescer.process_batch(self.raffle_id, batch)
+                except Exception as e:
+                    logger.exception(f"Purchase batch for raffle {self.raffle_id} failed")
+                    for request in batch:
+                        if not request.done.is_set():
+                            request.fail(f"Failed to complete purchase: {str(e)}")
+                finally:
+                    db.session.remove()
+
+class PurchaseCoalescer:
+    """Batches concurrent purchases for a raffle into one transaction.
+
+    With PURCHASE_COALESCING_ENABLED, TicketService.purchase_tickets queues
+    the request to the raffle's worker thread instead of locking a random
+    sample of rows itself. Every PURCHASE_COALESCE_WINDOW_MS the worker
+    drains the queue and serves all requests in one transaction, applying
+    the same limit claim and ticket UPDATE as the direct path, then wakes
+    each caller with its own tickets or error. A caller that times out
+    withdraws its request unless a batch has already started on it.
+    """
+    _workers: Dict[int, _RaffleWorker] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _worker(raffle_id: int) -> _RaffleWorker:
+        with PurchaseCoalescer._lock:
+            worker = PurchaseCoalescer._workers.get(raffle_id)
+            if worker is None:
+                config = current_app.config
+                worker = _RaffleWorker(
+                    current_app._get_current_object(),
+                    raffle_id,
+                    window=config['PURCHASE_COALESCE_WINDOW_MS'] / 1000,
+                    max_batch=config['PURCHASE_COALESCE_MAX_BATCH'],
+                    idle_timeout=config['PURCHASE_COALESCE_IDLE_TIMEOUT']
+                )
+                PurchaseCoalescer._workers[raffle_id] = worker
+                worker.thread.start()
+            return worker
+
+    @staticmethod
+    def _retire(worker: _RaffleWorker) -> bool:
+        """Stop an idle worker unless a request slipped in meanwhile"""
+        with PurchaseCoalescer._lock, worker.cond:
+            if worker.queue:
+                return False
+            if PurchaseCoalescer._workers.get(worker.raffle_id) is worker:
+                del PurchaseCoalescer._workers[worker.raffle_id]
+            return True
+
+    @staticmethod
+    def submit(raffle_id: int, user_id: int, quantity: int, transaction_id: Optional[int] = None) -> Tuple[Optional[List[int]], Optional[str]]:
+        """Queue a purchase and wait for the batch that serves it; returns ticket ids"""
+        request = PurchaseRequest(user_id, quantity, transaction_id)
+        worker = PurchaseCoalescer._worker(raffle_id)
+        worker.submit(request)
+        if not request.done.wait(current_app.config['PURCHASE_COALESCE_TIMEOUT']):
+            if worker.cancel(request):
+                return None, "Purchase timed out before it was processed; please retry"
+            # A batch already holds it; its outcome is the only truthful answer
+            request.done.wait()
+        return request.ticket_ids, request.error
+
+    @staticmethod
+    def purchase(raffle_id: int, user_id: int, quantity: int, transaction_id: Optional[int] = None) -> Tuple[Optional[List[Ticket]], Optional[str]]:
+        ticket_ids, error = PurchaseCoalescer.submit(raffle_id, user_id, quantity, transaction_id)
+        if error:
+            return None, error
+        tickets = Ticket.query.filter(Ticket.id.in_(ticket_ids)).order_by(Ticket.id).all()
+        return tickets, None
+
+    @staticmethod
+    def process_batch(raffle_id: int, requests: List[PurchaseRequest]) -> None:
+        """Serve queued requests in arrival order in a single transaction.
+
+        Each request claims its tier-adjusted limit through
+        PurchaseLimitService.claim_purchase and sells its tickets with
+        Ticket.bulk_set_status inside its own savepoint, so a request that
+        is over its limit or finds too few tickets leaves no trace while the
+        rest of the batch commits together.
+        """
+        try:
+            raffle = db.session.get(Raffle, raffle_id)
+            if raffle is None or not raffle.can_purchase_tickets():
+                error = "Raffle not found" if raffle is None else \
+                    f"Cannot purchase tickets for raffle in {raffle.status} status"
+                for request in requests:
+                    request.fail(error)
+                return
+
+            # Without the index, one sorted fetch covers the whole batch; live
+            # in-memory holds also need it, since the bitmap counts them as free
+            held = ReservationHoldStore.held_ticket_ids(raffle_id)
+            use_index = AvailabilityIndex.enabled() and not held
+            candidates: List[int] = []
+            if not use_index:
+                candidates = db.session.execute(
+                    select(Ticket.id)
+                    .where(Ticket.raffle_id == raffle_id, Ticket.status == TicketStatus.AVAILABLE.value,
+                           Ticket.id.not_in(held))
+                    .order_by(func.random())
+                    .limit(sum(request.quantity for request in requests))
+                    .with_for_update(skip_locked=True)
+                ).scalars().all()
+
+            now = datetime.now(timezone.utc)
+            served, sold_count = [], 0
+            for request in requests:
+                checkpoint = AvailabilityIndex.checkpoint()
+                savepoint = db.session.begin_nested()
+                _, error = PurchaseLimitService.claim_purchase(request.user_id, raffle_id, request.quantity)
+                if error and error.startswith("Database error"):
+                    # claim_purchase rolled the whole transaction back
+                    raise SQLAlchemyError(error)
+                if error:
+                    savepoint.rollback()
+                    AvailabilityIndex.rewind(checkpoint)
+                    request.fail(error)
+                    continue
+
+                def sell(criteria, request=request):
+                    return Ticket.bulk_set_status(
+                        [*criteria, Ticket.status == TicketStatus.AVAILABLE.value],
+                        TicketStatus.SOLD.value,
+                        user_id=request.user_id,
+                        purchase_time=now,
+                        transaction_id=request.transaction_id
+                    )
+
+                if use_index:
+                    sold = AvailabilityIndex.claim(raffle_id, request.quantity, sell)
+                else:
+                    picked = candidates[sold_count:sold_count + request.quantity]
+                    sold = sell([Ticket.id.in_(picked)]) if len(picked) == request.quantity else []
+
+                if len(sold) < request.quantity:
+                    savepoint.rollback()
+                    AvailabilityIndex.rewind(checkpoint)
+                    request.fail("Not enough tickets available")
+                    continue
+
+                savepoint.commit()
+                sold_count += len(sold)
+                request.ticket_ids = [row.id for row in sold]
+                served.append(request)
+            if not served:
+                db.session.rollback()
+                return
+
+            db.session.commit()
+            for request in served:
+                request.succeed(request.ticket_ids)
+
+            logger.info(
+                f"Coalesced {len(requests)} purchases for raffle {raffle_id}: "
+                f"{len(served)} served, {sold_count} tickets"
+            )
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Coalesced purchase for raffle {raffle_id} failed: {str(e)}")
+            for request in requests:
+                if not request.done.is_set():
+                    request.ticket_ids = None
+                    request.fail(f"Failed to complete purchase: {str(e)}")
@@ -1,20 +1,60 @@
 from typing import Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timezone
 from src.shared import db
+from src.shared.entity_cache import EntityCache
 from flask import current_app
 from src.raffle_service.models import UserRaffleStats, Raffle
+from src.user_service.models import User
 
 class PurchaseLimitService:
+    @staticmethod
+    def _user_limit(user_id: int, raffle: Raffle) -> int:
+        """Raffle's per-user limit scaled by the user's tier multiplier"""
+        user = EntityCache.get(User, user_id)
+        if not user:
+            return raffle.max_tickets_per_user
+        return user.get_adjusted_purchase_limit(raffle.max_tickets_per_user)
+
+    @staticmethod
+    def _upsert_stats(user_id: int, raffle_id: int, quantity: int, limit: Optional[int] = None):
+        """INSERT ... ON CONFLICT (user_id, raffle_id) DO UPDATE adding `quantity`.
+
+        With a `limit` the update only applies while the new total stays
+        within it, so an over-limit increment returns no row. Postgres and
+        SQLite share the syntax; each needs its own dialect construct.
+        """
+        dialect = db.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        now = datetime.now(timezone.utc)
+        table = UserRaffleStats.__table__
+        new_total = func.coalesce(table.c.tickets_purchased, 0) + quantity
+
+        stmt = insert(table).values(
+            user_id=user_id,
+            raffle_id=raffle_id,
+            tickets_purchased=quantity,
+            last_purchase_time=now,
+            created_at=now
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.raffle_id],
+            set_={'tickets_purchased': new_total, 'last_purchase_time': now, 'updated_at': now},
+            where=(new_total <= limit) if limit is not None else None
+        ).returning(table.c.tickets_purchased)
+
     @staticmethod
     def check_purchase_limit(user_id: int, raffle_id: int, requested_quantity: int, max_tickets: int = None) -> Tuple[bool, Optional[str]]:
         """
-        Check if a purchase would exceed the user's limit
+        Check if a purchase would exceed the user's limit. Read-only: the
+        authoritative check happens in claim_purchase.
         Returns: (allowed: bool, error_message: Optional[str])
         """
         try:
             # Get raffle to check its specific limits
-            raffle = Raffle.query.get(raffle_id)
+            raffle = EntityCache.get(Raffle, raffle_id)
             if not raffle:
                 return False, "Raffle not found"
 
@@ -22,25 +62,16 @@ class PurchaseLimitService:
             if requested_quantity > current_app.config['RAFFLE'].MAX_TICKETS_PER_TRANSACTION:
                 return False, f"Maximum purchase is {current_app.config['RAFFLE'].MAX_TICKETS_PER_TRANSACTION} tickets per transaction"
 
-            # Get or create user stats for this raffle
             stats = UserRaffleStats.query.filter_by(
                 user_id=user_id,
                 raffle_id=raffle_id
             ).first()
+            purchased = stats.tickets_purchased if stats else 0
 
-            if not stats:
-                stats = UserRaffleStats(
-                    user_id=user_id,
-                    raffle_id=raffle_id,
-                    tickets_purchased=0
-                )
-                db.session.add(stats)
-                db.session.commit()
-
-            # Check if purchase would exceed raffle-specific limit
-            total_tickets = stats.tickets_purchased + requested_quantity
-            if total_tickets > raffle.max_tickets_per_user:
-                return False, f"Purchase would exceed limit of {raffle.max_tickets_per_user} tickets per user for this raffle. You currently have {stats.tickets_purchased} tickets."
+            # Check if purchase would exceed the tier-adjusted raffle limit
+            limit = PurchaseLimitService._user_limit(user_id, raffle)
+            if purchased + requested_quantity > limit:
+                return False, f"Purchase would exceed limit of {limit} tickets per user for this raffle. You currently have {purchased} tickets."
 
             return True, None
 
@@ -48,6 +79,42 @@ class PurchaseLimitService:
             db.session.rollback()
             return False, f"Database error: {str(e)}"
 
+    @staticmethod
+    def claim_purchase(user_id: int, raffle_id: int, quantity: int) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Atomically check the user's limit and add `quantity` to their count.
+        Runs in the caller's transaction (no commit), so a failed purchase
+        rolls the claim back with it.
+        Returns: (tickets_purchased after the claim, error_message)
+        """
+        try:
+            raffle = EntityCache.get(Raffle, raffle_id)
+            if not raffle:
+                return None, "Raffle not found"
+
+            max_per_transaction = current_app.config['RAFFLE'].MAX_TICKETS_PER_TRANSACTION
+            if quantity > max_per_transaction:
+                return None, f"Maximum purchase is {max_per_transaction} tickets per transaction"
+
+            # The INSERT branch of the upsert has no WHERE; guard it here
+            limit = PurchaseLimitService._user_limit(user_id, raffle)
+            total = None
+            if quantity <= limit:
+                total = db.session.execute(
+                    PurchaseLimitService._upsert_stats(user_id, raffle_id, quantity, limit)
+                ).scalar()
+
+            if total is None:
+                stats, _ = PurchaseLimitService.get_user_stats(user_id, raffle_id)
+                purchased = stats.tickets_purchased if stats else 0
+                return None, f"Purchase would exceed limit of {limit} tickets per user for this raffle. You currently have {purchased} tickets."
+
+            return total, None
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return None, f"Database error: {str(e)}"
+
     @staticmethod
     def get_user_stats(user_id: int, raffle_id: int) -> Tuple[Optional[UserRaffleStats], Optional[str]]:
         """Get user's stats for a specific raffle"""
@@ -64,22 +131,7 @@ class PurchaseLimitService:
     def update_purchase_count(user_id: int, raffle_id: int, quantity: int) -> Tuple[bool, Optional[str]]:
         """Update the user's purchase count after a successful ticket purchase"""
         try:
-            stats = UserRaffleStats.query.filter_by(
-                user_id=user_id,
-                raffle_id=raffle_id
-            ).first()
-
-            if not stats:
-                stats = UserRaffleStats(
-                    user_id=user_id,
-                    raffle_id=raffle_id,
-                    tickets_purchased=0
-                )
-                db.session.add(stats)
-
-            stats.tickets_purchased += quantity
-            stats.last_purchase_time = datetime.now(timezone.utc)
-            
+            db.session.execute(PurchaseLimitService._upsert_stats(user_id, raffle_id, quantity))
             db.session.commit()
             return True, None
 
@@ -1,13 +1,15 @@
 # src/raffle_service/services/raffle_service.py
+import random
 from typing import Optional, Tuple, List, Dict, Any
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_
 import logging
 from src.shared import db
+from src.shared.entity_cache import EntityCache
 from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus
 from src.raffle_service.models.raffle_status_change import RaffleStatusChange
-from src.raffle_service.services.ticket_service import TicketService
+from src.raffle_service.services.ticket_service import TicketService, sample_ordinals
 from src.raffle_service.models import (
     Raffle, RaffleStatus, 
     Ticket, TicketStatus,
@@ -48,41 +50,35 @@ VALID_STATUS_TRANSITIONS = {
 
 class RaffleService:
     @staticmethod
-    def _generate_tickets(raffle_id: int, total_tickets: int, instant_win_count: int = 0, prize_pool_id: Optional[int] = None) -> bool:
-        """Generate tickets for a raffle with instant win configuration"""
+    def _generate_tickets(raffle_id: int, total_tickets: int, instant_win_count: int = 0, prize_pool_id: Optional[int] = None,
+                          seed: Optional[int] = None) -> bool:
+        """Generate tickets for a raffle with instant win configuration.
+
+        Instant win ordinals are drawn with random.Random(seed) before the
+        insert, so the flags go out with the tickets themselves.
+        """
         try:
+            eligible = set()
+            if instant_win_count > 0 and prize_pool_id:
+                # Verify prize pool
+                pool = PrizePool.query.get(prize_pool_id)
+                if not pool or pool.status != PoolStatus.LOCKED.value:
+                    return False
+
+                eligible.update(sample_ordinals(random.Random(seed), total_tickets, instant_win_count))
+
             tickets = []
             for i in range(total_tickets):
-                ticket_number = str(i + 1).zfill(3)
                 ticket = Ticket(
                     raffle_id=raffle_id,
-                    ticket_id=f"{raffle_id}-{ticket_number}",
-                    ticket_number=ticket_number,
+                    ordinal=i + 1,
                     status=TicketStatus.AVAILABLE.value,
-                    instant_win=False,
-                    instant_win_eligible=False
+                    instant_win=i + 1 in eligible,
+                    instant_win_eligible=i + 1 in eligible
                 )
                 tickets.append(ticket)
             
             db.session.bulk_save_objects(tickets)
-            db.session.flush()
-
-            if instant_win_count > 0 and prize_pool_id:
-                # Verify prize pool
-                pool = PrizePool.query.get(prize_pool_id)
-                if not pool or pool.status != PoolStatus.LOCKED.value:
-                    return False
-                
-                # Select random tickets for instant win eligibility
-                eligible_tickets = Ticket.query.filter_by(
-                    raffle_id=raffle_id,
-                    status=TicketStatus.AVAILABLE.value
-                ).order_by(func.random()).limit(instant_win_count).all()
-
-                for ticket in eligible_tickets:
-                    ticket.instant_win_eligible = True
-                    ticket.instant_win = True
-
             db.session.commit()
             return True
 
@@ -175,7 +171,7 @@ class RaffleService:
     def get_raffle(raffle_id: int) -> Tuple[Optional[Raffle], Optional[str]]:
         """Get a raffle by ID"""
         try:
-            raffle = Raffle.query.get(raffle_id)
+            raffle = EntityCache.get(Raffle, raffle_id)
             if not raffle:
                 return None, "Raffle not found"
             return raffle, None
@@ -1,21 +1,33 @@
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
 from datetime import datetime, timezone, timedelta
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.exc import SQLAlchemyError
 from src.shared import db
+from src.shared.entity_cache import EntityCache
 from src.user_service.models import User
-from src.raffle_service.models import Raffle, Ticket
-from src.raffle_service.models.ticket_reservation import TicketReservation, ReservedTicket
+from src.raffle_service.models import Raffle, Ticket, TicketStatus
+from src.raffle_service.models.ticket_reservation import (
+    TicketReservation, ReservedTicket, ReservationStatus, utcnow
+)
+from src.raffle_service.services.hold_store import ReservationHoldStore
+from src.raffle_service.services.availability_index import AvailabilityIndex
 import logging
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Reservations whose tickets are still held and may lapse; CONFIRMED ones are paid for
+HOLDING_STATUSES = (ReservationStatus.PENDING.value, ReservationStatus.ACTIVE.value)
+HOLD_ATTEMPTS = 3
+RELEASE_CHUNK_SIZE = 500
+
 class ReservationService:
     @staticmethod
     def create_reservation(user_id: int, raffle_id: int, quantity: int) -> Tuple[Optional[Dict], Optional[str]]:
         """Create a ticket reservation"""
         try:
             # 1. Verify raffle exists and is active
-            raffle = Raffle.query.get(raffle_id)
+            raffle = EntityCache.get(Raffle, raffle_id)
             if not raffle:
                 return None, "Raffle not found"
             
@@ -38,55 +50,58 @@ class ReservationService:
             # Generate unique reservation ID
             reservation_id = f"res_{uuid.uuid4().hex[:16]}"
 
-            # 2. Get random available tickets
-            available_tickets = Ticket.query.filter_by(
-                raffle_id=raffle_id,
-                status='available'
-            ).order_by(db.func.random()).limit(quantity).all()
-
-            if len(available_tickets) < quantity:
-                return None, "Not enough tickets available"
-
-            # Create reservation object
-            reservation = TicketReservation(
-                id=reservation_id,
-                user_id=user_id,
-                raffle_id=raffle_id,
-                quantity=quantity,
-                total_amount=quantity * raffle.ticket_price,
-                status='active',
-                expires_at=expiry_time
-            )
-
-            # Get user's available credits
-            user = User.query.get(user_id)
-            site_credit_available = min(user.site_credits, reservation.total_amount)
-            remaining_amount = max(0, reservation.total_amount - site_credit_available)
+            total_amount = quantity * raffle.ticket_price
 
-            # Save everything to database
-            db.session.add(reservation)
-            
-            # Create reserved tickets
-            for ticket in available_tickets:
-                reserved_ticket = ReservedTicket(
-                    reservation_id=reservation.id,
-                    ticket_id=ticket.id,
-                    status='reserved'
+            if ReservationHoldStore.enabled():
+                # 2a. Hold in this worker's memory; nothing is written until payment
+                _, error = ReservationHoldStore.hold(
+                    reservation_id, raffle_id, user_id, quantity, total_amount, expiry_time
+                )
+                if error:
+                    return None, error
+            else:
+                reservation = TicketReservation(
+                    id=reservation_id,
+                    user_id=user_id,
+                    raffle_id=raffle_id,
+                    quantity=quantity,
+                    total_amount=total_amount,
+                    status='active',
+                    expires_at=expiry_time
                 )
-                db.session.add(reserved_ticket)
+                db.session.add(reservation)
+                db.session.flush()
+
+                # 2b. Hold random available tickets
+                held = ReservationService._hold_tickets(raffle_id, reservation_id, quantity, reservation.expires_at)
+                if len(held) < quantity:
+                    db.session.rollback()
+                    return None, "Not enough tickets available"
+
+                db.session.execute(insert(ReservedTicket), [
+                    {'reservation_id': reservation_id, 'ticket_id': ticket_id, 'status': TicketStatus.RESERVED.value}
+                    for ticket_id in held
+                ])
+
+            # Get user's available credits
+            site_credits = db.session.execute(
+                select(User.site_credits).where(User.id == user_id)
+            ).scalar() or 0
+            site_credit_available = min(site_credits, total_amount)
+            remaining_amount = max(0, total_amount - site_credit_available)
 
             db.session.commit()
 
             return {
                 "reservation": {
-                    "id": reservation.id,
+                    "id": reservation_id,
                     "status": "active",
                     "expiry_time": expiry_time.isoformat()
                 },
                 "tickets": {
                     "raffle_id": raffle_id,
                     "quantity": quantity,
-                    "total_amount": float(reservation.total_amount),
+                    "total_amount": float(total_amount),
                     "payment_options": {
                         "site_credit_available": float(site_credit_available),
                         "remaining_amount": float(remaining_amount)
@@ -97,4 +112,98 @@ class ReservationService:
         except Exception as e:
             db.session.rollback()
             logger.error(f"Database error in create_reservation: {str(e)}")
-            return None, str(e)
\ No newline at end of file
+            return None, str(e)
+
+    @staticmethod
+    def _hold_tickets(raffle_id: int, reservation_id: str, quantity: int, expires_at: datetime) -> List[int]:
+        """Move up to `quantity` random available tickets to RESERVED; returns the held ids.
+
+        Each round is one conditional UPDATE ... RETURNING. The status check
+        in its WHERE clause is re-evaluated on the locked rows, so a ticket
+        taken by a concurrent reservation is skipped rather than shared,
+        and the next round tops up what was lost. With the availability
+        index the candidates are sampled ordinals instead of a sorted scan.
+        """
+        def hold(criteria):
+            return db.session.execute(
+                update(Ticket)
+                .where(*criteria, Ticket.status == TicketStatus.AVAILABLE.value)
+                .values(
+                    status=TicketStatus.RESERVED.value,
+                    reservation_id=reservation_id,
+                    reserved_until=expires_at
+                )
+                .returning(Ticket.id, Ticket.ordinal),
+                execution_options={'synchronize_session': False}
+            ).all()
+
+        if AvailabilityIndex.enabled():
+            return [row.id for row in AvailabilityIndex.claim(raffle_id, quantity, hold)]
+
+        held: List[int] = []
+        for _ in range(HOLD_ATTEMPTS):
+            candidates = (
+                select(Ticket.id)
+                .where(Ticket.raffle_id == raffle_id, Ticket.status == TicketStatus.AVAILABLE.value)
+                .order_by(func.random())
+                .limit(quantity - len(held))
+                .with_for_update(skip_locked=True)
+            )
+            held.extend(row.id for row in hold([Ticket.id.in_(candidates)]))
+            if len(held) >= quantity:
+                break
+        return held
+
+    @staticmethod
+    def release_expired(now: datetime = None, chunk_size: int = RELEASE_CHUNK_SIZE) -> Tuple[int, Optional[str]]:
+        """Expire lapsed reservations and return their tickets to AVAILABLE.
+
+        Walks idx_reservation_status_expires oldest first, one committed
+        chunk at a time; returns how many reservations were expired.
+        """
+        now = now or utcnow()
+        released = 0
+        try:
+            while True:
+                ids = db.session.execute(
+                    select(TicketReservation.id)
+                    .where(TicketReservation.status.in_(HOLDING_STATUSES), TicketReservation.is_expired(now))
+                    .order_by(TicketReservation.expires_at)
+                    .limit(chunk_size)
+                ).scalars().all()
+                if not ids:
+                    break
+
+                returned = db.session.execute(
+                    update(Ticket)
+                    .where(Ticket.reservation_id.in_(ids), Ticket.status == TicketStatus.RESERVED.value)
+                    .values(status=TicketStatus.AVAILABLE.value, reservation_id=None, reserved_until=None)
+                    .returning(Ticket.raffle_id, Ticket.ordinal),
+                    execution_options={'synchronize_session': False}
+                ).all()
+                AvailabilityIndex.record(returned, available=True)
+                db.session.execute(
+                    update(ReservedTicket)
+                    .where(ReservedTicket.reservation_id.in_(ids))
+                    .values(status=ReservationStatus.EXPIRED.value),
+                    execution_options={'synchronize_session': False}
+                )
+                db.session.execute(
+                    update(TicketReservation)
+                    .where(TicketReservation.id.in_(ids), TicketReservation.status.in_(HOLDING_STATUSES))
+                    .values(status=ReservationStatus.EXPIRED.value),
+                    execution_options={'synchronize_session': False}
+                )
+                db.session.commit()
+                released += len(ids)
+                if len(ids) < chunk_size:
+                    break
+
+            if released:
+                logger.info(f"Released {released} expired reservations")
+            return released, None
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error releasing expired reservations: {str(e)}")
+            return released, str(e)
@@ -1,14 +1,21 @@
 # src/raffle_service/services/ticket_service.py
 
-from typing import Optional, Tuple, List, Dict, Any
+import random
+from typing import Optional, Tuple, List, Dict, Any, Set
 from datetime import datetime, timezone
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, func, distinct
+from sqlalchemy import and_, func, distinct, select, case, update
 from flask import current_app
 from src.shared import db
+from src.shared.entity_cache import EntityCache
 from src.raffle_service.models import Ticket, TicketStatus, Raffle, RaffleStatus
+from src.raffle_service.models.ticket import parse_ticket_number
 from src.raffle_service.services.purchase_limit_service import PurchaseLimitService
 from src.raffle_service.services.instant_win_service import InstantWinService 
+from src.raffle_service.services.purchase_coalescer import PurchaseCoalescer
+from src.raffle_service.services.availability_index import AvailabilityIndex
+from src.raffle_service.services.hold_store import ReservationHoldStore
+from src.user_service.models.user import User
 import logging
 logger = logging.getLogger(__name__)
 from src.raffle_service.models import (
@@ -17,6 +24,49 @@ from src.raffle_service.models import (
     UserRaffleStats
 )
 
+# Ordinals per UPDATE when flagging instant win eligibility
+ELIGIBILITY_CHUNK_SIZE = 500
+
+def sample_ordinals(rng: random.Random, total: int, count: int, exclude: Set[int] = frozenset()) -> List[int]:
+    """Up to `count` distinct ordinals from 1..total that are not in `exclude`"""
+    remaining = total - len(exclude)
+    count = min(count, remaining)
+    if not exclude:
+        return rng.sample(range(1, total + 1), count)
+    if (len(exclude) + count) * 2 > total:
+        return rng.sample([o for o in range(1, total + 1) if o not in exclude], count)
+
+    picked, seen = [], set(exclude)
+    while len(picked) < count:
+        ordinal = rng.randint(1, total)
+        if ordinal not in seen:
+            seen.add(ordinal)
+            picked.append(ordinal)
+    return picked
+
+# Columns the admin ticket listing can project; 'user' expands to the joined user
+ADMIN_TICKET_FIELDS = {
+    'id': Ticket.id,
+    'ticket_id': Ticket.ticket_id,
+    'ticket_number': Ticket.ticket_number,
+    'ordinal': Ticket.ordinal,
+    'raffle_id': Ticket.raffle_id,
+    'user_id': Ticket.user_id,
+    'purchase_time': Ticket.purchase_time,
+    'status': Ticket.status,
+    'is_revealed': Ticket.is_revealed,
+    'reveal_time': Ticket.reveal_time,
+    'reveal_sequence': Ticket.reveal_sequence,
+    'instant_win': Ticket.instant_win,
+    'instant_win_eligible': Ticket.instant_win_eligible,
+    'transaction_id': Ticket.transaction_id,
+    'created_at': Ticket.created_at,
+}
+ADMIN_TICKET_PAGE_SIZE = 100
+ADMIN_TICKET_MAX_PAGE_SIZE = 500
+USER_RAFFLE_PAGE_SIZE = 20
+USER_RAFFLE_MAX_PAGE_SIZE = 100
+
 class TicketService:
     @staticmethod
     def get_user_tickets(user_id: int, raffle_id: Optional[int] = None) -> Tuple[Optional[List[Ticket]], Optional[str]]:
@@ -31,14 +81,109 @@ class TicketService:
         except SQLAlchemyError as e:
             return None, str(e)
 
+    @staticmethod
+    def get_user_ticket_groups(
+        user_id: int,
+        raffle_id: Optional[int] = None,
+        after_raffle_id: Optional[int] = None,
+        limit: int = USER_RAFFLE_PAGE_SIZE,
+        summary: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """A page of the user's tickets grouped by raffle.
+
+        Two statements regardless of ticket count: a grouped page of raffles
+        with counts, then (unless summary) the tickets for those raffles.
+        """
+        try:
+            limit = max(1, min(limit, USER_RAFFLE_MAX_PAGE_SIZE))
+
+            groups_query = select(
+                Ticket.raffle_id,
+                Raffle.title,
+                Raffle.end_time,
+                func.count(Ticket.id).label('ticket_count'),
+                func.sum(case((Ticket.is_revealed.is_(True), 1), else_=0)).label('revealed_count'),
+                func.sum(case((Ticket.instant_win.is_(True), 1), else_=0)).label('instant_win_count')
+            ).join(Raffle, Raffle.id == Ticket.raffle_id)\
+                .where(Ticket.user_id == user_id)
+            if raffle_id is not None:
+                groups_query = groups_query.where(Ticket.raffle_id == raffle_id)
+            if after_raffle_id is not None:
+                groups_query = groups_query.where(Ticket.raffle_id > after_raffle_id)
+            groups_query = groups_query.group_by(Ticket.raffle_id, Raffle.title, Raffle.end_time)\
+                .order_by(Ticket.raffle_id)\
+                .limit(limit + 1)
+
+            rows = db.session.execute(groups_query).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            groups = {
+                row.raffle_id: {
+                    'raffleId': row.raffle_id,
+                    'raffleTitle': row.title,
+                    'endTime': row.end_time.isoformat() if row.end_time else None,
+                    'ticketCount': row.ticket_count,
+                    'revealedCount': int(row.revealed_count or 0),
+                    'instantWinCount': int(row.instant_win_count or 0)
+                }
+                for row in rows
+            }
+
+            if not summary and groups:
+                tickets = db.session.execute(
+                    select(
+                        Ticket.raffle_id,
+                        Ticket.ticket_id,
+                        Ticket.ticket_number,
+                        Ticket.purchase_time,
+                        Ticket.status,
+                        Ticket.is_revealed,
+                        Ticket.reveal_time,
+                        Ticket.instant_win,
+                        Ticket.transaction_id
+                    ).where(
+                        Ticket.user_id == user_id,
+                        Ticket.raffle_id.in_(list(groups))
+                    ).order_by(Ticket.raffle_id, Ticket.id)
+                ).all()
+
+                for group in groups.values():
+                    group['tickets'] = []
+                for ticket in tickets:
+                    groups[ticket.raffle_id]['tickets'].append({
+                        'id': ticket.ticket_id,
+                        'ticketId': ticket.ticket_id,
+                        'ticketNumber': ticket.ticket_number,
+                        'raffleId': ticket.raffle_id,
+                        'userId': user_id,
+                        'purchaseTime': ticket.purchase_time.isoformat() if ticket.purchase_time else None,
+                        'status': ticket.status,
+                        'isRevealed': ticket.is_revealed,
+                        'revealTime': ticket.reveal_time.isoformat() if ticket.reveal_time else None,
+                        'instantWin': ticket.instant_win,
+                        'transactionId': ticket.transaction_id
+                    })
+
+            return {
+                'raffles': list(groups.values()),
+                'has_more': has_more,
+                'next_cursor': rows[-1].raffle_id if has_more else None
+            }, None
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error grouping tickets for user {user_id}: {str(e)}")
+            return None, str(e)
+
     @staticmethod
     def get_ticket_by_number(raffle_id: int, ticket_number: str) -> Tuple[Optional[Ticket], Optional[str]]:
         """Get specific ticket by its number"""
         try:
+            ordinal = parse_ticket_number(ticket_number)
             ticket = Ticket.query.filter_by(
                 raffle_id=raffle_id,
-                ticket_number=ticket_number
-            ).first()
+                ordinal=ordinal
+            ).first() if ordinal is not None else None
             
             if not ticket:
                 return None, "Ticket not found"
@@ -47,6 +192,90 @@ class TicketService:
         except SQLAlchemyError as e:
             return None, str(e)
 
+    @staticmethod
+    def list_raffle_tickets(
+        raffle_id: int,
+        after_id: Optional[int] = None,
+        limit: int = ADMIN_TICKET_PAGE_SIZE,
+        status: Optional[str] = None,
+        user_id: Optional[int] = None,
+        instant_win: Optional[bool] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """One keyset page of a raffle's tickets for admin views.
+
+        A single projected query joined to users; pages walk (raffle_id, id)
+        so cost depends on the page size, not the raffle size.
+        """
+        try:
+            requested = fields or list(ADMIN_TICKET_FIELDS) + ['paid', 'user']
+            unknown = set(requested) - set(ADMIN_TICKET_FIELDS) - {'paid', 'user'}
+            if unknown:
+                return None, f"Unknown fields: {', '.join(sorted(unknown))}"
+
+            limit = max(1, min(limit, ADMIN_TICKET_MAX_PAGE_SIZE))
+            ticket_fields = [f for f in requested if f in ADMIN_TICKET_FIELDS]
+            if 'id' not in ticket_fields:
+                ticket_fields.insert(0, 'id')  # keyset cursor
+            if 'paid' in requested and 'transaction_id' not in ticket_fields:
+                ticket_fields.append('transaction_id')
+
+            columns = [ADMIN_TICKET_FIELDS[f].label(f) for f in ticket_fields]
+            include_user = 'user' in requested
+            if include_user:
+                columns += [
+                    User.id.label('user__id'),
+                    User.username.label('user__username'),
+                    User.email.label('user__email')
+                ]
+
+            query = select(*columns).select_from(Ticket)
+            if include_user:
+                query = query.outerjoin(User, User.id == Ticket.user_id)
+            query = query.where(Ticket.raffle_id == raffle_id)
+            if after_id is not None:
+                query = query.where(Ticket.id > after_id)
+            if status is not None:
+                query = query.where(Ticket.status == status)
+            if user_id is not None:
+                query = query.where(Ticket.user_id == user_id)
+            if instant_win is not None:
+                query = query.where(Ticket.instant_win == instant_win)
+
+            rows = db.session.execute(query.order_by(Ticket.id).limit(limit + 1)).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            tickets = []
+            for row in rows:
+                values = row._mapping
+                ticket = {}
+                for field in requested:
+                    if field == 'paid':
+                        ticket['paid'] = values['transaction_id'] is not None
+                    elif field == 'user':
+                        ticket['user'] = {
+                            'id': values['user__id'],
+                            'username': values['user__username'],
+                            'email': values['user__email']
+                        } if values['user__id'] is not None else None
+                    else:
+                        value = values[field]
+                        ticket[field] = value.isoformat() if isinstance(value, datetime) else value
+                ticket.setdefault('id', values['id'])
+                tickets.append(ticket)
+
+            return {
+                'tickets': tickets,
+                'limit': limit,
+                'has_more': has_more,
+                'next_cursor': rows[-1].id if has_more else None
+            }, None
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error listing tickets for raffle {raffle_id}: {str(e)}")
+            return None, str(e)
+
     @staticmethod
     def void_ticket(ticket_id: int, admin_id: int, reason: str) -> Tuple[Optional[Ticket], Optional[str]]:
         """Void a ticket (admin only)"""
@@ -87,6 +316,7 @@ class TicketService:
             }, synchronize_session=False)
             
             db.session.commit()
+            AvailabilityIndex.invalidate(raffle_id)
             return result, None  # Returns number of tickets cancelled
             
         except SQLAlchemyError as e:
@@ -96,50 +326,63 @@ class TicketService:
     @staticmethod
     def purchase_tickets(user_id: int, raffle_id: int, quantity: int, transaction_id: int = None) -> Tuple[Optional[List[Ticket]], Optional[str]]:
         """Purchase tickets for a raffle with proper transaction management"""
+        if current_app.config.get('PURCHASE_COALESCING_ENABLED'):
+            return PurchaseCoalescer.purchase(raffle_id, user_id, quantity, transaction_id)
         try:
             # Start an outer transaction
             with db.session.begin_nested():
-                # 1. Check purchase limit first (moved from routes)
-                allowed, error = PurchaseLimitService.check_purchase_limit(
-                    user_id=user_id,
-                    raffle_id=raffle_id,
-                    requested_quantity=quantity
-                )
-                if not allowed:
-                    return None, error
-
-                # 2. Get available tickets with locking
-                available_tickets = Ticket.query.filter_by(
-                    raffle_id=raffle_id,
-                    status=TicketStatus.AVAILABLE.value
-                ).with_for_update().order_by(func.random()).limit(quantity).all()
-
-                if len(available_tickets) < quantity:
+                # 1. Get available tickets with locking; the bitmap index only
+                #    proposes candidates, the UPDATE in step 3 re-checks them.
+                #    Tickets in live in-memory holds are still AVAILABLE in
+                #    the table, so they are excluded here (the bitmap cannot
+                #    tell them apart, hence the fallback to the query)
+                held = ReservationHoldStore.held_ticket_ids(raffle_id)
+                if AvailabilityIndex.enabled() and not held:
+                    available_ids = None
+                    available = len(AvailabilityIndex.sample(raffle_id, quantity))
+                else:
+                    available_ids = db.session.execute(
+                        select(Ticket.id).where(
+                            Ticket.raffle_id == raffle_id,
+                            Ticket.status == TicketStatus.AVAILABLE.value,
+                            Ticket.id.not_in(held)
+                        ).with_for_update().order_by(func.random()).limit(quantity)
+                    ).scalars().all()
+                    available = len(available_ids)
+
+                if available < quantity:
                     return None, "Not enough tickets available"
 
-                # 3. Update tickets
-                purchase_time = datetime.now(timezone.utc)
-                purchased_tickets = []
-
-                for ticket in available_tickets:
-                    ticket.user_id = user_id
-                    ticket.status = TicketStatus.SOLD.value
-                    ticket.purchase_time = purchase_time
-                    ticket.transaction_id = transaction_id
-                    purchased_tickets.append(ticket)
-
-                # 4. Update purchase count only after we know we have the tickets
-                success, error = PurchaseLimitService.update_purchase_count(
+                # 2. Check and increment the purchase count in one statement
+                _, error = PurchaseLimitService.claim_purchase(
                     user_id=user_id,
                     raffle_id=raffle_id,
                     quantity=quantity
                 )
-                
-                if not success:
-                    # This will trigger rollback of the nested transaction
-                    raise SQLAlchemyError(f"Failed to update purchase count: {error}")
+                if error:
+                    return None, error
 
-                # 5. Verify final state
+                # 3. Update tickets in one statement; a shortfall rolls the claim back
+                def sell(criteria):
+                    return Ticket.bulk_set_status(
+                        [*criteria, Ticket.status == TicketStatus.AVAILABLE.value],
+                        TicketStatus.SOLD.value,
+                        user_id=user_id,
+                        purchase_time=datetime.now(timezone.utc),
+                        transaction_id=transaction_id
+                    )
+
+                if available_ids is None:
+                    sold = AvailabilityIndex.claim(raffle_id, quantity, sell)
+                else:
+                    sold = sell([Ticket.id.in_(available_ids)])
+                if len(sold) < quantity:
+                    raise SQLAlchemyError("Not enough tickets available")
+                purchased_tickets = Ticket.query.filter(
+                    Ticket.id.in_([row.id for row in sold])
+                ).populate_existing().all()
+
+                # 4. Verify final state
                 final_count = sum(1 for t in Ticket.query.filter_by(
                     raffle_id=raffle_id,
                     user_id=user_id,
@@ -181,11 +424,11 @@ class TicketService:
         try:
             # Get tickets and verify ownership in one query
             tickets = Ticket.query.filter(
-                Ticket.ticket_id.in_(ticket_ids),
+                Ticket.match_ticket_ids(ticket_ids),
                 Ticket.user_id == user_id,
                 Ticket.status == TicketStatus.SOLD.value,
                 Ticket.is_revealed == False
-            ).order_by(Ticket.ticket_id).with_for_update().all()
+            ).order_by(Ticket.raffle_id, Ticket.ordinal).with_for_update().all()
 
             if not tickets:
                 return None, "No eligible tickets found"
@@ -232,24 +475,58 @@ class TicketService:
             return None, str(e)
 
     @staticmethod
-    def mark_instant_win_eligible(raffle_id: int, count: int) -> Tuple[Optional[List[Ticket]], Optional[str]]:
-        """Mark tickets as instant win eligible during raffle setup"""
+    def mark_instant_win_eligible(raffle_id: int, count: int, seed: Optional[int] = None) -> Tuple[Optional[List[int]], Optional[str]]:
+        """Mark `count` random available tickets instant win eligible; returns their ordinals.
+
+        Ordinals are drawn from 1..total_tickets with random.Random(seed)
+        and flagged by chunked UPDATEs on (raffle_id, ordinal), so the
+        inventory is never read. Draws that hit a sold or already eligible
+        ticket are topped up with fresh ordinals until enough are marked.
+        """
         try:
-            # Get random available tickets
-            eligible_tickets = Ticket.query.filter(
-                Ticket.raffle_id == raffle_id,
-                Ticket.status == TicketStatus.AVAILABLE.value,
-                Ticket.instant_win_eligible == False
-            ).order_by(func.random()).limit(count).all()
-
-            if len(eligible_tickets) < count:
-                return None, f"Not enough available tickets. Found {len(eligible_tickets)}, needed {count}"
+            raffle = EntityCache.get(Raffle, raffle_id)
+            if not raffle:
+                return None, "Raffle not found"
 
-            for ticket in eligible_tickets:
-                ticket.mark_instant_win_eligible()
+            rng = random.Random(seed)
+            marked: List[int] = []
+            drawn = set()
+            while len(marked) < count and len(drawn) < raffle.total_tickets:
+                # Scale each top-up by the miss rate seen so far
+                needed = count - len(marked)
+                size = needed if not drawn else needed * len(drawn) // max(len(marked), 1) + 1
+                ordinals = sample_ordinals(rng, raffle.total_tickets, size, exclude=drawn)
+                drawn.update(ordinals)
+                for start in range(0, len(ordinals), ELIGIBILITY_CHUNK_SIZE):
+                    marked.extend(db.session.execute(
+                        update(Ticket)
+                        .where(
+                            Ticket.raffle_id == raffle_id,
+                            Ticket.ordinal.in_(ordinals[start:start + ELIGIBILITY_CHUNK_SIZE]),
+                            Ticket.status == TicketStatus.AVAILABLE.value,
+                            Ticket.instant_win_eligible == False
+                        )
+                        .values(instant_win_eligible=True)
+                        .returning(Ticket.ordinal),
+                        execution_options={'synchronize_session': False}
+                    ).scalars())
+
+            if len(marked) < count:
+                db.session.rollback()
+                return None, f"Not enough available tickets. Found {len(marked)}, needed {count}"
+
+            # An oversampled top-up can mark more than asked; unmark the surplus
+            extra = marked[count:]
+            if extra:
+                db.session.execute(
+                    update(Ticket)
+                    .where(Ticket.raffle_id == raffle_id, Ticket.ordinal.in_(extra))
+                    .values(instant_win_eligible=False),
+                    execution_options={'synchronize_session': False}
+                )
 
             db.session.commit()
-            return eligible_tickets, None
+            return sorted(marked[:count]), None
 
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -273,7 +550,7 @@ class TicketService:
                 'tickets_available_for_sale': 0
             }
             
-            raffle = Raffle.query.get(raffle_id)
+            raffle = EntityCache.get(Raffle, raffle_id)
             if not raffle:
                 return None, "Raffle not found"
 
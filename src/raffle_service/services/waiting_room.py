@@ -0,0 +1,206 @@
+# src/raffle_service/services/waiting_room.py
+
+import math
+import threading
+import time
+from functools import wraps
+from typing import Optional, Tuple, Dict, Any
+from datetime import timezone
+import jwt
+from flask import current_app, jsonify, request
+from sqlalchemy import select
+from src.shared import db
+from src.raffle_service.models import Raffle, RaffleStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUEUE_TOKEN_HEADER = 'X-Queue-Token'
+
+class _Room:
+    """Admission schedule for one raffle launch in this process.
+
+    GCRA-style: each join is given the earliest admit time that keeps the
+    admitted stream at `rate` per second after an initial `burst`. The time
+    is signed into the queue token, so any worker can check admission
+    without shared state.
+    """
+
+    def __init__(self, rate: float, burst: int, closes_at: float):
+        self.rate = rate
+        self.burst = burst
+        self.closes_at = closes_at
+        self.issued = 0
+        self.tat = 0.0   # theoretical arrival time of the next join
+        self.members: Dict[int, Tuple[int, float]] = {}
+        self.lock = threading.Lock()
+
+    def join(self, user_id: int, now: float) -> Tuple[int, float]:
+        with self.lock:
+            if user_id in self.members:
+                return self.members[user_id]
+            tat = max(self.tat, now)
+            admit_at = max(now, tat - self.burst / self.rate)
+            self.tat = tat + 1.0 / self.rate
+            self.issued += 1
+            self.members[user_id] = (self.issued, admit_at)
+            return self.issued, admit_at
+
+class WaitingRoomService:
+    """Per-raffle admission queue for the launch surge.
+
+    For WAITING_ROOM_LAUNCH_WINDOW seconds after an active raffle's
+    start_time, purchases and reservations require a queue token whose
+    admit time has passed. Joiners are admitted at WAITING_ROOM_ADMIT_RATE
+    per second (per worker process) after a WAITING_ROOM_BURST head start,
+    so the ticket rows see a steady write rate instead of the whole crowd.
+    """
+    WINDOW_CACHE_SECONDS = 30
+
+    _rooms: Dict[int, _Room] = {}
+    _windows: Dict[int, Tuple[Optional[float], float]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _config(key: str):
+        return current_app.config[key]
+
+    @staticmethod
+    def reset() -> None:
+        with WaitingRoomService._lock:
+            WaitingRoomService._rooms.clear()
+            WaitingRoomService._windows.clear()
+
+    @staticmethod
+    def _window_close(raffle_id: int, now: float) -> Optional[float]:
+        """When the raffle's launch window ends, or None if it is not in one"""
+        if not WaitingRoomService._config('WAITING_ROOM_ENABLED'):
+            return None
+
+        cached = WaitingRoomService._windows.get(raffle_id)
+        if cached is None or now - cached[1] > WaitingRoomService.WINDOW_CACHE_SECONDS:
+            row = db.session.execute(
+                select(Raffle.start_time, Raffle.status).where(Raffle.id == raffle_id)
+            ).first()
+            closes_at = None
+            if row and row.status == RaffleStatus.ACTIVE.value:
+                start = row.start_time if row.start_time.tzinfo else row.start_time.replace(tzinfo=timezone.utc)
+                closes_at = start.timestamp() + WaitingRoomService._config('WAITING_ROOM_LAUNCH_WINDOW')
+            cached = (closes_at, now)
+            with WaitingRoomService._lock:
+                WaitingRoomService._windows[raffle_id] = cached
+
+        closes_at = cached[0]
+        return closes_at if closes_at is not None and now < closes_at else None
+
+    @staticmethod
+    def _room(raffle_id: int, closes_at: float, now: float) -> _Room:
+        with WaitingRoomService._lock:
+            # Rooms whose launch window has passed are no longer consulted
+            for stale in [rid for rid, room in WaitingRoomService._rooms.items() if room.closes_at <= now]:
+                del WaitingRoomService._rooms[stale]
+            room = WaitingRoomService._rooms.get(raffle_id)
+            if room is None:
+                room = _Room(
+                    rate=float(WaitingRoomService._config('WAITING_ROOM_ADMIT_RATE')),
+                    burst=int(WaitingRoomService._config('WAITING_ROOM_BURST')),
+                    closes_at=closes_at
+                )
+                WaitingRoomService._rooms[raffle_id] = room
+            return room
+
+    @staticmethod
+    def _status(raffle_id: int, position: int, admit_at: float, now: float, token: Optional[str]) -> Dict[str, Any]:
+        wait = max(0.0, admit_at - now)
+        return {
+            'raffle_id': raffle_id,
+            'queue_token': token,
+            'position': position,
+            'admitted': wait == 0,
+            'retry_after': math.ceil(wait)
+        }
+
+    @staticmethod
+    def join(raffle_id: int, user_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Issue (or re-issue) the user's queue token for a raffle"""
+        now = time.time()
+        closes_at = WaitingRoomService._window_close(raffle_id, now)
+        if closes_at is None:
+            return {'raffle_id': raffle_id, 'queue_token': None, 'position': 0,
+                    'admitted': True, 'retry_after': 0}, None
+
+        position, admit_at = WaitingRoomService._room(raffle_id, closes_at, now).join(user_id, now)
+        # A rejoin after the admission lapsed keeps its place and gets a fresh TTL
+        token = jwt.encode({
+            'typ': 'queue',
+            'raffle_id': raffle_id,
+            'user_id': user_id,
+            'position': position,
+            'admit_at': admit_at,
+            'exp': int(max(admit_at, now) + WaitingRoomService._config('WAITING_ROOM_ADMISSION_TTL'))
+        }, current_app.config['SECRET_KEY'], algorithm='HS256')
+
+        return WaitingRoomService._status(raffle_id, position, admit_at, now, token), None
+
+    @staticmethod
+    def decode(token: str, raffle_id: int, user_id: int) -> Tuple[Optional[Dict], Optional[str]]:
+        try:
+            claims = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+        except jwt.ExpiredSignatureError:
+            return None, "Queue token expired; rejoin the queue"
+        except jwt.InvalidTokenError:
+            return None, "Invalid queue token"
+        if claims.get('typ') != 'queue' or claims.get('raffle_id') != raffle_id or claims.get('user_id') != user_id:
+            return None, "Queue token does not match this raffle"
+        return claims, None
+
+    @staticmethod
+    def status(raffle_id: int, user_id: int, token: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        claims, error = WaitingRoomService.decode(token, raffle_id, user_id)
+        if error:
+            return None, error
+        return WaitingRoomService._status(raffle_id, claims['position'], claims['admit_at'], time.time(), token), None
+
+    @staticmethod
+    def check_admission(raffle_id: int, user_id: int, token: Optional[str]) -> Optional[Tuple[Dict[str, Any], int]]:
+        """None when the caller may proceed, else (error body, HTTP status)"""
+        now = time.time()
+        if WaitingRoomService._window_close(raffle_id, now) is None:
+            return None
+        if not token:
+            return {'error': 'Join the waiting room first', 'queue_required': True}, 403
+
+        claims, error = WaitingRoomService.decode(token, raffle_id, user_id)
+        if error:
+            return {'error': error, 'queue_required': True}, 403
+        if now < claims['admit_at']:
+            body = WaitingRoomService._status(raffle_id, claims['position'], claims['admit_at'], now, token)
+            return {**body, 'error': 'Not admitted yet'}, 429
+        return None
+
+def queue_admission_required(f):
+    """Gate a token_required purchase/reservation view on waiting room admission"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        raffle_id = kwargs.get('raffle_id')
+        if raffle_id is None:
+            raffle_id = (request.get_json(silent=True) or {}).get('raffle_id')
+        if raffle_id is not None:
+            # "5" and 5 name the same raffle; neither may skip the queue
+            try:
+                if isinstance(raffle_id, bool):
+                    raise ValueError
+                raffle_id = int(raffle_id)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Invalid raffle_id'}), 400
+            denied = WaitingRoomService.check_admission(
+                raffle_id, request.current_user.id, request.headers.get(QUEUE_TOKEN_HEADER)
+            )
+            if denied:
+                body, status = denied
+                response = jsonify(body)
+                if status == 429:
+                    response.headers['Retry-After'] = str(max(1, body['retry_after']))
+                return response, status
+        return f(*args, **kwargs)
+    return decorated
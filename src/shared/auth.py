@@ -5,6 +5,8 @@ from flask import request, jsonify, current_app
 import jwt
 from datetime import datetime, timedelta, UTC
 from src.shared import db
+from src.shared.entity_cache import EntityCache
+from src.shared.rate_limit import RateLimiter
 
 def create_token(user_id: int) -> str:
     """Create a JWT token for the user"""
@@ -47,7 +49,10 @@ def get_current_user():
             algorithms=['HS256']
         )
         
-        current_user = db.session.get(User, data['user_id'])
+        # Spend the user's bucket before the lookup so rejections cost no DB work
+        RateLimiter.check_user(data['user_id'])
+
+        current_user = EntityCache.get(User, data['user_id'])
         if not current_user:
             ActivityService.log_activity(
                 user_id=data.get('user_id'),
@@ -83,6 +88,7 @@ def token_required(f):
     """Decorator for protected routes"""
     @wraps(f)
     def decorated(*args, **kwargs):
+        RateLimiter.check_ip()
         current_user, error = get_current_user()
         if error:
             return jsonify({'error': error[0]}), error[1]
@@ -95,6 +101,7 @@ def admin_required(f):
     """Decorator for admin-only routes"""
     @wraps(f)
     def decorated(*args, **kwargs):
+        RateLimiter.check_ip()
         current_user, error = get_current_user()
         if error:
             return jsonify({'error': error[0]}), error[1]
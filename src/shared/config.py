@@ -52,6 +52,81 @@ class Config:
     # Raffle Configuration
     RAFFLE = RaffleConfig()
 
+    # Query profiling (per-request statement counts and N+1 detection)
+    QUERY_PROFILING = False
+    QUERY_PROFILING_REPEAT_THRESHOLD = 10
+    QUERY_PROFILING_STRICT = False
+
+    # Request-scoped memoization of Raffle/PrizePool/Prize/User lookups (EntityCache)
+    ENTITY_CACHE_ENABLED = True
+
+    # Claim deadline scheduler (expiry and auto-claim); one leader per lease row
+    DEADLINE_SCHEDULER_ENABLED = os.getenv('DEADLINE_SCHEDULER_ENABLED', 'false').lower() == 'true'
+    DEADLINE_SCHEDULER_LEADER_LOCK = True
+    DEADLINE_SCHEDULER_LEASE_TTL = 30
+    DEADLINE_SCHEDULER_RELOAD_INTERVAL = 300
+    DEADLINE_SCHEDULER_BATCH_SIZE = 500
+
+    # Process-wide cache of frozen Prize templates and locked pool config (PrizeCatalog)
+    PRIZE_CATALOG_WARM = os.getenv('PRIZE_CATALOG_WARM', 'false').lower() == 'true'   # preload at startup
+    PRIZE_CATALOG_POOL_TTL = 60          # seconds before a LOCKED pool entry is re-read
+
+    # Per-raffle bitmap of available tickets for random picks (AvailabilityIndex)
+    AVAILABILITY_INDEX_ENABLED = os.getenv('AVAILABILITY_INDEX_ENABLED', 'false').lower() == 'true'
+    AVAILABILITY_INDEX_TTL = 300         # seconds before a raffle's bitmap is rebuilt from the DB
+
+    # Password hashing runs on a bounded pool; overflow and repeat failures get 429
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 4))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 16))
+    PASSWORD_HASH_TIMEOUT = 5.0
+    LOGIN_FAILURE_WINDOW = 900
+    LOGIN_FAILURE_LIMIT_USER = 5
+    LOGIN_FAILURE_LIMIT_IP = 20
+
+    # Token buckets for token_required/admin_required routes: (tokens per second, burst)
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')  # memory | redis
+    RATE_LIMIT_REDIS_URL = os.getenv('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+    RATE_LIMIT_DEFAULTS = {'ip': (20, 100), 'user': (10, 50)}
+    RATE_LIMIT_POLICIES = {
+        'tickets.purchase_tickets': {'user': (0.5, 5), 'ip': (2, 20)},
+        'tickets.reveal_tickets': {'user': (2, 10), 'ip': (5, 40)},
+        'raffle.purchase_tickets': {'user': (0.5, 5), 'ip': (2, 20)},
+        'raffle.reveal_tickets': {'user': (2, 10), 'ip': (5, 40)},
+    }
+
+    # Launch waiting room: queue tokens gate purchases/reservations right after start_time.
+    # Opt-in: clients must join /api/raffles/<id>/queue and send X-Queue-Token
+    WAITING_ROOM_ENABLED = os.getenv('WAITING_ROOM_ENABLED', 'false').lower() == 'true'
+    WAITING_ROOM_LAUNCH_WINDOW = 900     # seconds after start_time
+    WAITING_ROOM_ADMIT_RATE = 20         # admissions per second, per worker process
+    WAITING_ROOM_BURST = 50              # admitted immediately when the room opens
+    WAITING_ROOM_ADMISSION_TTL = 600     # seconds an admitted token stays usable
+
+    # Idempotency-Key replay for purchase, reservation and payment confirmation
+    IDEMPOTENCY_TTL = 86400              # seconds a recorded response is replayed
+    IDEMPOTENCY_CACHE_SIZE = 10000       # recent responses kept in process memory
+    IDEMPOTENCY_WAIT_TIMEOUT = 10        # seconds a duplicate waits for the in-flight original
+    IDEMPOTENCY_LOCK_TIMEOUT = 60        # in-flight keys older than this are taken over
+
+    # In-memory reservation holds, written to the DB only when payment starts
+    RESERVATION_HOLD_STORE_ENABLED = os.getenv('RESERVATION_HOLD_STORE_ENABLED', 'false').lower() == 'true'
+    HOLD_STORE_WORKER_INDEX = int(os.getenv('HOLD_STORE_WORKER_INDEX', 0))   # this worker's ticket shard
+    HOLD_STORE_WORKER_COUNT = int(os.getenv('HOLD_STORE_WORKER_COUNT', 1))
+    HOLD_STORE_SNAPSHOT_INTERVAL = 5     # seconds between crash-recovery snapshots
+
+    # Per-raffle purchase coalescing: one writer thread batches concurrent purchases
+    PURCHASE_COALESCING_ENABLED = os.getenv('PURCHASE_COALESCING_ENABLED', 'false').lower() == 'true'
+    PURCHASE_COALESCE_WINDOW_MS = 5       # how long a batch stays open for more requests
+    PURCHASE_COALESCE_MAX_BATCH = 200     # requests served per transaction
+    PURCHASE_COALESCE_TIMEOUT = 10        # seconds a caller waits for its batch
+    PURCHASE_COALESCE_IDLE_TIMEOUT = 30   # seconds before an idle raffle's worker exits
+
+    # Monthly user_activities partitions; older ones are dropped or detached whole
+    ACTIVITY_PARTITIONS_AHEAD = 1
+    ACTIVITY_RETENTION_MONTHS = int(os.getenv('ACTIVITY_RETENTION_MONTHS', 12))
+    ACTIVITY_RETENTION_MODE = os.getenv('ACTIVITY_RETENTION_MODE', 'drop')  # drop | detach
+
     @staticmethod
     def init_app(app):
         # Ensure data directory exists
@@ -60,10 +135,18 @@ class Config:
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    QUERY_PROFILING = True
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    QUERY_PROFILING = True
+    DEADLINE_SCHEDULER_ENABLED = False
+    RATE_LIMIT_ENABLED = False
+    WAITING_ROOM_ENABLED = False
+    PURCHASE_COALESCING_ENABLED = False
+    RESERVATION_HOLD_STORE_ENABLED = False
+    AVAILABILITY_INDEX_ENABLED = False
 
 class ProductionConfig(Config):
     @classmethod
@@ -0,0 +1,117 @@
+# src/shared/entity_cache.py
+
+from typing import Dict, Optional, Tuple, Type, TypeVar
+from flask import Flask, current_app, g, has_request_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from src.shared import db
+from src.shared.query_profiler import QueryProfiler
+
+Model = TypeVar('Model')
+
+_G_KEY = 'entity_cache'
+
+class EntityCache:
+    """Request-scoped identity map for hot, read-mostly rows.
+
+    db.session.get skips SQL only while an object is loaded; every commit
+    expires it, so a purchase that commits between service calls re-selects
+    the same Raffle (and User, PrizePool, Prize) each time it is looked up.
+    Inside a request, get() loads a row once and keeps the column values it
+    saw; later calls hand back the same instance with those values restored
+    instead of refreshing. An entry is dropped as soon as this request
+    flushes a change to it or runs an ORM bulk UPDATE/DELETE on its class,
+    and the whole map goes at request teardown. Outside a request (scripts,
+    worker threads) get() is plain db.session.get. Hits are counted as
+    `entity_cache_hits` on the active query profile.
+    """
+    _listening = False
+
+    @staticmethod
+    def _entries() -> Optional[Dict]:
+        if not has_request_context() or not current_app.config.get('ENTITY_CACHE_ENABLED'):
+            return None
+        return g.setdefault(_G_KEY, {})
+
+    @staticmethod
+    def _key(model: type, identity: Tuple) -> Tuple:
+        return inspect(model).base_mapper.class_, identity
+
+    @staticmethod
+    def get(model: Type[Model], pk) -> Optional[Model]:
+        """db.session.get, memoized for the rest of the request"""
+        entries = EntityCache._entries()
+        if entries is None or pk is None:
+            return db.session.get(model, pk)
+
+        key = EntityCache._key(model, pk if isinstance(pk, tuple) else (pk,))
+        cached = entries.get(key)
+        if cached is not None:
+            instance, snapshot = cached
+            state = inspect(instance)
+            if state.persistent and state.session is db.session() and isinstance(instance, model):
+                for attr in state.expired_attributes & snapshot.keys():
+                    set_committed_value(instance, attr, snapshot[attr])
+                QueryProfiler.increment('entity_cache_hits')
+                return instance
+            del entries[key]
+
+        instance = db.session.get(model, pk)
+        if instance is not None:
+            state = inspect(instance)
+            snapshot = {
+                attr.key: state.dict[attr.key]
+                for attr in state.mapper.column_attrs if attr.key in state.dict
+            }
+            entries[EntityCache._key(model, state.identity)] = (instance, snapshot)
+        return instance
+
+    @staticmethod
+    def discard(instance) -> None:
+        """Forget one object for the rest of the request"""
+        entries = g.get(_G_KEY) if has_request_context() else None
+        state = inspect(instance)
+        if entries and state.identity is not None:
+            entries.pop(EntityCache._key(type(instance), state.identity), None)
+
+    @staticmethod
+    def clear() -> None:
+        if has_request_context():
+            g.pop(_G_KEY, None)
+
+    @staticmethod
+    def _after_flush(session, flush_context) -> None:
+        if not (has_request_context() and g.get(_G_KEY)):
+            return
+        for instance in list(session.dirty) + list(session.deleted):
+            EntityCache.discard(instance)
+
+    @staticmethod
+    def _do_orm_execute(orm_execute_state) -> None:
+        if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        entries = g.get(_G_KEY) if has_request_context() else None
+        mapper = orm_execute_state.bind_mapper
+        if not entries or mapper is None:
+            return
+        for key in [key for key in entries if key[0] is mapper.base_mapper.class_]:
+            del entries[key]
+
+    @staticmethod
+    def install() -> None:
+        """Attach the invalidation listeners to every session (idempotent)"""
+        if EntityCache._listening:
+            return
+        event.listen(Session, 'after_flush', EntityCache._after_flush)
+        event.listen(Session, 'do_orm_execute', EntityCache._do_orm_execute)
+        EntityCache._listening = True
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        app.config.setdefault('ENTITY_CACHE_ENABLED', True)
+        EntityCache.install()
+
+        @app.teardown_request
+        def _clear_entity_cache(exc):
+            g.pop(_G_KEY, None)
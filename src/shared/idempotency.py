@@ -0,0 +1,272 @@
+# src/shared/idempotency.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, NamedTuple, Optional, Union
+from datetime import datetime, timezone, timedelta
+from flask import Flask, Response, current_app, jsonify, make_response, request
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from src.shared import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+# Answers a retry should not be pinned to: gates, throttling and server errors
+RETRYABLE_STATUSES = {403, 408, 409, 425, 429}
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+class IdempotencyRecord(db.Model):
+    """First response to an Idempotency-Key; status_code is NULL while in flight"""
+    __tablename__ = 'idempotency_keys'
+
+    key_hash = db.Column(db.LargeBinary(32), primary_key=True)   # sha256(endpoint, user, key)
+    fingerprint = db.Column(db.LargeBinary(32), nullable=False)  # sha256(method, path, body)
+    status_code = db.Column(db.SmallInteger, nullable=True)
+    response = db.Column(db.LargeBinary, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class StoredResponse(NamedTuple):
+    fingerprint: bytes
+    status_code: int
+    body: bytes
+    expires_at: float
+
+class Idempotency:
+    """Record-and-replay for retried POSTs carrying an Idempotency-Key header.
+
+    The first request with a key claims a row in idempotency_keys, runs, and
+    stores its response; duplicates within IDEMPOTENCY_TTL get that response
+    back without re-running the view. Recent responses sit in a per-process
+    LRU so a retry is one dict lookup. A duplicate that arrives while the
+    first is still running waits for it (an Event in this process, polling
+    the row across processes) instead of executing again.
+    """
+    DEFAULT_TTL = 86400
+    DEFAULT_CACHE_SIZE = 10000
+    DEFAULT_WAIT_TIMEOUT = 10.0
+    DEFAULT_LOCK_TIMEOUT = 60
+    POLL_INTERVAL = 0.05
+
+    _cache: 'OrderedDict[bytes, StoredResponse]' = OrderedDict()
+    _inflight: Dict[bytes, threading.Event] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        app.config.setdefault('IDEMPOTENCY_TTL', Idempotency.DEFAULT_TTL)
+        app.config.setdefault('IDEMPOTENCY_CACHE_SIZE', Idempotency.DEFAULT_CACHE_SIZE)
+        app.config.setdefault('IDEMPOTENCY_WAIT_TIMEOUT', Idempotency.DEFAULT_WAIT_TIMEOUT)
+        app.config.setdefault('IDEMPOTENCY_LOCK_TIMEOUT', Idempotency.DEFAULT_LOCK_TIMEOUT)
+
+    @staticmethod
+    def clear() -> None:
+        with Idempotency._lock:
+            Idempotency._cache.clear()
+
+    @staticmethod
+    def digest(*parts) -> bytes:
+        return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode()).digest()
+
+    @staticmethod
+    def _cached(key_hash: bytes) -> Optional[StoredResponse]:
+        with Idempotency._lock:
+            stored = Idempotency._cache.get(key_hash)
+            if stored is None:
+                return None
+            if stored.expires_at <= time.time():
+                del Idempotency._cache[key_hash]
+                return None
+            Idempotency._cache.move_to_end(key_hash)
+            return stored
+
+    @staticmethod
+    def _remember(key_hash: bytes, stored: StoredResponse) -> None:
+        with Idempotency._lock:
+            Idempotency._cache[key_hash] = stored
+            Idempotency._cache.move_to_end(key_hash)
+            while len(Idempotency._cache) > current_app.config['IDEMPOTENCY_CACHE_SIZE']:
+                Idempotency._cache.popitem(last=False)
+
+    @staticmethod
+    def _replay(stored: StoredResponse, fingerprint: bytes) -> Response:
+        if stored.fingerprint != fingerprint:
+            return make_response(jsonify({
+                'error': f'{IDEMPOTENCY_KEY_HEADER} was already used for a different request'
+            }), 422)
+        response = Response(stored.body, status=stored.status_code, mimetype='application/json')
+        response.headers[REPLAYED_HEADER] = 'true'
+        return response
+
+    @staticmethod
+    def _claim(key_hash: bytes, fingerprint: bytes) -> Union[bool, StoredResponse, None]:
+        """True if we own the key, the stored response if it has one, None if another worker is running it"""
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=current_app.config['IDEMPOTENCY_TTL'])
+        try:
+            db.session.add(IdempotencyRecord(
+                key_hash=key_hash, fingerprint=fingerprint, created_at=now, expires_at=expires_at
+            ))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+
+        try:
+            row = db.session.execute(
+                select(IdempotencyRecord.fingerprint, IdempotencyRecord.status_code,
+                       IdempotencyRecord.response, IdempotencyRecord.created_at,
+                       IdempotencyRecord.expires_at)
+                .where(IdempotencyRecord.key_hash == key_hash)
+            ).first()
+            if row is None:
+                return None
+
+            abandoned = (
+                row.status_code is None and
+                _as_utc(row.created_at) < now - timedelta(seconds=current_app.config['IDEMPOTENCY_LOCK_TIMEOUT'])
+            )
+            if _as_utc(row.expires_at) <= now or abandoned:
+                # Same conditional-UPDATE takeover as LeaderLease: one racer wins
+                result = db.session.execute(
+                    update(IdempotencyRecord)
+                    .where(IdempotencyRecord.key_hash == key_hash,
+                           IdempotencyRecord.created_at == row.created_at)
+                    .values(fingerprint=fingerprint, status_code=None, response=None,
+                            created_at=now, expires_at=expires_at),
+                    execution_options={'synchronize_session': False}
+                )
+                db.session.commit()
+                return True if result.rowcount else None
+
+            if row.status_code is None:
+                return None
+            return StoredResponse(row.fingerprint, row.status_code, row.response,
+                                  _as_utc(row.expires_at).timestamp())
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error reading idempotency key: {str(e)}")
+            return None
+
+    @staticmethod
+    def begin(key_hash: bytes, fingerprint: bytes) -> Optional[Response]:
+        """None when the caller now owns the key and must run; else the response to send"""
+        deadline = time.monotonic() + current_app.config['IDEMPOTENCY_WAIT_TIMEOUT']
+        while True:
+            stored = Idempotency._cached(key_hash)
+            if stored is not None:
+                return Idempotency._replay(stored, fingerprint)
+
+            with Idempotency._lock:
+                event = Idempotency._inflight.get(key_hash)
+                owner = event is None
+                if owner:
+                    Idempotency._inflight[key_hash] = threading.Event()
+
+            remaining = deadline - time.monotonic()
+            if not owner:
+                if remaining <= 0 or not event.wait(remaining):
+                    break
+                continue
+
+            claimed = Idempotency._claim(key_hash, fingerprint)
+            if claimed is True:
+                return None
+            Idempotency._settle(key_hash)
+            if claimed is not None:
+                Idempotency._remember(key_hash, claimed)
+                return Idempotency._replay(claimed, fingerprint)
+            # Running in another process; poll its row until it finishes
+            if remaining <= 0:
+                break
+            time.sleep(min(Idempotency.POLL_INTERVAL, remaining))
+
+        response = make_response(jsonify({
+            'error': f'A request with this {IDEMPOTENCY_KEY_HEADER} is still in progress'
+        }), 409)
+        response.headers['Retry-After'] = '1'
+        return response
+
+    @staticmethod
+    def _settle(key_hash: bytes) -> None:
+        with Idempotency._lock:
+            event = Idempotency._inflight.pop(key_hash, None)
+        if event is not None:
+            event.set()
+
+    @staticmethod
+    def finish(key_hash: bytes, fingerprint: bytes, response: Optional[Response]) -> None:
+        """Store the owner's response, or release the key so a retry runs again"""
+        try:
+            if response is None or response.status_code >= 500 or response.status_code in RETRYABLE_STATUSES:
+                db.session.rollback()
+                db.session.execute(delete(IdempotencyRecord).where(IdempotencyRecord.key_hash == key_hash))
+                db.session.commit()
+                return
+
+            body = response.get_data()
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=current_app.config['IDEMPOTENCY_TTL'])
+            db.session.execute(
+                update(IdempotencyRecord)
+                .where(IdempotencyRecord.key_hash == key_hash)
+                .values(status_code=response.status_code, response=body, expires_at=expires_at),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.commit()
+            Idempotency._remember(key_hash, StoredResponse(
+                fingerprint, response.status_code, body, expires_at.timestamp()
+            ))
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error recording idempotent response: {str(e)}")
+        finally:
+            Idempotency._settle(key_hash)
+
+    @staticmethod
+    def purge_expired() -> int:
+        """Delete lapsed keys; returns how many rows went"""
+        try:
+            result = db.session.execute(
+                delete(IdempotencyRecord).where(IdempotencyRecord.expires_at <= datetime.now(timezone.utc))
+            )
+            db.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error purging idempotency keys: {str(e)}")
+            return 0
+
+def idempotent(f):
+    """Replay the first response for a repeated Idempotency-Key (after token_required)"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if not key:
+            return f(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'{IDEMPOTENCY_KEY_HEADER} must be at most {MAX_KEY_LENGTH} characters'}), 400
+
+        key_hash = Idempotency.digest(request.endpoint, request.current_user.id, key)
+        fingerprint = Idempotency.digest(request.method, request.path, request.get_data(as_text=True))
+        early = Idempotency.begin(key_hash, fingerprint)
+        if early is not None:
+            return early
+
+        response = None
+        try:
+            response = make_response(f(*args, **kwargs))
+            return response
+        finally:
+            Idempotency.finish(key_hash, fingerprint, response)
+    return decorated
@@ -0,0 +1,74 @@
+# src/shared/leader_lease.py
+
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import update, or_
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from src.shared import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LeaderLease(db.Model):
+    """Lock row naming the worker that currently runs a singleton job"""
+    __tablename__ = 'leader_leases'
+
+    name = db.Column(db.String(64), primary_key=True)
+    holder = db.Column(db.String(128), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    acquired_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    @staticmethod
+    def acquire(name: str, holder: str, ttl_seconds: int) -> bool:
+        """Take or renew the lease; True if `holder` is leader until the new expiry.
+
+        A single conditional UPDATE claims the row when it is ours or has
+        lapsed, so two workers racing for a lapsed lease cannot both win.
+        """
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        try:
+            result = db.session.execute(
+                update(LeaderLease)
+                .where(
+                    LeaderLease.name == name,
+                    or_(LeaderLease.holder == holder, LeaderLease.expires_at < now)
+                )
+                .values(holder=holder, expires_at=expires_at),
+                execution_options={'synchronize_session': False}
+            )
+            if result.rowcount:
+                db.session.commit()
+                return True
+
+            if db.session.get(LeaderLease, name) is not None:
+                db.session.rollback()
+                return False
+
+            db.session.add(LeaderLease(name=name, holder=holder, expires_at=expires_at))
+            db.session.commit()
+            logger.info(f"{holder} acquired lease {name}")
+            return True
+
+        except IntegrityError:
+            # Another worker inserted the row first
+            db.session.rollback()
+            return False
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error acquiring lease {name}: {str(e)}")
+            return False
+
+    @staticmethod
+    def release(name: str, holder: str) -> None:
+        """Give up the lease if `holder` still owns it"""
+        try:
+            db.session.execute(
+                update(LeaderLease)
+                .where(LeaderLease.name == name, LeaderLease.holder == holder)
+                .values(expires_at=datetime.now(timezone.utc)),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error releasing lease {name}: {str(e)}")
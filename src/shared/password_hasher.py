@@ -0,0 +1,190 @@
+# src/shared/password_hasher.py
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional, Tuple
+from flask import Flask, jsonify
+from werkzeug.security import generate_password_hash, check_password_hash
+import logging
+
+logger = logging.getLogger(__name__)
+
+class HashingUnavailable(Exception):
+    """Password work refused; answered with 429 and Retry-After"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+
+class PasswordHasher:
+    """Bounded executor for password hashing and verification.
+
+    At most `workers` hashes run at once and at most `queue_size` more wait
+    for a thread. Anything beyond that is refused immediately with
+    HashingUnavailable. A burst of logins then costs a 429 instead of
+    pinning every request worker behind a backlog of ~100 ms hashes.
+    """
+    DEFAULT_WORKERS = 4
+    DEFAULT_QUEUE_SIZE = 16
+    DEFAULT_TIMEOUT = 5.0
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _slots: Optional[threading.BoundedSemaphore] = None
+    _timeout = DEFAULT_TIMEOUT
+    _lock = threading.Lock()
+
+    @staticmethod
+    def configure(
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        timeout: float = DEFAULT_TIMEOUT
+    ) -> None:
+        with PasswordHasher._lock:
+            previous = PasswordHasher._executor
+            PasswordHasher._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='password-hash'
+            )
+            PasswordHasher._slots = threading.BoundedSemaphore(workers + queue_size)
+            PasswordHasher._timeout = timeout
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+    @staticmethod
+    def _run(fn: Callable, *args):
+        if PasswordHasher._executor is None:
+            PasswordHasher.configure()
+        executor, slots = PasswordHasher._executor, PasswordHasher._slots
+
+        if not slots.acquire(blocking=False):
+            logger.warning("Password hashing saturated; refusing request")
+            raise HashingUnavailable("Server busy, please retry shortly")
+        try:
+            future = executor.submit(fn, *args)
+        except RuntimeError:
+            slots.release()
+            raise
+        # The slot frees when the hash finishes, even if the caller gave up
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=PasswordHasher._timeout)
+        except FutureTimeout:
+            raise HashingUnavailable("Password check timed out, please retry")
+
+    @staticmethod
+    def hash(password: str) -> str:
+        return PasswordHasher._run(generate_password_hash, password)
+
+    @staticmethod
+    def verify(password_hash: str, password: str) -> bool:
+        return PasswordHasher._run(check_password_hash, password_hash, password)
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        app.config.setdefault('PASSWORD_HASH_WORKERS', PasswordHasher.DEFAULT_WORKERS)
+        app.config.setdefault('PASSWORD_HASH_QUEUE_SIZE', PasswordHasher.DEFAULT_QUEUE_SIZE)
+        app.config.setdefault('PASSWORD_HASH_TIMEOUT', PasswordHasher.DEFAULT_TIMEOUT)
+        app.config.setdefault('LOGIN_FAILURE_WINDOW', FailedLoginCache.DEFAULT_WINDOW)
+        app.config.setdefault('LOGIN_FAILURE_LIMIT_USER', FailedLoginCache.DEFAULT_LIMITS['user'])
+        app.config.setdefault('LOGIN_FAILURE_LIMIT_IP', FailedLoginCache.DEFAULT_LIMITS['ip'])
+
+        PasswordHasher.configure(
+            workers=app.config['PASSWORD_HASH_WORKERS'],
+            queue_size=app.config['PASSWORD_HASH_QUEUE_SIZE'],
+            timeout=app.config['PASSWORD_HASH_TIMEOUT']
+        )
+        FailedLoginCache.configure(
+            window=app.config['LOGIN_FAILURE_WINDOW'],
+            user_limit=app.config['LOGIN_FAILURE_LIMIT_USER'],
+            ip_limit=app.config['LOGIN_FAILURE_LIMIT_IP']
+        )
+
+        @app.errorhandler(HashingUnavailable)
+        def hashing_unavailable(error: HashingUnavailable):
+            response = jsonify({'error': error.message})
+            response.headers['Retry-After'] = str(error.retry_after)
+            return response, 429
+
+class FailedLoginCache:
+    """Recent failed logins per username and per client IP, in process memory.
+
+    Once a key reaches its limit inside the window, further attempts are
+    refused before the user lookup or any hash work, until the window that
+    started with the first failure lapses.
+    """
+    DEFAULT_WINDOW = 900
+    DEFAULT_LIMITS = {'user': 5, 'ip': 20}
+    MAX_KEYS = 10000
+
+    _window = DEFAULT_WINDOW
+    _limits = dict(DEFAULT_LIMITS)
+    # (kind, value) -> (failures, first failure at)
+    _entries: 'OrderedDict[Tuple[str, str], Tuple[int, float]]' = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def configure(window: int = DEFAULT_WINDOW, user_limit: int = 5, ip_limit: int = 20) -> None:
+        with FailedLoginCache._lock:
+            FailedLoginCache._window = window
+            FailedLoginCache._limits = {'user': user_limit, 'ip': ip_limit}
+            FailedLoginCache._entries.clear()
+
+    @staticmethod
+    def clear() -> None:
+        with FailedLoginCache._lock:
+            FailedLoginCache._entries.clear()
+
+    @staticmethod
+    def _keys(username: Optional[str], ip: Optional[str]):
+        if username:
+            yield ('user', username)
+        if ip:
+            yield ('ip', ip)
+
+    @staticmethod
+    def check(username: Optional[str], ip: Optional[str] = None) -> None:
+        """Raise HashingUnavailable if either key is over its failure limit"""
+        now = time.monotonic()
+        with FailedLoginCache._lock:
+            for key in FailedLoginCache._keys(username, ip):
+                entry = FailedLoginCache._entries.get(key)
+                if entry is None:
+                    continue
+                failures, first_at = entry
+                remaining = FailedLoginCache._window - (now - first_at)
+                if remaining <= 0:
+                    del FailedLoginCache._entries[key]
+                elif failures >= FailedLoginCache._limits[key[0]]:
+                    raise HashingUnavailable(
+                        "Too many failed login attempts, try again later",
+                        retry_after=math.ceil(remaining)
+                    )
+
+    @staticmethod
+    def record_failure(username: Optional[str], ip: Optional[str] = None) -> None:
+        now = time.monotonic()
+        with FailedLoginCache._lock:
+            entries = FailedLoginCache._entries
+            for key in FailedLoginCache._keys(username, ip):
+                failures, first_at = entries.get(key, (0, now))
+                if now - first_at >= FailedLoginCache._window:
+                    failures, first_at = 0, now
+                entries[key] = (failures + 1, first_at)
+                entries.move_to_end(key)
+            while len(entries) > FailedLoginCache.MAX_KEYS:
+                entries.popitem(last=False)
+
+    @staticmethod
+    def reset(username: str) -> None:
+        """Forget a username's failures after a successful login"""
+        with FailedLoginCache._lock:
+            FailedLoginCache._entries.pop(('user', username), None)
+
+    @staticmethod
+    def snapshot() -> Dict[Tuple[str, str], int]:
+        with FailedLoginCache._lock:
+            return {key: failures for key, (failures, _) in FailedLoginCache._entries.items()}
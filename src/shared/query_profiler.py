@@ -0,0 +1,183 @@
+# src/shared/query_profiler.py
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+from flask import Flask, Response, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Stack of active QueryStats for the current execution context. A request
+# profiled inside a test budget records into both.
+_active_stats: ContextVar[Tuple['QueryStats', ...]] = ContextVar('query_profiler_stats', default=())
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_NAMED_PARAM = re.compile(r"%\(\w+\)s|:\w+|\$\d+|%s")
+_POSTCOMPILE = re.compile(r"\(?__\[POSTCOMPILE_\w+\]\)?")
+_WHITESPACE = re.compile(r"\s+")
+
+class NPlusOneError(AssertionError):
+    """Raised in strict mode when one statement shape repeats past the threshold"""
+
+def fingerprint(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeated lookups group together"""
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _NAMED_PARAM.sub('?', shape)
+    shape = _POSTCOMPILE.sub('(?)', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+class QueryStats:
+    """Statement counts, DB time and repeated shapes for one profiled scope"""
+
+    def __init__(self, repeat_threshold: int = 10):
+        self.repeat_threshold = repeat_threshold
+        self.statement_count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+        self.counters: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statement_count += 1
+        self.total_time += duration
+        self.shapes[fingerprint(statement)] += 1
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Track a named non-SQL counter (cache hits and the like)"""
+        self.counters[name] += amount
+
+    def repeated_shapes(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times, most frequent first"""
+        limit = self.repeat_threshold if threshold is None else threshold
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > limit]
+
+    @property
+    def max_repeats(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+    def to_headers(self) -> Dict[str, str]:
+        headers = {
+            'X-Query-Count': str(self.statement_count),
+            'X-Query-Time-Ms': f"{self.total_time * 1000:.2f}",
+            'X-Query-Max-Repeats': str(self.max_repeats)
+        }
+        for name, value in sorted(self.counters.items()):
+            header_name = '-'.join(part.capitalize() for part in name.split('_'))
+            headers[f"X-{header_name}"] = str(value)
+        return headers
+
+    def to_dict(self) -> Dict:
+        return {
+            'statement_count': self.statement_count,
+            'total_time_ms': round(self.total_time * 1000, 2),
+            'repeated_shapes': [
+                {'statement': shape, 'count': count}
+                for shape, count in self.repeated_shapes()
+            ],
+            'counters': dict(self.counters)
+        }
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_stats.get():
+        conn.info.setdefault('query_profiler_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    active = _active_stats.get()
+    if not active:
+        return
+    starts = conn.info.get('query_profiler_start')
+    duration = time.perf_counter() - starts.pop() if starts else 0.0
+    for stats in active:
+        stats.record(statement, duration)
+
+class QueryProfiler:
+    """Hooks SQLAlchemy cursor events to account for every statement per request"""
+    _listening = False
+
+    @staticmethod
+    def install() -> None:
+        """Attach the cursor listeners to every engine (idempotent)"""
+        if QueryProfiler._listening:
+            return
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        QueryProfiler._listening = True
+
+    @staticmethod
+    def current() -> Optional[QueryStats]:
+        """Innermost active profile, if any"""
+        active = _active_stats.get()
+        return active[-1] if active else None
+
+    @staticmethod
+    def increment(name: str, amount: int = 1) -> None:
+        """Bump a named counter on every active profile"""
+        for stats in _active_stats.get():
+            stats.increment(name, amount)
+
+    @staticmethod
+    @contextmanager
+    def profile(repeat_threshold: int = 10) -> Iterator[QueryStats]:
+        """Profile every statement executed inside the block"""
+        QueryProfiler.install()
+        stats = QueryStats(repeat_threshold=repeat_threshold)
+        token = _active_stats.set(_active_stats.get() + (stats,))
+        try:
+            yield stats
+        finally:
+            _active_stats.reset(token)
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        """Profile each request when QUERY_PROFILING is enabled"""
+        app.config.setdefault('QUERY_PROFILING', False)
+        app.config.setdefault('QUERY_PROFILING_REPEAT_THRESHOLD', 10)
+        app.config.setdefault('QUERY_PROFILING_STRICT', False)
+
+        if not app.config['QUERY_PROFILING']:
+            return
+
+        QueryProfiler.install()
+
+        @app.before_request
+        def _start_query_profile():
+            stats = QueryStats(repeat_threshold=current_app.config['QUERY_PROFILING_REPEAT_THRESHOLD'])
+            g.query_stats = stats
+            g.query_stats_token = _active_stats.set(_active_stats.get() + (stats,))
+
+        @app.after_request
+        def _report_query_profile(response: Response) -> Response:
+            stats = g.get('query_stats')
+            if stats is None:
+                return response
+
+            response.headers.update(stats.to_headers())
+
+            repeated = stats.repeated_shapes()
+            if repeated:
+                for shape, count in repeated:
+                    logger.warning(
+                        "Possible N+1 on %s %s: %d executions of %s",
+                        request.method, request.path, count, shape
+                    )
+                if current_app.config['QUERY_PROFILING_STRICT']:
+                    raise NPlusOneError(
+                        f"{request.method} {request.path} repeated {repeated[0][1]} "
+                        f"times: {repeated[0][0]}"
+                    )
+            return response
+
+        @app.teardown_request
+        def _end_query_profile(exc):
+            token = g.pop('query_stats_token', None)
+            if token is not None:
+                _active_stats.reset(token)
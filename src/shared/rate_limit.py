@@ -0,0 +1,193 @@
+# src/shared/rate_limit.py
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from flask import Flask, current_app, jsonify, request
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RateLimitExceeded(Exception):
+    """Raised before any DB work when a caller's bucket is empty; answered with 429"""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+@dataclass(frozen=True)
+class RatePolicy:
+    rate: float   # tokens refilled per second
+    burst: int    # bucket capacity
+
+    @classmethod
+    def parse(cls, value) -> 'RatePolicy':
+        if isinstance(value, RatePolicy):
+            return value
+        if isinstance(value, dict):
+            return cls(float(value['rate']), int(value['burst']))
+        rate, burst = value
+        return cls(float(rate), int(burst))
+
+def _refill(tokens: float, updated_at: float, now: float, policy: RatePolicy) -> float:
+    return min(float(policy.burst), tokens + max(0.0, now - updated_at) * policy.rate)
+
+class MemoryBucketBackend:
+    """Per-process token buckets, sharded so unrelated keys don't share a lock.
+
+    Each shard keeps at most MAX_KEYS_PER_SHARD buckets in LRU order and drops
+    the least recently used one when full; an evicted caller starts again
+    from a full bucket.
+    """
+    SHARDS = 16
+    MAX_KEYS_PER_SHARD = 4096
+
+    def __init__(self, shards: int = SHARDS, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._shards: List[Tuple[threading.Lock, 'OrderedDict[str, Tuple[float, float]]']] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+
+    def take(self, key: str, policy: RatePolicy, cost: int = 1) -> Tuple[bool, float]:
+        """Spend `cost` tokens; returns (allowed, seconds until enough tokens)"""
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            now = self.clock()
+            tokens, updated_at = buckets.get(key, (float(policy.burst), now))
+            tokens = _refill(tokens, updated_at, now, policy)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            buckets[key] = (tokens, now)
+            buckets.move_to_end(key)
+            if len(buckets) > self.MAX_KEYS_PER_SHARD:
+                buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / policy.rate
+
+# KEYS[1] bucket; ARGV rate, burst, cost. Uses the Redis clock so workers agree.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+class SharedBucketBackend:
+    """Token buckets in Redis, shared by every worker; one atomic script call per check"""
+
+    def __init__(self, client):
+        self.client = client
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> 'SharedBucketBackend':
+        import redis  # optional; only needed when RATE_LIMIT_BACKEND = 'redis'
+        return cls(redis.Redis.from_url(url))
+
+    def take(self, key: str, policy: RatePolicy, cost: int = 1) -> Tuple[bool, float]:
+        allowed, wait = self._take(keys=[key], args=[policy.rate, policy.burst, cost])
+        return bool(int(allowed)), float(wait)
+
+class RateLimiter:
+    """Per-user and per-IP token buckets for token_required/admin_required routes.
+
+    The IP bucket is checked before the JWT is decoded and the user bucket
+    right after, so a rejected request never touches the database.
+    Endpoints listed in RATE_LIMIT_POLICIES get their own buckets; every
+    other endpoint shares the default buckets.
+    """
+    SCOPES = ('ip', 'user')
+    DEFAULT_POLICIES = {'ip': RatePolicy(20, 100), 'user': RatePolicy(10, 50)}
+
+    @staticmethod
+    def _settings() -> Optional[Dict]:
+        return current_app.extensions.get('rate_limiter')
+
+    @staticmethod
+    def configure(app: Flask, backend=None, policies: Optional[Dict] = None,
+                  defaults: Optional[Dict] = None, enabled: bool = True) -> None:
+        """Replace the app's limiter state (backend, per-endpoint policies)"""
+        app.extensions['rate_limiter'] = {
+            'enabled': enabled,
+            'backend': backend or MemoryBucketBackend(),
+            'defaults': {
+                scope: RatePolicy.parse(policy)
+                for scope, policy in {**RateLimiter.DEFAULT_POLICIES, **(defaults or {})}.items()
+            },
+            'policies': {
+                endpoint: {scope: RatePolicy.parse(policy) for scope, policy in scopes.items()}
+                for endpoint, scopes in (policies or {}).items()
+            }
+        }
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        app.config.setdefault('RATE_LIMIT_ENABLED', True)
+        app.config.setdefault('RATE_LIMIT_BACKEND', 'memory')
+        app.config.setdefault('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+        app.config.setdefault('RATE_LIMIT_DEFAULTS', {})
+        app.config.setdefault('RATE_LIMIT_POLICIES', {})
+
+        backend = None
+        if app.config['RATE_LIMIT_ENABLED'] and app.config['RATE_LIMIT_BACKEND'] == 'redis':
+            backend = SharedBucketBackend.from_url(app.config['RATE_LIMIT_REDIS_URL'])
+
+        RateLimiter.configure(
+            app,
+            backend=backend,
+            policies=app.config['RATE_LIMIT_POLICIES'],
+            defaults=app.config['RATE_LIMIT_DEFAULTS'],
+            enabled=app.config['RATE_LIMIT_ENABLED']
+        )
+
+        @app.errorhandler(RateLimitExceeded)
+        def rate_limited(error: RateLimitExceeded):
+            response = jsonify({'error': 'Too many requests, slow down', 'scope': error.scope})
+            response.headers['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+            return response, 429
+
+    @staticmethod
+    def check(scope: str, identity, endpoint: Optional[str] = None) -> None:
+        """Spend one token from `identity`'s bucket or raise RateLimitExceeded"""
+        settings = RateLimiter._settings()
+        if not settings or not settings['enabled'] or identity is None:
+            return
+
+        endpoint = endpoint or request.endpoint
+        endpoint_policies = settings['policies'].get(endpoint, {})
+        policy = endpoint_policies.get(scope)
+        bucket = endpoint if policy else 'default'
+        policy = policy or settings['defaults'][scope]
+
+        allowed, retry_after = settings['backend'].take(f"rl:{scope}:{bucket}:{identity}", policy)
+        if not allowed:
+            logger.info(f"Rate limited {scope} {identity} on {bucket}")
+            raise RateLimitExceeded(scope, retry_after)
+
+    @staticmethod
+    def check_ip() -> None:
+        RateLimiter.check('ip', request.remote_addr)
+
+    @staticmethod
+    def check_user(user_id: int) -> None:
+        RateLimiter.check('user', user_id)
@@ -4,6 +4,7 @@ from .user import User
 from .user_status import UserStatusChange
 from .credit_transaction import CreditTransaction
 from .user_activity import UserActivity
+from .activity_partition import ActivityPartition, PartitionStatus
 from .user_tier import UserTier, UserTierHistory, TierLevel  # Add new models
 
 __all__ = [
@@ -11,6 +12,8 @@ __all__ = [
     'UserStatusChange', 
     'CreditTransaction', 
     'UserActivity',
+    'ActivityPartition',
+    'PartitionStatus',
     'UserTier',
     'UserTierHistory',
     'TierLevel'
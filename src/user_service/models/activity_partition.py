@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from enum import Enum
+from src.shared import db
+
+class PartitionStatus(str, Enum):
+    ATTACHED = 'attached'   # queried by ActivityService
+    DETACHED = 'detached'   # kept for archiving, no longer queried
+
+class ActivityPartition(db.Model):
+    """Registry of monthly user_activities partitions.
+
+    On PostgreSQL each row is a native partition of user_activities. On
+    SQLite each row is a rotated-out table holding [range_start, range_end);
+    the live user_activities table holds everything from the newest
+    range_end onward.
+    """
+    __tablename__ = 'activity_partitions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(64), nullable=False, unique=True)
+    range_start = db.Column(db.DateTime, nullable=False)
+    range_end = db.Column(db.DateTime, nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default=PartitionStatus.ATTACHED.value)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    detached_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'range_start': self.range_start.isoformat(),
+            'range_end': self.range_end.isoformat(),
+            'status': self.status,
+            'detached_at': self.detached_at.isoformat() if self.detached_at else None
+        }
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone, timedelta
 from src.shared import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.shared.password_hasher import PasswordHasher
 from sqlalchemy.ext.hybrid import hybrid_property
 from typing import Dict
 
@@ -37,13 +37,13 @@ class User(db.Model):
     def set_password(self, password):
         """Set password hash - only for local auth"""
         if self.requires_password and password:
-            self.password_hash = generate_password_hash(password)
+            self.password_hash = PasswordHasher.hash(password)
     
     def check_password(self, password):
         """Check password - only for local auth"""
         if not self.requires_password:
             return False
-        return self.password_hash and check_password_hash(self.password_hash, password)
+        return self.password_hash and PasswordHasher.verify(self.password_hash, password)
 
     @property
     def tier_benefits(self) -> Dict:
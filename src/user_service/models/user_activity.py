@@ -4,6 +4,14 @@ from src.shared import db
 class UserActivity(db.Model):
     """Track user activities and system interactions"""
     __tablename__ = 'user_activities'
+    __table_args__ = (
+        # Keyset pagination: per-user history, admin filters, unfiltered admin feed
+        db.Index('idx_activity_user_created', 'user_id', 'created_at'),
+        db.Index('idx_activity_type_status_created', 'activity_type', 'status', 'created_at'),
+        db.Index('idx_activity_created', 'created_at'),
+        # Rotated SQLite partitions copy ids; AUTOINCREMENT keeps them unique
+        {'sqlite_autoincrement': True}
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -4,6 +4,7 @@ from flask import Blueprint, request, jsonify
 from src.shared.auth import token_required
 from src.user_service.models.user import User
 from src.user_service.services.admin_auth_service import AdminAuthService
+from src.shared.password_hasher import HashingUnavailable
 
 admin_auth_bp = Blueprint('admin_auth', __name__, url_prefix='/api/admin')
 
@@ -32,6 +33,8 @@ def admin_login():
 
         return jsonify(result), 200
 
+    except HashingUnavailable:
+        raise  # 429 from the app error handler
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -4,6 +4,7 @@ from flask import Blueprint, request, jsonify
 from src.shared.auth import token_required
 from src.user_service.models.user import User
 from src.user_service.services.password_service import PasswordService
+from src.shared.password_hasher import HashingUnavailable
 from src.user_service.schemas.password_schema import (
     PasswordResetRequestSchema,
     PasswordResetSchema,
@@ -69,6 +70,8 @@ def reset_password():
             
         return jsonify({'message': 'Password reset successful'}), 200
         
+    except HashingUnavailable:
+        raise  # 429 from the app error handler
     except Exception as e:
         logger.error(f"Error in password reset: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -92,6 +95,8 @@ def change_password():
             
         return jsonify({'message': 'Password changed successfully'}), 200
         
+    except HashingUnavailable:
+        raise  # 429 from the app error handler
     except Exception as e:
         logger.error(f"Error in password change: {str(e)}")
         return jsonify({'error': 'Failed to change password'}), 500
\ No newline at end of file
@@ -8,7 +8,7 @@ from src.user_service.schemas.user_schema import (
 from src.user_service.services.user_service import UserService
 from marshmallow import ValidationError
 from src.shared.auth import token_required, create_token, admin_required
-from src.user_service.services.activity_service import ActivityService
+from src.user_service.services.activity_service import ActivityService, ACTIVITY_PAGE_SIZE
 from datetime import datetime
 
 user_bp = Blueprint('user', __name__)
@@ -239,17 +239,23 @@ def get_user_activities(user_id):
     if end_date:
         end_date = datetime.fromisoformat(end_date)
     
-    activities, error = ActivityService.get_user_activities(
+    page, error = ActivityService.get_user_activities(
         user_id,
         activity_type=activity_type,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        cursor=request.args.get('cursor'),
+        limit=request.args.get('limit', ACTIVITY_PAGE_SIZE, type=int)
     )
     
     if error:
         return jsonify({'error': error}), 400
         
-    return jsonify([activity.to_dict() for activity in activities]), 200
+    return jsonify({
+        'activities': [activity.to_dict() for activity in page['activities']],
+        'has_more': page['has_more'],
+        'next_cursor': page['next_cursor']
+    }), 200
 
 @user_bp.route('/admin/activities', methods=['GET'])
 @admin_required
@@ -266,14 +272,31 @@ def get_all_activities():
     if end_date:
         end_date = datetime.fromisoformat(end_date)
     
-    activities, error = ActivityService.get_all_activities(
-        activity_type=activity_type,
-        status=status,
-        start_date=start_date,
-        end_date=end_date
+    filters = {
+        'activity_type': activity_type,
+        'status': status,
+        'start_date': start_date,
+        'end_date': end_date
+    }
+    page, error = ActivityService.get_all_activities(
+        **filters,
+        cursor=request.args.get('cursor'),
+        limit=request.args.get('limit', ACTIVITY_PAGE_SIZE, type=int)
     )
     
     if error:
         return jsonify({'error': error}), 400
+
+    response = {
+        'activities': [activity.to_dict() for activity in page['activities']],
+        'has_more': page['has_more'],
+        'next_cursor': page['next_cursor']
+    }
+
+    # Exact totals are never computed; ?count=estimate adds a bounded estimate
+    if request.args.get('count') == 'estimate':
+        response['count_estimate'], error = ActivityService.estimate_activity_count(**filters)
+        if error:
+            return jsonify({'error': error}), 400
         
-    return jsonify([activity.to_dict() for activity in activities]), 200
\ No newline at end of file
+    return jsonify(response), 200
\ No newline at end of file
@@ -0,0 +1,248 @@
+from typing import Optional, Tuple, List, Dict
+from datetime import datetime, timezone
+from sqlalchemy import Table, MetaData, Column, select, func, text
+from sqlalchemy.exc import SQLAlchemyError
+from src.shared import db
+from src.user_service.models import UserActivity, ActivityPartition, PartitionStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+HOT_TABLE = UserActivity.__tablename__
+DEFAULT_PARTITION = f"{HOT_TABLE}_default"
+RETENTION_MODES = ('drop', 'detach')
+
+# Column-only copies of user_activities for rotated SQLite tables
+_archive_metadata = MetaData()
+
+def month_start(value: datetime) -> datetime:
+    """First instant of value's month as naive UTC, matching stored timestamps"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+def partition_name(start: datetime) -> str:
+    return f"{HOT_TABLE}_{start:%Y%m}"
+
+class ActivityPartitionService:
+    """Monthly partitions of the user activity log.
+
+    PostgreSQL: user_activities is natively range-partitioned on created_at
+    (see migration b9e4f7a2d631); ensure_partitions creates upcoming months
+    and the planner prunes partitions from the created_at filters. Rows no
+    month covers land in user_activities_default instead of failing the
+    insert; ensure_partitions moves them into a partition for their month.
+
+    SQLite: user_activities holds the current month. ensure_partitions
+    renames it away once a month boundary has passed and starts a fresh one,
+    and routed_tables lists the rotated tables a date range touches.
+
+    Retention drops or detaches whole partitions; no rows are deleted.
+    """
+
+    @staticmethod
+    def _is_postgres() -> bool:
+        return db.engine.dialect.name == 'postgresql'
+
+    @staticmethod
+    def archive_table(name: str) -> Table:
+        table = _archive_metadata.tables.get(name)
+        if table is None:
+            table = Table(name, _archive_metadata, *[
+                Column(c.name, c.type, primary_key=c.primary_key)
+                for c in UserActivity.__table__.columns
+            ])
+        return table
+
+    @staticmethod
+    def routed_tables(
+        start_date: datetime = None,
+        end_date: datetime = None,
+        before: datetime = None
+    ) -> List[Table]:
+        """Tables holding activity in the range, newest first"""
+        tables = [UserActivity.__table__]
+        if ActivityPartitionService._is_postgres():
+            return tables  # partition pruning happens in the planner
+
+        query = select(ActivityPartition.name).where(
+            ActivityPartition.status == PartitionStatus.ATTACHED.value
+        )
+        if start_date:
+            query = query.where(ActivityPartition.range_end > start_date)
+        if end_date:
+            query = query.where(ActivityPartition.range_start <= end_date)
+        if before:
+            query = query.where(ActivityPartition.range_start <= before)
+
+        names = db.session.execute(query.order_by(ActivityPartition.range_start.desc())).scalars()
+        return tables + [ActivityPartitionService.archive_table(name) for name in names]
+
+    @staticmethod
+    def ensure_partitions(
+        now: datetime = None,
+        months_ahead: int = 1
+    ) -> Tuple[Optional[List[str]], Optional[str]]:
+        """Create upcoming partitions (PostgreSQL) or rotate the live table (SQLite)"""
+        now = now or datetime.now(timezone.utc)
+        try:
+            if ActivityPartitionService._is_postgres():
+                created, error = ActivityPartitionService._create_pg_partitions(now, months_ahead)
+            else:
+                created, error = ActivityPartitionService._rotate_sqlite(month_start(now))
+            if error:
+                db.session.rollback()
+                return None, error
+
+            db.session.commit()
+            if created:
+                logger.info(f"Created activity partitions: {', '.join(created)}")
+            return created, None
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error maintaining activity partitions: {str(e)}")
+            return None, str(e)
+
+    @staticmethod
+    def _create_pg_partitions(now: datetime, months_ahead: int) -> Tuple[List[str], Optional[str]]:
+        partitioned = db.session.execute(text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :name"
+        ), {'name': HOT_TABLE}).scalar()
+        if not partitioned:
+            return [], f"{HOT_TABLE} is not partitioned; run database migrations"
+
+        known = set(db.session.execute(select(ActivityPartition.name)).scalars())
+        # Months with rows parked in the default partition get a partition too
+        # (a detached month's rows stay parked: its name is still taken)
+        stranded = set(db.session.execute(text(
+            f"SELECT DISTINCT date_trunc('month', created_at) FROM {DEFAULT_PARTITION}"
+        )).scalars())
+        upcoming = {add_months(month_start(now), offset) for offset in range(months_ahead + 1)}
+
+        created = []
+        for start in sorted(upcoming | stranded):
+            end = add_months(start, 1)
+            name = partition_name(start)
+            if name in known:
+                continue
+            # Bounds are generated dates, not user input
+            bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            if start in stranded:
+                # A new partition may not overlap rows in the default one: move
+                # them into a standalone table first, then attach it
+                db.session.execute(text(f"CREATE TABLE {name} (LIKE {HOT_TABLE} INCLUDING DEFAULTS)"))
+                db.session.execute(text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    f"WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ), {'start': start, 'end': end})
+                db.session.execute(text(f"ALTER TABLE {HOT_TABLE} ATTACH PARTITION {name} {bounds}"))
+            else:
+                db.session.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {HOT_TABLE} {bounds}"))
+            db.session.add(ActivityPartition(name=name, range_start=start, range_end=end))
+            created.append(name)
+        return created, None
+
+    @staticmethod
+    def _rotate_sqlite(boundary: datetime) -> Tuple[List[str], Optional[str]]:
+        """Move everything before `boundary` out of the live table by renaming it"""
+        oldest = db.session.execute(
+            select(func.min(UserActivity.created_at)).where(UserActivity.created_at < boundary)
+        ).scalar()
+        if oldest is None:
+            return [], None
+
+        last_end = db.session.execute(select(func.max(ActivityPartition.range_end))).scalar()
+        range_start = last_end or month_start(oldest)
+        name = partition_name(add_months(boundary, -1))
+        if db.session.execute(
+            select(ActivityPartition.id).where(ActivityPartition.name == name)
+        ).scalar() is not None:
+            return [], f"Partition {name} already exists"
+
+        columns = ', '.join(c.name for c in UserActivity.__table__.columns)
+        suffix = name[len(HOT_TABLE):]
+        session = db.session
+
+        session.execute(text(f"ALTER TABLE {HOT_TABLE} RENAME TO {name}"))
+        # Index names are database-wide in SQLite; re-create them under the partition's name
+        for index in UserActivity.__table__.indexes:
+            session.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+            session.execute(text(
+                f"CREATE INDEX {index.name}{suffix} ON {name} "
+                f"({', '.join(c.name for c in index.columns)})"
+            ))
+        UserActivity.__table__.create(bind=session.connection())
+
+        # Rows written after the boundary but before this rotation stay live
+        session.execute(text(
+            f"INSERT INTO {HOT_TABLE} ({columns}) SELECT {columns} FROM {name} WHERE created_at >= :boundary"
+        ), {'boundary': boundary})
+        session.execute(text(f"DELETE FROM {name} WHERE created_at >= :boundary"), {'boundary': boundary})
+
+        # Continue the id sequence instead of restarting it at 1
+        max_id = session.execute(text(f"SELECT MAX(id) FROM {name}")).scalar() or 0
+        updated = session.execute(text(
+            "UPDATE sqlite_sequence SET seq = MAX(seq, :max_id) WHERE name = :table"
+        ), {'max_id': max_id, 'table': HOT_TABLE})
+        if not updated.rowcount:
+            session.execute(text(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES (:table, :max_id)"
+            ), {'max_id': max_id, 'table': HOT_TABLE})
+
+        session.add(ActivityPartition(name=name, range_start=range_start, range_end=boundary))
+        return [name], None
+
+    @staticmethod
+    def purge(
+        retention_months: int,
+        mode: str = 'drop',
+        now: datetime = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """Drop or detach every partition that ends before the retention horizon"""
+        if mode not in RETENTION_MODES:
+            return None, f"Retention mode must be one of: {', '.join(RETENTION_MODES)}"
+        if retention_months < 0:
+            return None, "Retention must be zero or more months"
+
+        horizon = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+        try:
+            expired = ActivityPartition.query.filter(
+                ActivityPartition.range_end <= horizon,
+                ActivityPartition.status == PartitionStatus.ATTACHED.value
+            ).order_by(ActivityPartition.range_start).all()
+
+            purged = []
+            for partition in expired:
+                if ActivityPartitionService._is_postgres():
+                    db.session.execute(text(f"ALTER TABLE {HOT_TABLE} DETACH PARTITION {partition.name}"))
+
+                if mode == 'drop':
+                    db.session.execute(text(f"DROP TABLE IF EXISTS {partition.name}"))
+                    if partition.name in _archive_metadata.tables:
+                        _archive_metadata.remove(_archive_metadata.tables[partition.name])
+                    purged.append({**partition.to_dict(), 'action': mode})
+                    db.session.delete(partition)
+                else:
+                    partition.status = PartitionStatus.DETACHED.value
+                    partition.detached_at = datetime.now(timezone.utc)
+                    purged.append({**partition.to_dict(), 'action': mode})
+
+            db.session.commit()
+            if purged:
+                logger.info(
+                    f"Activity retention ({mode}, {retention_months} months): "
+                    f"{', '.join(p['name'] for p in purged)}"
+                )
+            return purged, None
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error purging activity partitions: {str(e)}")
+            return None, str(e)
@@ -1,9 +1,16 @@
-from typing import Optional, Tuple, List
+import base64
+from typing import Optional, Tuple, List, Dict, Any
 from datetime import datetime, timezone
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import and_, or_, func, select
 from flask import Request
 from src.shared import db
 from src.user_service.models import UserActivity, User
+from src.user_service.services.activity_partitions import ActivityPartitionService
+
+ACTIVITY_PAGE_SIZE = 50
+ACTIVITY_MAX_PAGE_SIZE = 500
+ACTIVITY_COUNT_CAP = 10000
 
 class ActivityService:
     @staticmethod
@@ -34,28 +41,112 @@ class ActivityService:
             db.session.rollback()
             return None, str(e)
 
+    @staticmethod
+    def encode_cursor(activity: UserActivity) -> str:
+        """Opaque keyset position after `activity` in (created_at, id) DESC order"""
+        raw = f"{activity.created_at.isoformat()}|{activity.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token: str) -> Tuple[Optional[Tuple[datetime, int]], Optional[str]]:
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+            created_at, activity_id = raw.rsplit('|', 1)
+            return (datetime.fromisoformat(created_at), int(activity_id)), None
+        except (ValueError, UnicodeDecodeError):
+            return None, "Invalid cursor"
+
+    @staticmethod
+    def _conditions(
+        columns,
+        user_id: int = None,
+        activity_type: str = None,
+        status: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None
+    ) -> list:
+        """Filter predicates against user_activities or one of its partitions"""
+        conditions = []
+        if user_id is not None:
+            conditions.append(columns.user_id == user_id)
+        if activity_type:
+            conditions.append(columns.activity_type == activity_type)
+        if status:
+            conditions.append(columns.status == status)
+        if start_date:
+            conditions.append(columns.created_at >= start_date)
+        if end_date:
+            conditions.append(columns.created_at <= end_date)
+        return conditions
+
+    @staticmethod
+    def _page(filters: Dict[str, Any], cursor: Optional[str], limit: int) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Newest-first keyset page over (created_at, id), across partitions"""
+        limit = max(1, min(limit, ACTIVITY_MAX_PAGE_SIZE))
+        position = None
+        if cursor:
+            position, error = ActivityService.decode_cursor(cursor)
+            if error:
+                return None, error
+
+        tables = ActivityPartitionService.routed_tables(
+            start_date=filters.get('start_date'),
+            end_date=filters.get('end_date'),
+            before=position[0] if position else None
+        )
+
+        # Partitions cover disjoint, descending time ranges: fill the page in order
+        activities = []
+        for table in tables:
+            remaining = limit + 1 - len(activities)
+            if remaining <= 0:
+                break
+            conditions = ActivityService._conditions(table.c, **filters)
+            if position:
+                created_at, activity_id = position
+                conditions.append(or_(
+                    table.c.created_at < created_at,
+                    and_(table.c.created_at == created_at, table.c.id < activity_id)
+                ))
+            order = (table.c.created_at.desc(), table.c.id.desc())
+
+            if table is UserActivity.__table__:
+                activities.extend(
+                    UserActivity.query.filter(*conditions).order_by(*order).limit(remaining).all()
+                )
+            else:
+                rows = db.session.execute(
+                    select(table).where(*conditions).order_by(*order).limit(remaining)
+                ).mappings()
+                activities.extend(UserActivity(**row) for row in rows)
+
+        has_more = len(activities) > limit
+        activities = activities[:limit]
+
+        return {
+            'activities': activities,
+            'has_more': has_more,
+            'next_cursor': ActivityService.encode_cursor(activities[-1]) if has_more else None
+        }, None
+
     @staticmethod
     def get_user_activities(
         user_id: int,
         activity_type: str = None,
         start_date: datetime = None,
-        end_date: datetime = None
-    ) -> Tuple[Optional[List[UserActivity]], Optional[str]]:
-        """Get activities for a specific user with optional filters"""
+        end_date: datetime = None,
+        cursor: str = None,
+        limit: int = ACTIVITY_PAGE_SIZE
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Get a page of activities for a specific user with optional filters"""
         try:
-            query = UserActivity.query.filter_by(user_id=user_id)
-            
-            if activity_type:
-                query = query.filter_by(activity_type=activity_type)
-            
-            if start_date:
-                query = query.filter(UserActivity.created_at >= start_date)
-            
-            if end_date:
-                query = query.filter(UserActivity.created_at <= end_date)
-            
-            activities = query.order_by(UserActivity.created_at.desc()).all()
-            return activities, None
+            filters = {
+                'user_id': user_id,
+                'activity_type': activity_type,
+                'start_date': start_date,
+                'end_date': end_date
+            }
+            return ActivityService._page(filters, cursor, limit)
             
         except SQLAlchemyError as e:
             return None, str(e)
@@ -65,26 +156,71 @@ class ActivityService:
         activity_type: str = None,
         status: str = None,
         start_date: datetime = None,
-        end_date: datetime = None
-    ) -> Tuple[Optional[List[UserActivity]], Optional[str]]:
-        """Get all activities with optional filters (admin only)"""
+        end_date: datetime = None,
+        cursor: str = None,
+        limit: int = ACTIVITY_PAGE_SIZE
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Get a page of all activities with optional filters (admin only)"""
         try:
-            query = UserActivity.query
-            
-            if activity_type:
-                query = query.filter_by(activity_type=activity_type)
-            
-            if status:
-                query = query.filter_by(status=status)
-            
-            if start_date:
-                query = query.filter(UserActivity.created_at >= start_date)
-            
-            if end_date:
-                query = query.filter(UserActivity.created_at <= end_date)
-            
-            activities = query.order_by(UserActivity.created_at.desc()).all()
-            return activities, None
+            filters = {
+                'activity_type': activity_type,
+                'status': status,
+                'start_date': start_date,
+                'end_date': end_date
+            }
+            return ActivityService._page(filters, cursor, limit)
             
         except SQLAlchemyError as e:
-            return None, str(e)
\ No newline at end of file
+            return None, str(e)
+
+    @staticmethod
+    def estimate_activity_count(
+        activity_type: str = None,
+        status: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Approximate row count for the admin view without an exact COUNT(*).
+
+        PostgreSQL: the planner's row estimate for the filtered query.
+        Elsewhere: a count capped at ACTIVITY_COUNT_CAP rows, so the cost
+        is bounded no matter how large the table grows.
+        """
+        filters = {
+            'activity_type': activity_type,
+            'status': status,
+            'start_date': start_date,
+            'end_date': end_date
+        }
+        try:
+            tables = ActivityPartitionService.routed_tables(start_date=start_date, end_date=end_date)
+
+            if db.engine.dialect.name == 'postgresql':
+                table = tables[0]
+                # Filter values stay bound parameters; the statement text is
+                # handed to the driver as is, never re-parsed as text()
+                compiled = select(table.c.id)\
+                    .where(*ActivityService._conditions(table.c, **filters))\
+                    .compile(dialect=db.engine.dialect)
+                plan = db.session.connection().exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+                ).scalar()
+                return {'value': int(plan[0]['Plan']['Plan Rows']), 'exact': False}, None
+
+            counted = 0
+            for table in tables:
+                remaining = ACTIVITY_COUNT_CAP - counted
+                if remaining <= 0:
+                    break
+                counted += db.session.execute(
+                    select(func.count()).select_from(
+                        select(table.c.id)
+                        .where(*ActivityService._conditions(table.c, **filters))
+                        .limit(remaining)
+                        .subquery()
+                    )
+                ).scalar()
+            return {'value': counted, 'exact': counted < ACTIVITY_COUNT_CAP}, None
+
+        except SQLAlchemyError as e:
+            return None, str(e)
@@ -7,6 +7,7 @@ from src.user_service.models.user import User
 from src.user_service.models.user_activity import UserActivity
 from flask import Request
 from src.shared.auth import create_token
+from src.shared.password_hasher import FailedLoginCache, HashingUnavailable
 
 class AdminAuthService:
     @staticmethod
@@ -72,10 +73,13 @@ class AdminAuthService:
     @staticmethod
     def authenticate_admin(username: str, password: str, request: Request) -> Tuple[Optional[Dict], Optional[str]]:
         """Authenticate an admin user"""
+        client_ip = request.remote_addr if request else None
+        FailedLoginCache.check(username, client_ip)
         try:
             user = User.query.filter_by(username=username).first()
             
             if not user or not user.check_password(password):
+                FailedLoginCache.record_failure(username, client_ip)
                 return None, "Invalid admin credentials"
 
             if not user.is_admin:
@@ -84,6 +88,8 @@ class AdminAuthService:
             if not user.is_active:
                 return None, "Account is deactivated"
 
+            FailedLoginCache.reset(username)
+
             # Create standard token
             token = create_token(user.id)
 
@@ -96,6 +102,8 @@ class AdminAuthService:
                 'token': token
             }, None
 
+        except HashingUnavailable:
+            raise
         except Exception as e:
             print(f"Admin authentication error: {str(e)}")
             return None, str(e)
\ No newline at end of file
@@ -1,9 +1,11 @@
 from typing import Optional, Tuple, Dict, Any
 from datetime import datetime, timezone
+from sqlalchemy import update, func
 from sqlalchemy.exc import SQLAlchemyError
 from src.shared import db
 from src.user_service.models import User, UserStatusChange, CreditTransaction
-from flask import request
+from flask import request, has_request_context
+from src.shared.password_hasher import FailedLoginCache
 from src.user_service.services.activity_service import ActivityService
 import logging
 
@@ -54,12 +56,17 @@ class UserService:
     @staticmethod
     def authenticate_user(username: str, password: str) -> Tuple[Optional[User], Optional[str]]:
         """Authenticate a user"""
+        client_ip = request.remote_addr if has_request_context() else None
+        # Repeated bad passwords are refused (429) before any lookup or hash work
+        FailedLoginCache.check(username, client_ip)
         try:
             user = User.query.filter_by(username=username).first()
             if not user:
+                FailedLoginCache.record_failure(username, client_ip)
                 return None, "Invalid username or password"
             
             if not user.check_password(password):
+                FailedLoginCache.record_failure(username, client_ip)
                 ActivityService.log_activity(
                     user_id=user.id,
                     activity_type='login',
@@ -79,6 +86,8 @@ class UserService:
                 )
                 return None, "Account is deactivated"
             
+            FailedLoginCache.reset(username)
+
             # Update last login timestamp
             user.last_login = datetime.now(timezone.utc)
             db.session.commit()
@@ -125,6 +134,40 @@ class UserService:
             db.session.rollback()
             return None, str(e)
 
+    @staticmethod
+    def add_credits(user_id: int, amount: float, reference_type: str = None,
+                    reference_id: str = None, notes: str = None) -> Tuple[Optional[float], Optional[str]]:
+        """Credit a user and record the transaction inside the caller's transaction.
+
+        One conditional UPDATE ... RETURNING plus the CreditTransaction row;
+        nothing is committed, so the credits land or roll back together with
+        whatever the caller is doing. A failed statement raises SQLAlchemyError
+        for the caller to roll back.
+        Returns: (balance after the credit, error_message)
+        """
+        amount = abs(amount)
+        balance_after = db.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(site_credits=func.coalesce(User.site_credits, 0) + amount)
+            .returning(User.site_credits),
+            execution_options={'synchronize_session': False}
+        ).scalar()
+        if balance_after is None:
+            return None, "User not found"
+
+        db.session.add(CreditTransaction(
+            user_id=user_id,
+            amount=amount,
+            transaction_type='add',
+            balance_after=balance_after,
+            reference_type=reference_type,
+            reference_id=reference_id,
+            notes=notes,
+            created_by_id=user_id
+        ))
+        return balance_after, None
+
     @staticmethod
     def update_credits(user_id: int, amount: float, transaction_type: str, 
                       admin_id: int = None, reference_type: str = None, 
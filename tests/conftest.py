@@ -13,17 +13,50 @@ from src.prize_service.models import (
 )
 from src.raffle_service.models import Raffle
 from src.user_service.models import User
-from flask import Flask
-from src.shared.config import TestingConfig  # Changed from TestConfig to TestingConfig
+from contextlib import contextmanager
+from typing import Optional
+from app import create_app
+from src.shared.query_profiler import QueryProfiler
+from src.prize_service.services.prize_catalog import PrizeCatalog
+from src.raffle_service.services.availability_index import AvailabilityIndex
 
 @pytest.fixture(scope='session')
 def app():
     """Create application for the tests."""
-    app = Flask(__name__)
-    app.config.from_object(TestingConfig)
-    db.init_app(app)
+    app = create_app('testing')
     return app
 
+@pytest.fixture
+def client(app):
+    """Test client for endpoint tests"""
+    return app.test_client()
+
+@pytest.fixture
+def query_budget():
+    """Assert a statement budget for a block of code or an endpoint call
+
+    Usage:
+        with query_budget(max_statements=5):
+            client.get('/api/raffles/1')
+    """
+    @contextmanager
+    def _budget(max_statements: int, max_repeats: Optional[int] = None):
+        with QueryProfiler.profile() as stats:
+            yield stats
+
+        assert stats.statement_count <= max_statements, (
+            f"Query budget exceeded: {stats.statement_count} statements "
+            f"(budget {max_statements})"
+        )
+        if max_repeats is not None:
+            repeated = stats.repeated_shapes(max_repeats)
+            assert not repeated, (
+                f"Statement repeated {repeated[0][1]} times "
+                f"(limit {max_repeats}): {repeated[0][0]}"
+            )
+
+    return _budget
+
 @pytest.fixture(scope='function')
 def db_session(app):
     """Provide a clean database session for tests"""
@@ -38,6 +71,9 @@ def db_session(app):
         session.close()
         db.session.remove()
         db.drop_all()
+        # Ids are reused by the next test's fresh tables
+        PrizeCatalog.clear()
+        AvailabilityIndex.clear()
 
 @pytest.fixture
 def admin_user(db_session):
@@ -53,6 +89,12 @@ def admin_user(db_session):
     db_session.commit()   # Changed from db_session.session.commit
     return user
 
+@pytest.fixture
+def admin_headers(app, admin_user):
+    """Authorization header for the admin user"""
+    from src.shared.auth import create_token
+    return {'Authorization': f'Bearer {create_token(admin_user.id)}'}
+
 @pytest.fixture
 def test_prizes(db_session):
     """Create test prize templates"""
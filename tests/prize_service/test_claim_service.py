@@ -0,0 +1,136 @@
+# tests/prize_service/test_claim_service.py
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from src.shared import db
+from src.prize_service.models import (
+    Prize, PrizePool, PrizeInstance, PrizeAllocation,
+    InstanceStatus, ClaimStatus, AllocationType
+)
+from src.prize_service.services.claim_service import ClaimService
+from src.user_service.models import User, CreditTransaction
+from src.user_service.services.user_service import UserService
+
+@pytest.fixture
+def winner(db_session):
+    user = User(username='claimer', email='claimer@test.com', site_credits=0.0)
+    user.set_password('secret123')
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+@pytest.fixture
+def discovered_win(db_session, winner):
+    prize = Prize(
+        name='Claim Prize',
+        type='Instant_Win',
+        tier='silver',
+        retail_value=Decimal('50.00'),
+        cash_value=Decimal('40.00'),
+        credit_value=Decimal('45.00'),
+        created_by_id=1
+    )
+    pool = PrizePool(name='Claim Pool', created_by_id=1)
+    db_session.add_all([prize, pool])
+    db_session.flush()
+
+    deadline = datetime.now(timezone.utc) + timedelta(hours=4)
+    instance = PrizeInstance(
+        instance_id=f"{pool.id}-{prize.id}-001",
+        pool_id=pool.id,
+        prize_id=prize.id,
+        individual_odds=10.0,
+        status=InstanceStatus.DISCOVERED.value,
+        claim_deadline=deadline,
+        created_by_id=1
+    )
+    allocation = PrizeAllocation(
+        prize_id=prize.id,
+        pool_id=pool.id,
+        allocation_type=AllocationType.INSTANT_WIN.value,
+        reference_type='ticket',
+        reference_id='1',
+        instance_identifier=instance.instance_id,
+        winner_user_id=winner,
+        claim_deadline=deadline,
+        created_by_id=1
+    )
+    db_session.add_all([instance, allocation])
+    db_session.commit()
+    return allocation.id, instance.instance_id, pool.id
+
+class TestCreditClaim:
+    def test_claim_marks_instance_claimed(self, db_session, winner, discovered_win):
+        allocation_id, instance_id, _ = discovered_win
+
+        result, error = ClaimService.initiate_claim(allocation_id, winner)
+
+        assert error is None
+        assert result['credits_awarded'] == 45.0
+        instance = PrizeInstance.query.filter_by(instance_id=instance_id).one()
+        assert instance.status == InstanceStatus.CLAIMED.value
+        assert instance.claimed_by_id == winner
+        assert db.session.get(User, winner).site_credits == 45.0
+
+    def test_claimed_instance_cannot_be_claimed_again(self, db_session, winner, discovered_win):
+        allocation_id, instance_id, _ = discovered_win
+        db.session.execute(
+            db.update(PrizeInstance)
+            .where(PrizeInstance.instance_id == instance_id)
+            .values(status=InstanceStatus.CLAIMED.value)
+        )
+        db_session.commit()
+
+        result, error = ClaimService.initiate_claim(allocation_id, winner)
+
+        assert result is None
+        assert error == "Prize instance no longer available"
+        assert db.session.get(User, winner).site_credits == 0.0
+        assert db.session.get(PrizeAllocation, allocation_id).claim_status == ClaimStatus.PENDING.value
+
+    def test_failure_after_crediting_rolls_back_everything(self, db_session, winner, discovered_win, monkeypatch):
+        allocation_id, instance_id, _ = discovered_win
+        real_add_credits = UserService.add_credits
+
+        def add_credits_then_fail(*args, **kwargs):
+            real_add_credits(*args, **kwargs)
+            raise SQLAlchemyError("prize stats unavailable")
+        monkeypatch.setattr(UserService, 'add_credits', staticmethod(add_credits_then_fail))
+
+        _, error = ClaimService.initiate_claim(allocation_id, winner)
+
+        assert error == "prize stats unavailable"
+        db_session.expire_all()
+        assert db.session.get(User, winner).site_credits == 0.0
+        assert db_session.query(CreditTransaction).count() == 0
+        assert PrizeInstance.query.filter_by(instance_id=instance_id).one().status == InstanceStatus.DISCOVERED.value
+        assert db.session.get(PrizeAllocation, allocation_id).claim_status == ClaimStatus.PENDING.value
+
+class TestInstanceState:
+    def test_instance_id_is_unique(self, db_session, discovered_win):
+        _, instance_id, pool_id = discovered_win
+        duplicate = PrizeInstance.query.filter_by(instance_id=instance_id).one()
+        db_session.add(PrizeInstance(
+            instance_id=instance_id,
+            pool_id=pool_id,
+            prize_id=duplicate.prize_id,
+            individual_odds=1.0,
+            created_by_id=1
+        ))
+        with pytest.raises(IntegrityError):
+            db_session.commit()
+        db_session.rollback()
+
+    def test_odds_configuration_is_derived(self, db_session, winner, discovered_win):
+        allocation_id, instance_id, pool_id = discovered_win
+        pool = db.session.get(PrizePool, pool_id)
+
+        before = pool.odds_configuration['prizes'][0]['instances'][0]
+        assert before == {'instance_id': instance_id, 'status': 'discovered', 'individual_odds': 10.0}
+
+        ClaimService.initiate_claim(allocation_id, winner)
+
+        after = pool.odds_configuration['prizes'][0]['instances'][0]
+        assert after['status'] == InstanceStatus.CLAIMED.value
@@ -0,0 +1,191 @@
+# tests/prize_service/test_deadline_scheduler.py
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from src.shared import db
+from src.shared.leader_lease import LeaderLease
+from src.prize_service.models import (
+    Prize, PrizePool, PrizeAllocation, ClaimStatus, AllocationType, PrizeInstance, InstanceStatus
+)
+from src.prize_service.services import deadline_scheduler
+from src.prize_service.services.deadline_scheduler import DeadlineScheduler
+from src.prize_service.services.claim_service import ClaimService
+from src.prize_service.services.expiry_service import ExpiryService
+from src.user_service.models import User
+
+@pytest.fixture
+def winner(db_session):
+    user = User(username='winner', email='winner@test.com', site_credits=0.0)
+    user.set_password('secret123')
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+@pytest.fixture
+def prize_setup(db_session):
+    prize = Prize(
+        name='Auto Prize',
+        type='Instant_Win',
+        tier='silver',
+        retail_value=Decimal('100.00'),
+        cash_value=Decimal('80.00'),
+        credit_value=Decimal('90.00'),
+        auto_claim_credit=True,
+        created_by_id=1
+    )
+    pool = PrizePool(name='Scheduler Pool', created_by_id=1)
+    db_session.add_all([prize, pool])
+    db_session.commit()
+    return pool.id, prize.id
+
+@pytest.fixture
+def scheduler(app):
+    return DeadlineScheduler(app, batch_size=2, leader_lock=False)
+
+def _allocation(pool_id, prize_id, user_id, deadline):
+    allocation = PrizeAllocation(
+        prize_id=prize_id,
+        pool_id=pool_id,
+        allocation_type=AllocationType.INSTANT_WIN.value,
+        reference_type='ticket',
+        reference_id='1',
+        winner_user_id=user_id,
+        claim_deadline=deadline,
+        original_value=Decimal('90.00'),
+        created_by_id=1
+    )
+    db.session.add(allocation)
+    return allocation
+
+def _instance(pool_id, prize_id, deadline, status=InstanceStatus.DISCOVERED.value):
+    instance = PrizeInstance(
+        instance_id=f"{pool_id}-{prize_id}-{status}",
+        pool_id=pool_id,
+        prize_id=prize_id,
+        individual_odds=10.0,
+        status=status,
+        claim_deadline=deadline,
+        created_by_id=1
+    )
+    db.session.add(instance)
+    return instance
+
+class TestDeadlineScheduler:
+    def test_schedule_orders_by_due_time(self, scheduler):
+        now = datetime.now(timezone.utc)
+        scheduler.schedule(1, now + timedelta(hours=5), auto_claim=False)
+        scheduler.schedule(2, now + timedelta(hours=3), auto_claim=False)
+        scheduler.schedule(2, now + timedelta(hours=3), auto_claim=False)
+
+        assert len(scheduler) == 2
+        assert scheduler.next_due() == now + timedelta(hours=3)
+
+    def test_load_and_expire_due(self, db_session, scheduler, prize_setup, winner):
+        pool_id, prize_id = prize_setup
+        now = datetime.now(timezone.utc)
+        due = [_allocation(pool_id, prize_id, winner, now + timedelta(hours=2)) for _ in range(3)]
+        later = _allocation(pool_id, prize_id, winner, now + timedelta(days=1))
+        db_session.commit()
+        due_ids, later_id = [a.id for a in due], later.id
+
+        assert scheduler.load() == 4
+        scheduler.load()  # watermark is inclusive; re-read rows are deduped
+        assert len(scheduler) == 8
+
+        processed = scheduler.run_due(now=now + timedelta(hours=3))
+
+        assert processed[DeadlineScheduler.EXPIRE] + processed[DeadlineScheduler.AUTO_CLAIM] == 3
+        statuses = {a.id: a.claim_status for a in PrizeAllocation.query.all()}
+        assert all(statuses[i] != ClaimStatus.PENDING.value for i in due_ids)
+        assert statuses[later_id] == ClaimStatus.PENDING.value
+
+    def test_auto_claim_credits_winner(self, db_session, scheduler, prize_setup, winner):
+        pool_id, prize_id = prize_setup
+        allocation = _allocation(pool_id, prize_id, winner, datetime.now(timezone.utc) + timedelta(minutes=30))
+        db_session.commit()
+        allocation_id = allocation.id
+
+        scheduler.load()
+        processed = scheduler.run_due()
+
+        assert processed[DeadlineScheduler.AUTO_CLAIM] == 1
+        assert db.session.get(PrizeAllocation, allocation_id).claim_status == ClaimStatus.CLAIMED.value
+        assert db.session.get(User, winner).site_credits == 90.0
+
+    def test_failed_auto_claim_leaves_the_rest_of_the_batch(self, db_session, prize_setup, winner):
+        pool_id, prize_id = prize_setup
+        soon = datetime.now(timezone.utc) + timedelta(minutes=30)
+        good = _allocation(pool_id, prize_id, winner, soon)
+        orphan = _allocation(pool_id, prize_id, winner + 1000, soon)
+        db_session.commit()
+        good_id, orphan_id = good.id, orphan.id
+
+        assert ClaimService.process_auto_claims([good_id, orphan_id]) == (1, None)
+
+        db_session.expire_all()
+        assert db.session.get(PrizeAllocation, good_id).claim_status == ClaimStatus.CLAIMED.value
+        assert db.session.get(PrizeAllocation, orphan_id).claim_status == ClaimStatus.PENDING.value
+        assert db.session.get(User, winner).site_credits == 90.0
+
+    def test_auto_claim_claims_the_instance(self, db_session, prize_setup, winner):
+        pool_id, prize_id = prize_setup
+        deadline = datetime.now(timezone.utc) + timedelta(minutes=30)
+        instance = _instance(pool_id, prize_id, deadline)
+        allocation = _allocation(pool_id, prize_id, winner, deadline)
+        allocation.instance_identifier = instance.instance_id
+        db_session.commit()
+        allocation_id, instance_id = allocation.id, instance.instance_id
+
+        assert ClaimService.process_auto_claims([allocation_id]) == (1, None)
+        # The expiry sweep must not hand a paid prize back to the pool
+        assert ExpiryService.reset_expired_instances(now=deadline + timedelta(hours=1)) == (0, None)
+
+        db_session.expire_all()
+        instance = PrizeInstance.query.filter_by(instance_id=instance_id).one()
+        assert instance.status == InstanceStatus.CLAIMED.value and instance.claimed_by_id == winner
+        assert db.session.get(Prize, prize_id).total_claimed == 1
+
+    def test_auto_claim_skips_a_released_instance(self, db_session, prize_setup, winner):
+        pool_id, prize_id = prize_setup
+        deadline = datetime.now(timezone.utc) + timedelta(minutes=30)
+        instance = _instance(pool_id, prize_id, deadline, status=InstanceStatus.AVAILABLE.value)
+        allocation = _allocation(pool_id, prize_id, winner, deadline)
+        allocation.instance_identifier = instance.instance_id
+        db_session.commit()
+        allocation_id = allocation.id
+
+        assert ClaimService.process_auto_claims([allocation_id]) == (0, None)
+
+        db_session.expire_all()
+        assert db.session.get(PrizeAllocation, allocation_id).claim_status == ClaimStatus.PENDING.value
+        assert db.session.get(User, winner).site_credits == 0.0
+        assert not db.session.get(Prize, prize_id).total_claimed
+
+    def test_commit_hook_schedules_new_allocations(self, db_session, scheduler, prize_setup, winner):
+        pool_id, prize_id = prize_setup
+        DeadlineScheduler.install_hooks()
+        deadline_scheduler._active_scheduler = scheduler
+        try:
+            _allocation(pool_id, prize_id, winner, datetime.now(timezone.utc) + timedelta(hours=4))
+            db_session.commit()
+        finally:
+            deadline_scheduler._active_scheduler = None
+
+        assert len(scheduler) == 2
+
+class TestLeaderLease:
+    def test_single_leader(self, db_session):
+        assert LeaderLease.acquire('job', 'worker-a', ttl_seconds=30)
+        assert not LeaderLease.acquire('job', 'worker-b', ttl_seconds=30)
+        assert LeaderLease.acquire('job', 'worker-a', ttl_seconds=30)
+
+    def test_lapsed_lease_is_taken_over(self, db_session):
+        assert LeaderLease.acquire('job', 'worker-a', ttl_seconds=-1)
+        assert LeaderLease.acquire('job', 'worker-b', ttl_seconds=30)
+        assert not LeaderLease.acquire('job', 'worker-a', ttl_seconds=30)
+
+    def test_release(self, db_session):
+        assert LeaderLease.acquire('job', 'worker-a', ttl_seconds=30)
+        LeaderLease.release('job', 'worker-a')
+        assert LeaderLease.acquire('job', 'worker-b', ttl_seconds=30)
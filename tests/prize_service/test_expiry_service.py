@@ -0,0 +1,120 @@
+# tests/prize_service/test_expiry_service.py
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from src.shared import db
+from src.prize_service.models import (
+    Prize, PrizePool, PrizeInstance, PrizeAllocation,
+    InstanceStatus, ClaimStatus, AllocationType
+)
+from src.raffle_service.models import InstantWin, InstantWinStatus
+from src.prize_service.services.expiry_service import ExpiryService
+from src.prize_service.services.claim_service import ClaimService
+from src.prize_service.services.prize_service import PrizeService
+
+@pytest.fixture
+def pool_with_prize(db_session):
+    prize = Prize(
+        name='Expiry Prize',
+        type='Instant_Win',
+        tier='silver',
+        retail_value=Decimal('100.00'),
+        cash_value=Decimal('80.00'),
+        credit_value=Decimal('90.00'),
+        created_by_id=1
+    )
+    pool = PrizePool(name='Expiry Pool', created_by_id=1)
+    db_session.add_all([prize, pool])
+    db_session.commit()
+    return pool.id, prize.id
+
+def _make_win(pool_id, prize_id, n, deadline):
+    instance = PrizeInstance(
+        instance_id=f"EXP-{n:04d}",
+        pool_id=pool_id,
+        prize_id=prize_id,
+        individual_odds=1.0,
+        status=InstanceStatus.DISCOVERED.value,
+        claim_attempts=2,
+        claim_deadline=deadline,
+        created_by_id=1
+    )
+    allocation = PrizeAllocation(
+        prize_id=prize_id,
+        pool_id=pool_id,
+        allocation_type=AllocationType.INSTANT_WIN.value,
+        reference_type='ticket',
+        reference_id=str(n),
+        instance_identifier=instance.instance_id,
+        winner_user_id=1,
+        claim_status=ClaimStatus.PENDING.value,
+        claim_deadline=deadline,
+        created_by_id=1
+    )
+    db.session.add_all([instance, allocation])
+    return instance, allocation
+
+class TestExpireAllocations:
+    def test_expires_in_chunks(self, db_session, pool_with_prize):
+        pool_id, prize_id = pool_with_prize
+        past = datetime.now(timezone.utc) - timedelta(hours=1)
+        future = datetime.now(timezone.utc) + timedelta(hours=1)
+        for n in range(7):
+            _make_win(pool_id, prize_id, n, past)
+        _make_win(pool_id, prize_id, 99, future)
+        db_session.commit()
+
+        count, error = ExpiryService.expire_allocations(chunk_size=3)
+
+        assert error is None
+        assert count == 7
+        statuses = [a.claim_status for a in PrizeAllocation.query.order_by(PrizeAllocation.id)]
+        assert statuses == [ClaimStatus.EXPIRED.value] * 7 + [ClaimStatus.PENDING.value]
+
+        released = PrizeInstance.query.filter_by(status=InstanceStatus.AVAILABLE.value).all()
+        assert len(released) == 7
+        assert all(i.claim_attempts == 0 for i in released)
+
+    def test_rerun_is_noop(self, db_session, pool_with_prize):
+        pool_id, prize_id = pool_with_prize
+        _make_win(pool_id, prize_id, 1, datetime.now(timezone.utc) - timedelta(minutes=5))
+        db_session.commit()
+
+        assert ExpiryService.expire_allocations() == (1, None)
+        assert ExpiryService.expire_allocations() == (0, None)
+
+    def test_expires_open_instant_wins(self, db_session, pool_with_prize):
+        pool_id, prize_id = pool_with_prize
+        _, allocation = _make_win(pool_id, prize_id, 1, datetime.now(timezone.utc) - timedelta(minutes=5))
+        db_session.commit()
+        win = InstantWin(
+            raffle_id=1,
+            ticket_id=1,
+            prize_reference=str(allocation.id),
+            status=InstantWinStatus.PENDING.value
+        )
+        db_session.add(win)
+        db_session.commit()
+        win_id = win.id
+
+        count, error = ClaimService.expire_stale_claims()
+
+        assert error is None
+        assert count == 1
+        assert db.session.get(InstantWin, win_id).status == InstantWinStatus.EXPIRED.value
+
+class TestResetExpiredInstances:
+    def test_resets_instances_and_expires_allocations(self, db_session, pool_with_prize):
+        pool_id, prize_id = pool_with_prize
+        past = datetime.now(timezone.utc) - timedelta(hours=1)
+        for n in range(5):
+            _make_win(pool_id, prize_id, n, past)
+        db_session.commit()
+
+        count, error = PrizeService.process_expired_claims(chunk_size=2)
+
+        assert error is None
+        assert count == 5
+        assert PrizeInstance.query.filter_by(status=InstanceStatus.AVAILABLE.value).count() == 5
+        assert PrizeAllocation.query.filter_by(claim_status=ClaimStatus.EXPIRED.value).count() == 5
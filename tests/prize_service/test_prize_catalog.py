@@ -0,0 +1,74 @@
+# tests/prize_service/test_prize_catalog.py
+
+import pytest
+from decimal import Decimal
+from datetime import datetime, timezone, timedelta
+from src.prize_service.models import (
+    Prize, PrizePool, PrizeInstance, PrizeAllocation, InstanceStatus, PoolStatus,
+    AllocationType, ClaimStatus
+)
+from src.prize_service.services.prize_catalog import PrizeCatalog
+from src.prize_service.services.prize_service import PrizeService
+from src.prize_service.services.claim_service import ClaimService
+
+def _prize(name):
+    return Prize(name=name, type='Instant_Win', tier='silver', retail_value=Decimal('10.00'),
+                 cash_value=Decimal('8.00'), credit_value=Decimal('9.00'), created_by_id=1)
+
+@pytest.fixture
+def catalog(db_session):
+    """A locked pool holding one prize, a prize in no pool, and a pending allocation"""
+    pooled, loose = _prize('Pooled'), _prize('Loose')
+    pool = PrizePool(name='Catalog Pool', created_by_id=1)
+    db_session.add_all([pooled, loose, pool])
+    db_session.flush()
+    db_session.add(PrizeInstance(instance_id=f"{pool.id}-{pooled.id}-000", pool_id=pool.id, prize_id=pooled.id,
+                                 individual_odds=1.0, status=InstanceStatus.AVAILABLE.value, created_by_id=1))
+    pool.status = PoolStatus.LOCKED.value
+    allocation = PrizeAllocation(prize_id=pooled.id, pool_id=pool.id,
+                                 allocation_type=AllocationType.INSTANT_WIN.value,
+                                 reference_type='ticket', reference_id='1', winner_user_id=7,
+                                 claim_status=ClaimStatus.PENDING.value,
+                                 claim_deadline=datetime.now(timezone.utc) + timedelta(days=1), created_by_id=1)
+    db_session.add(allocation)
+    db_session.commit()
+    ids = {'pooled': pooled.id, 'loose': loose.id, 'pool': pool.id, 'allocation': allocation.id}
+    db_session.expunge_all()
+    return ids
+
+class TestPrizeCatalog:
+    def test_prize_in_a_pool_is_read_once(self, app, db_session, catalog, query_budget):
+        with query_budget(max_statements=1):
+            assert PrizeCatalog.prize(catalog['pooled']).name == 'Pooled'
+        with query_budget(max_statements=0):
+            assert PrizeCatalog.prize(catalog['pooled']).credit_value == Decimal('9.00')
+            assert PrizeService.validate_prize_selection(catalog['pooled'], 'cash') == (True, None)
+
+    def test_editable_prize_is_not_cached(self, app, db_session, catalog):
+        assert PrizeCatalog.prize(catalog['loose']).name == 'Loose'
+        PrizeService.update_prize(catalog['loose'], {'name': 'Renamed'}, admin_id=1)
+        assert PrizeCatalog.prize(catalog['loose']).name == 'Renamed'
+        assert PrizeCatalog.prize(999) is None
+
+    def test_claim_status_skips_prize_lookup(self, app, db_session, catalog, query_budget):
+        PrizeCatalog.warm()
+        with query_budget(max_statements=1):
+            status, error = ClaimService.check_claim_status(catalog['allocation'], 7)
+        assert error is None and status['prize_name'] == 'Pooled'
+
+    def test_unlock_invalidates_locked_pool(self, app, db_session, catalog, query_budget):
+        assert PrizeCatalog.warm() == (2, None)
+        with query_budget(max_statements=0):
+            assert PrizeCatalog.pool(catalog['pool']).status == PoolStatus.LOCKED.value
+
+        _, error = PrizeService.unlock_pool(catalog['pool'], admin_id=1)
+        assert error is None
+        assert PrizeCatalog.pool(catalog['pool']).status == PoolStatus.UNLOCKED.value
+        assert catalog['pool'] not in PrizeCatalog._pools
+
+    def test_locked_pool_is_reread_after_ttl(self, app, db_session, catalog, monkeypatch, query_budget):
+        monkeypatch.setattr(PrizeCatalog, 'POOL_TTL', 0)
+        PrizeCatalog.pool(catalog['pool'])
+        with query_budget(max_statements=1) as stats:
+            PrizeCatalog.pool(catalog['pool'])
+        assert stats.statement_count == 1
@@ -0,0 +1,150 @@
+# tests/prize_service/test_prize_sampler.py
+
+import random
+import time
+import pytest
+from collections import Counter
+from decimal import Decimal
+from src.shared import db
+from src.prize_service.models import (
+    Prize, PrizePool, PrizeInstance, InstanceStatus, PoolStatus
+)
+from src.prize_service.services.prize_sampler import AliasTable, PrizeSampler
+from src.prize_service.services.prize_service import PrizeService
+
+# chi-square critical values at p = 0.001
+CHI2_CRITICAL = {4: 18.467, 9: 27.877}
+
+def _chi_square(counts, weights, draws):
+    total = sum(weights)
+    return sum(
+        (counts.get(i, 0) - draws * w / total) ** 2 / (draws * w / total)
+        for i, w in enumerate(weights)
+    )
+
+@pytest.fixture
+def locked_pool(db_session):
+    """Locked pool with instant win instances at 40/30/20/5/5 percent"""
+    prize = Prize(
+        name='Sampler Prize',
+        type='Instant_Win',
+        tier='silver',
+        retail_value=Decimal('10.00'),
+        cash_value=Decimal('8.00'),
+        credit_value=Decimal('9.00'),
+        created_by_id=1
+    )
+    pool = PrizePool(name='Sampler Pool', created_by_id=1)
+    db_session.add_all([prize, pool])
+    db_session.flush()
+
+    odds = [40.0, 30.0, 20.0, 5.0, 5.0]
+    for n, weight in enumerate(odds):
+        db_session.add(PrizeInstance(
+            instance_id=f"{pool.id}-{prize.id}-{n:03d}",
+            pool_id=pool.id,
+            prize_id=prize.id,
+            individual_odds=weight,
+            status=InstanceStatus.AVAILABLE.value,
+            created_by_id=1
+        ))
+    pool.status = PoolStatus.LOCKED.value
+    pool.total_instances = pool.available_instances = len(odds)
+    db_session.flush()
+    PrizeSampler.build_for_pool(pool.id)
+    db_session.commit()
+    return pool.id, odds
+
+class TestAliasTable:
+    def test_distribution_matches_weights(self):
+        weights = [40.0, 30.0, 20.0, 5.0, 5.0]
+        table = AliasTable.build(weights)
+        rng = random.Random(1234)
+        draws = 200_000
+
+        counts = Counter(table.sample(rng) for _ in range(draws))
+
+        assert _chi_square(counts, weights, draws) < CHI2_CRITICAL[len(weights) - 1]
+
+    def test_skewed_weights(self):
+        weights = [0.01, 0.02, 0.5, 1, 2, 5, 10, 20, 30, 31.47]
+        table = AliasTable.build(weights)
+        rng = random.Random(99)
+        draws = 300_000
+
+        counts = Counter(table.sample(rng) for _ in range(draws))
+
+        assert _chi_square(counts, weights, draws) < CHI2_CRITICAL[len(weights) - 1]
+
+    def test_round_trips_through_dict(self):
+        table = AliasTable.build([1, 2, 3])
+        restored = AliasTable.from_dict(table.to_dict())
+        assert restored.prob == table.prob and restored.alias == table.alias
+
+    def test_rejects_empty_weights(self):
+        with pytest.raises(ValueError):
+            AliasTable.build([])
+
+    def test_throughput(self):
+        """O(1) draws: 200k draws over 10k weights well inside a second"""
+        rng = random.Random(7)
+        table = AliasTable.build([rng.random() for _ in range(10_000)])
+
+        start = time.perf_counter()
+        for _ in range(200_000):
+            table.sample(rng)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 2.0, f"{200_000 / elapsed:,.0f} draws/s"
+
+class TestPrizeSampler:
+    def test_table_persisted_on_pool(self, db_session, locked_pool):
+        pool_id, odds = locked_pool
+        pool = db.session.get(PrizePool, pool_id)
+
+        assert pool.alias_version == 1
+        assert pool.alias_table['weights'] == odds
+        assert len(pool.alias_table['prob']) == len(odds)
+
+    def test_draws_follow_odds(self, db_session, locked_pool):
+        pool_id, odds = locked_pool
+        rng = random.Random(42)
+        instance_ids = db.session.get(PrizePool, pool_id).alias_table['instance_ids']
+        draws = 10_000
+
+        counts = Counter()
+        for _ in range(draws):
+            instance_id, error = PrizeSampler.draw(pool_id, rng)
+            assert error is None
+            counts[instance_ids.index(instance_id)] += 1
+
+        assert _chi_square(counts, odds, draws) < CHI2_CRITICAL[len(odds) - 1]
+
+    def test_allocate_consumes_every_instance_once(self, db_session, locked_pool):
+        pool_id, odds = locked_pool
+
+        won = []
+        for ticket in range(len(odds)):
+            allocation, error = PrizeService.allocate_instant_win(pool_id, str(ticket), user_id=1)
+            assert error is None
+            assert allocation.claim_deadline is not None
+            won.append(allocation.instance_identifier)
+        db_session.commit()
+
+        assert len(set(won)) == len(odds)
+        assert PrizeInstance.query.filter_by(
+            pool_id=pool_id, status=InstanceStatus.DISCOVERED.value
+        ).count() == len(odds)
+
+        allocation, error = PrizeService.allocate_instant_win(pool_id, 'extra', user_id=1)
+        assert allocation is None
+        assert error == "No instant win prizes available"
+
+    def test_unlock_clears_table(self, db_session, locked_pool):
+        pool_id, _ = locked_pool
+        PrizeSampler.clear_pool(pool_id)
+        db_session.commit()
+
+        instance_id, error = PrizeSampler.draw(pool_id)
+        assert instance_id is None
+        assert error is not None
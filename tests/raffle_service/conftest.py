@@ -0,0 +1,49 @@
+# tests/raffle_service/conftest.py
+
+from itertools import count
+from types import SimpleNamespace
+import pytest
+from datetime import datetime, timezone, timedelta
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus
+from src.user_service.models import User
+
+@pytest.fixture
+def make_raffle(db_session):
+    """Factory for an active raffle with `tickets` available tickets and its buyers.
+
+    Returns SimpleNamespace(raffle=id, buyer=id, buyers=[ids]); the session
+    is expunged so tests read back what the code under test committed.
+    """
+    serial = count(1)
+
+    def _make(tickets: int = 10, limit: int = 10, credits: float = 0, price: float = 1.0,
+              buyers: int = 1, total_tickets: int = None, title: str = 'Raffle') -> SimpleNamespace:
+        n = next(serial)
+        users = [
+            User(username=f'buyer{n}_{b}', email=f'buyer{n}_{b}@test.com', site_credits=credits)
+            for b in range(buyers)
+        ]
+        db_session.add_all(users)
+        db_session.flush()
+        raffle = Raffle(
+            title=title,
+            total_tickets=total_tickets or tickets,
+            ticket_price=price,
+            start_time=datetime.now(timezone.utc) - timedelta(hours=1),
+            end_time=datetime.now(timezone.utc) + timedelta(days=1),
+            status=RaffleStatus.ACTIVE.value,
+            max_tickets_per_user=limit,
+            created_by_id=users[0].id
+        )
+        db_session.add(raffle)
+        db_session.flush()
+        db_session.add_all([
+            Ticket(raffle_id=raffle.id, ordinal=ordinal, status=TicketStatus.AVAILABLE.value)
+            for ordinal in range(1, tickets + 1)
+        ])
+        db_session.commit()
+        ids = SimpleNamespace(raffle=raffle.id, buyer=users[0].id, buyers=[u.id for u in users])
+        db_session.expunge_all()
+        return ids
+
+    return _make
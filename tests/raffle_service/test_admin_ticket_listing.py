@@ -0,0 +1,103 @@
+# tests/raffle_service/test_admin_ticket_listing.py
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from src.shared import db
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus
+from src.user_service.models import User
+
+@pytest.fixture
+def raffle_with_tickets(db_session):
+    """Raffle with 25 tickets; every 3rd sold to one of two buyers, every 5th an instant win"""
+    buyers = [
+        User(username=f'buyer{n}', email=f'buyer{n}@test.com')
+        for n in range(2)
+    ]
+    for buyer in buyers:
+        buyer.set_password('secret123')
+    raffle = Raffle(
+        title='Listing Raffle',
+        total_tickets=25,
+        ticket_price=1.0,
+        start_time=datetime.now(timezone.utc),
+        end_time=datetime.now(timezone.utc) + timedelta(days=1),
+        status=RaffleStatus.DRAFT.value,
+        max_tickets_per_user=25,
+        created_by_id=1
+    )
+    db_session.add_all(buyers + [raffle])
+    db_session.flush()
+
+    for n in range(25):
+        sold = n % 3 == 0
+        db_session.add(Ticket(
+            raffle_id=raffle.id,
+            ticket_id=f"{raffle.id}-{n + 1:03d}",
+            ticket_number=f"{n + 1:03d}",
+            status=TicketStatus.SOLD.value if sold else TicketStatus.AVAILABLE.value,
+            user_id=buyers[n % 2].id if sold else None,
+            instant_win=n % 5 == 0
+        ))
+    db_session.commit()
+    raffle_id, buyer_id = raffle.id, buyers[0].id
+    db_session.expunge_all()
+    return raffle_id, buyer_id
+
+def _url(raffle_id):
+    return f'/api/admin/raffles/raffles/{raffle_id}/tickets'
+
+class TestAdminTicketListing:
+    def test_keyset_pages_cover_every_ticket(self, client, admin_headers, raffle_with_tickets):
+        raffle_id, _ = raffle_with_tickets
+        seen, after = [], None
+        while True:
+            params = {'limit': 10}
+            if after:
+                params['after'] = after
+            response = client.get(_url(raffle_id), query_string=params, headers=admin_headers)
+            assert response.status_code == 200
+            page = response.get_json()
+            seen.extend(t['id'] for t in page['tickets'])
+            if not page['has_more']:
+                assert page['next_cursor'] is None
+                break
+            after = page['next_cursor']
+
+        assert len(seen) == 25
+        assert seen == sorted(seen)
+
+    def test_filters(self, client, admin_headers, raffle_with_tickets):
+        raffle_id, buyer_id = raffle_with_tickets
+
+        sold = client.get(_url(raffle_id), query_string={'status': 'sold'}, headers=admin_headers).get_json()
+        assert len(sold['tickets']) == 9
+        assert all(t['user'] is not None and t['paid'] is False for t in sold['tickets'])
+
+        mine = client.get(_url(raffle_id), query_string={'user_id': buyer_id}, headers=admin_headers).get_json()
+        assert {t['user']['id'] for t in mine['tickets']} == {buyer_id}
+
+        wins = client.get(_url(raffle_id), query_string={'instant_win': 'true'}, headers=admin_headers).get_json()
+        assert len(wins['tickets']) == 5
+
+    def test_fields_projection(self, client, admin_headers, raffle_with_tickets):
+        raffle_id, _ = raffle_with_tickets
+        response = client.get(
+            _url(raffle_id),
+            query_string={'fields': 'ticket_number,status', 'limit': 3},
+            headers=admin_headers
+        )
+        tickets = response.get_json()['tickets']
+        assert set(tickets[0]) == {'id', 'ticket_number', 'status'}
+
+        bad = client.get(_url(raffle_id), query_string={'fields': 'password_hash'}, headers=admin_headers)
+        assert bad.status_code == 400
+
+    def test_statement_count_independent_of_page_size(self, client, admin_headers, raffle_with_tickets, query_budget):
+        raffle_id, _ = raffle_with_tickets
+        with query_budget(max_statements=4, max_repeats=1) as small:
+            client.get(_url(raffle_id), query_string={'limit': 2}, headers=admin_headers)
+        db.session.expunge_all()
+        with query_budget(max_statements=4, max_repeats=1) as large:
+            client.get(_url(raffle_id), query_string={'limit': 25}, headers=admin_headers)
+
+        assert small.statement_count == large.statement_count
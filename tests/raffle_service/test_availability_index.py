@@ -0,0 +1,120 @@
+# tests/raffle_service/test_availability_index.py
+
+from types import SimpleNamespace
+import pytest
+from datetime import timedelta
+from sqlalchemy import update
+from src.raffle_service.models import Ticket, TicketStatus
+from src.raffle_service.models.ticket_reservation import utcnow
+from src.raffle_service.services.availability_index import AvailabilityIndex, _Bitmap, _PENDING_KEY
+from src.raffle_service.services.reservation_service import ReservationService
+from src.raffle_service.services.ticket_service import TicketService
+
+@pytest.fixture
+def raffle(make_raffle):
+    """An active raffle with 20 available tickets and a buyer"""
+    return make_raffle(tickets=20, limit=20, credits=100)
+
+@pytest.fixture
+def indexed(app):
+    previous = app.config['AVAILABILITY_INDEX_ENABLED']
+    app.config['AVAILABILITY_INDEX_ENABLED'] = True
+    yield
+    app.config['AVAILABILITY_INDEX_ENABLED'] = previous
+
+def _available(db_session, raffle_id):
+    return {t.ordinal for t in db_session.query(Ticket).filter_by(
+        raffle_id=raffle_id, status=TicketStatus.AVAILABLE.value)}
+
+def _indexed(raffle_id):
+    return set(AvailabilityIndex._bitmaps[raffle_id].ordinals())
+
+class TestBitmap:
+    def test_set_and_sample(self):
+        bitmap = _Bitmap()
+        for ordinal in range(1, 101):
+            bitmap.set(ordinal, True)
+        bitmap.set(50, False)
+        bitmap.set(50, False)
+        bitmap.set(5000, False)
+        assert bitmap.count == 99 and 50 not in bitmap and 51 in bitmap
+
+        picked = bitmap.sample(30, exclude={1, 2, 3})
+        assert len(set(picked)) == 30
+        assert all(o in bitmap and o not in (1, 2, 3) for o in picked)
+
+    def test_sparse_and_exhausted(self):
+        bitmap = _Bitmap()
+        for ordinal in (7, 900, 100000):
+            bitmap.set(ordinal, True)
+        assert sorted(bitmap.sample(5)) == [7, 900, 100000]
+        assert bitmap.sample(5, exclude={7, 900, 100000}) == []
+
+class TestAvailabilityIndex:
+    def test_rebuild_streams_available_ordinals(self, app, db_session, raffle, query_budget):
+        db_session.execute(update(Ticket).where(Ticket.ordinal <= 4).values(status=TicketStatus.SOLD.value))
+        db_session.commit()
+        with query_budget(max_statements=1):
+            bitmap = AvailabilityIndex.rebuild(raffle.raffle)
+        assert bitmap.count == 16 and set(bitmap.ordinals()) == set(range(5, 21))
+
+    def test_reservations_follow_commits(self, app, db_session, raffle, indexed):
+        first, error = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 6)
+        assert error is None
+        second, error = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 6)
+        assert error is None
+        assert _indexed(raffle.raffle) == _available(db_session, raffle.raffle)
+        assert len(_indexed(raffle.raffle)) == 8
+
+        ReservationService.release_expired(now=utcnow() + timedelta(minutes=10))
+        assert len(_indexed(raffle.raffle)) == 20
+
+    def test_purchase_recovers_from_stale_bitmap(self, app, db_session, raffle, indexed):
+        AvailabilityIndex.rebuild(raffle.raffle)
+        # Sold by another worker: this process's bitmap never hears of it
+        db_session.execute(update(Ticket).where(Ticket.ordinal <= 15).values(status=TicketStatus.SOLD.value))
+        db_session.commit()
+
+        tickets, error = TicketService.purchase_tickets(raffle.buyer, raffle.raffle, 5)
+        assert error is None
+        assert sorted(t.ordinal for t in tickets) == [16, 17, 18, 19, 20]
+        assert _indexed(raffle.raffle) == set()
+
+        _, error = TicketService.purchase_tickets(raffle.buyer, raffle.raffle, 1)
+        assert error == "Not enough tickets available"
+
+    def test_rollback_discards_pending_changes(self, app, db_session, raffle, indexed):
+        AvailabilityIndex.rebuild(raffle.raffle)
+        ticket = db_session.query(Ticket).filter_by(raffle_id=raffle.raffle, ordinal=3).one()
+        ticket.status = TicketStatus.CANCELLED.value
+        db_session.flush()
+        db_session.rollback()
+        assert 3 in _indexed(raffle.raffle)
+
+        ticket = db_session.query(Ticket).filter_by(raffle_id=raffle.raffle, ordinal=3).one()
+        ticket.status = TicketStatus.CANCELLED.value
+        db_session.commit()
+        assert 3 not in _indexed(raffle.raffle)
+
+    def test_mark_instant_win_eligible_keeps_availability(self, app, db_session, raffle, indexed):
+        AvailabilityIndex.rebuild(raffle.raffle)
+        marked, error = TicketService.mark_instant_win_eligible(raffle.raffle, 4)
+        assert error is None and len(set(marked)) == 4
+        assert db_session.query(Ticket).filter_by(instant_win_eligible=True).count() == 4
+        assert len(_indexed(raffle.raffle)) == 20
+
+    def test_rebuild_replays_commits_made_while_reading(self, app, db_session, raffle, monkeypatch):
+        original_set, committed = _Bitmap.set, []
+
+        def set_and_commit_elsewhere(bitmap, ordinal, available):
+            if not committed:
+                committed.append(ordinal)
+                # Another session sells ticket 5 while the rows stream in
+                AvailabilityIndex._after_commit(SimpleNamespace(info={_PENDING_KEY: [(raffle.raffle, 5, False)]}))
+            original_set(bitmap, ordinal, available)
+        monkeypatch.setattr(_Bitmap, 'set', set_and_commit_elsewhere)
+
+        bitmap = AvailabilityIndex.rebuild(raffle.raffle)
+        assert AvailabilityIndex._bitmaps[raffle.raffle] is bitmap
+        assert 5 not in bitmap and bitmap.count == 19
+        assert not AvailabilityIndex._replays
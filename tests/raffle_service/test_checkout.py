@@ -0,0 +1,67 @@
+# tests/raffle_service/test_checkout.py
+
+from types import SimpleNamespace
+import pytest
+from datetime import timedelta
+from src.shared.auth import create_token
+from src.raffle_service.models import Ticket, TicketStatus, TicketReservation, ReservationStatus
+from src.raffle_service.models.ticket_reservation import utcnow
+from src.raffle_service.services.reservation_service import ReservationService
+from src.raffle_service.services.payment_service import PaymentService
+from src.user_service.models import User, CreditTransaction
+
+@pytest.fixture
+def reservation(db_session, make_raffle):
+    """A 3-ticket reservation at 2.0 each for a buyer holding 10 credits"""
+    ids = make_raffle(tickets=5, limit=5, credits=10, price=2.0)
+    result, _ = ReservationService.create_reservation(ids.buyer, ids.raffle, 3)
+    db_session.expunge_all()
+    return SimpleNamespace(id=result['reservation']['id'], buyer=ids.buyer, raffle=ids.raffle)
+
+class TestCheckout:
+    def test_one_transaction_sells_and_debits(self, app, db_session, reservation, query_budget):
+        with query_budget(max_statements=6) as stats:
+            result, error = PaymentService.checkout(reservation.id, reservation.buyer)
+
+        assert error is None and result['status'] == 'succeeded'
+        assert len(result['tickets']) == 3 and result['balance_after'] == 4.0
+
+        transaction = db_session.query(CreditTransaction).one()
+        sold = db_session.query(Ticket).filter_by(status=TicketStatus.SOLD.value).all()
+        assert len(sold) == 3
+        assert all(t.user_id == reservation.buyer and t.transaction_id == transaction.id for t in sold)
+        assert db_session.get(User, reservation.buyer).site_credits == 4.0
+        assert db_session.get(TicketReservation, reservation.id).status == ReservationStatus.COMPLETED.value
+
+        _, error = PaymentService.checkout(reservation.id, reservation.buyer)
+        assert error == "Cannot check out reservation in completed status"
+
+    def test_insufficient_credits_changes_nothing(self, app, db_session, reservation):
+        db_session.get(User, reservation.buyer).site_credits = 5
+        db_session.commit()
+
+        _, error = PaymentService.checkout(reservation.id, reservation.buyer)
+        assert error.startswith("Insufficient site credits")
+        db_session.expire_all()
+        assert db_session.get(User, reservation.buyer).site_credits == 5
+        assert db_session.query(Ticket).filter_by(status=TicketStatus.RESERVED.value).count() == 3
+        assert db_session.query(CreditTransaction).count() == 0
+
+    def test_released_reservation_is_not_charged(self, app, db_session, reservation):
+        ReservationService.release_expired(now=utcnow() + timedelta(minutes=10))
+        _, error = PaymentService.checkout(reservation.id, reservation.buyer)
+        assert error == "Cannot check out reservation in expired status"
+        assert db_session.get(User, reservation.buyer).site_credits == 10
+
+    def test_other_users_reservation(self, app, db_session, reservation):
+        _, error = PaymentService.checkout(reservation.id, reservation.buyer + 1)
+        assert error == "Not authorized to pay for this reservation"
+
+    def test_checkout_route(self, client, db_session, reservation):
+        headers = {'Authorization': f'Bearer {create_token(reservation.buyer)}'}
+        response = client.post('/api/payments/checkout', json={'reservation_id': reservation.id}, headers=headers)
+        assert response.status_code == 200
+        assert response.get_json()['reservation_id'] == reservation.id
+
+        missing = client.post('/api/payments/checkout', json={}, headers=headers)
+        assert missing.status_code == 400
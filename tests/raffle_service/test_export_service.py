@@ -0,0 +1,123 @@
+# tests/raffle_service/test_export_service.py
+
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus, InstantWin
+from src.prize_service.models import PrizeAllocation, AllocationType
+from src.raffle_service.services.export_service import ExportService, ExportStats
+
+@pytest.fixture
+def raffle_ledger(db_session):
+    raffle = Raffle(
+        title='Export Raffle',
+        total_tickets=30,
+        ticket_price=1.0,
+        start_time=datetime.now(timezone.utc),
+        end_time=datetime.now(timezone.utc) + timedelta(days=1),
+        status=RaffleStatus.DRAFT.value,
+        max_tickets_per_user=30,
+        created_by_id=1
+    )
+    db_session.add(raffle)
+    db_session.flush()
+    tickets = [
+        Ticket(
+            raffle_id=raffle.id,
+            ticket_id=f"{raffle.id}-{n:03d}",
+            ticket_number=f"{n:03d}",
+            status=TicketStatus.AVAILABLE.value
+        )
+        for n in range(1, 31)
+    ]
+    db_session.add_all(tickets)
+    db_session.flush()
+    db_session.add_all([
+        InstantWin(raffle_id=raffle.id, ticket_id=tickets[n].id, prize_reference=str(n))
+        for n in range(3)
+    ])
+    db_session.add(PrizeAllocation(
+        prize_id=1,
+        pool_id=1,
+        allocation_type=AllocationType.RAFFLE_DRAW.value,
+        reference_type='raffle',
+        reference_id=str(raffle.id),
+        sequence_number=1,
+        winner_user_id=1,
+        value_claimed=Decimal('12.50'),
+        created_by_id=1
+    ))
+    db_session.commit()
+    raffle_id = raffle.id
+    db_session.expunge_all()
+    return raffle_id
+
+def _ndjson(body):
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+class TestExportService:
+    def test_ndjson_covers_all_datasets(self, db_session, raffle_ledger):
+        stats = ExportStats()
+        body = b''.join(ExportService.stream(raffle_ledger, stats=stats))
+        rows = _ndjson(body)
+
+        assert [r['dataset'] for r in rows].count('tickets') == 30
+        assert [r['dataset'] for r in rows].count('instant_wins') == 3
+        draw = [r for r in rows if r['dataset'] == 'draws']
+        assert len(draw) == 1 and draw[0]['value_claimed'] == 12.5
+        assert stats.rows == 34
+        assert stats.rows_per_second > 0
+
+    def test_resume_from_cursor(self, db_session, raffle_ledger):
+        full = _ndjson(b''.join(ExportService.stream(raffle_ledger)))
+        resumed = _ndjson(b''.join(ExportService.stream(raffle_ledger, cursor=full[9]['cursor'])))
+
+        assert resumed == full[10:]
+
+    def test_gzip_csv(self, db_session, raffle_ledger):
+        body = b''.join(ExportService.stream(
+            raffle_ledger, fmt='csv', datasets=['tickets'], compress=True
+        ))
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(body).decode())))
+
+        assert len(rows) == 30
+        assert rows[0]['ticket_number'] == '001'
+        assert 'cursor' in rows[0]
+
+    def test_streams_in_bounded_chunks(self, db_session, raffle_ledger, monkeypatch):
+        monkeypatch.setattr(ExportService, 'FLUSH_BYTES', 512)
+        chunks = list(ExportService.stream(raffle_ledger))
+
+        assert len(chunks) > 1
+        assert max(len(c) for c in chunks) < 512 * 2
+
+    def test_validate(self):
+        assert ExportService.validate('xml', ['tickets'])
+        assert ExportService.validate('csv', ['tickets', 'draws'])
+        assert ExportService.validate('ndjson', ['tickets'], cursor='not-a-cursor')
+        assert ExportService.validate('ndjson', ['tickets', 'draws']) is None
+
+class TestExportEndpoint:
+    def test_streaming_response(self, client, admin_headers, raffle_ledger):
+        response = client.get(
+            f'/api/admin/raffles/raffles/{raffle_ledger}/export',
+            query_string={'datasets': 'tickets', 'gzip': 'true'},
+            headers=admin_headers
+        )
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert len(_ndjson(gzip.decompress(response.data))) == 30
+
+    def test_rejects_bad_format(self, client, admin_headers, raffle_ledger):
+        response = client.get(
+            f'/api/admin/raffles/raffles/{raffle_ledger}/export',
+            query_string={'format': 'xml'},
+            headers=admin_headers
+        )
+        assert response.status_code == 400
@@ -0,0 +1,140 @@
+# tests/raffle_service/test_hold_store.py
+
+import time
+from types import SimpleNamespace
+import pytest
+from src.raffle_service.models import (
+    Ticket, TicketStatus, TicketReservation, ReservedTicket, ReservationStatus
+)
+from src.raffle_service.services import hold_store
+from src.raffle_service.services.hold_store import ReservationHoldStore
+from src.raffle_service.services.reservation_service import ReservationService
+from src.raffle_service.services.payment_service import PaymentService
+from src.raffle_service.services.ticket_service import TicketService
+from src.raffle_service.services.purchase_coalescer import PurchaseCoalescer, PurchaseRequest
+
+@pytest.fixture
+def clock(monkeypatch):
+    current = [time.time()]
+    monkeypatch.setattr(hold_store, 'time', SimpleNamespace(
+        time=lambda: current[0], monotonic=lambda: current[0], sleep=time.sleep
+    ))
+    return current
+
+@pytest.fixture
+def store(app, clock):
+    overrides = {'RESERVATION_HOLD_STORE_ENABLED': True, 'HOLD_STORE_WORKER_INDEX': 0, 'HOLD_STORE_WORKER_COUNT': 1}
+    previous = {key: app.config[key] for key in overrides}
+    app.config.update(overrides)
+    ReservationHoldStore.reset()
+    yield
+    app.config.update(previous)
+    ReservationHoldStore.reset()
+
+@pytest.fixture
+def raffle(make_raffle):
+    """An active raffle with 8 available tickets and a buyer with credits"""
+    return make_raffle(tickets=8, limit=8, credits=100)
+
+def _reserve(raffle, quantity):
+    result, error = ReservationService.create_reservation(raffle.buyer, raffle.raffle, quantity)
+    assert error is None
+    return result['reservation']['id']
+
+class TestReservationHoldStore:
+    def test_holds_live_only_in_memory(self, app, db_session, raffle, store):
+        first, second = _reserve(raffle, 3), _reserve(raffle, 3)
+
+        held = [set(ReservationHoldStore.get(r).ticket_ids) for r in (first, second)]
+        assert len(held[0]) == len(held[1]) == 3 and not held[0] & held[1]
+        assert db_session.query(TicketReservation).count() == 0
+        assert db_session.query(ReservedTicket).count() == 0
+        assert db_session.query(Ticket).filter_by(status=TicketStatus.AVAILABLE.value).count() == 8
+
+        _, error = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 3)
+        assert error == "Not enough tickets available"
+
+    def test_lapsed_holds_return_their_tickets(self, app, db_session, raffle, store, clock):
+        abandoned = _reserve(raffle, 8)
+        clock[0] += 600
+        assert ReservationHoldStore.get(abandoned) is None
+
+        clock[0] -= 600   # new reservations expire from the real clock
+        assert len(ReservationHoldStore.get(_reserve(raffle, 8)).ticket_ids) == 8
+
+    def test_worker_only_holds_its_shard(self, app, db_session, raffle, store):
+        app.config.update(HOLD_STORE_WORKER_INDEX=1, HOLD_STORE_WORKER_COUNT=2)
+        hold = ReservationHoldStore.get(_reserve(raffle, 4))
+        assert all(ticket_id % 2 == 1 for ticket_id in hold.ticket_ids)
+        _, error = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 1)
+        assert error == "Not enough tickets available"
+
+    def test_payment_materializes_then_confirms(self, app, db_session, raffle, store):
+        reservation_id = _reserve(raffle, 2)
+        ticket_ids = set(ReservationHoldStore.get(reservation_id).ticket_ids)
+
+        intent, error = PaymentService.create_payment_intent(reservation_id, raffle.buyer)
+        assert error is None and intent['status'] == 'succeeded'
+        assert ReservationHoldStore.get(reservation_id) is None
+        reservation = db_session.get(TicketReservation, reservation_id)
+        assert reservation.status == ReservationStatus.CONFIRMED.value
+
+        confirmed, error = PaymentService.confirm_payment(f"pi_{reservation_id}", raffle.buyer)
+        assert error is None
+        sold = db_session.query(Ticket).filter_by(status=TicketStatus.SOLD.value).all()
+        assert {t.id for t in sold} == ticket_ids
+
+    def test_materialize_detects_tickets_sold_meanwhile(self, app, db_session, raffle, store):
+        reservation_id = _reserve(raffle, 2)
+        taken = db_session.get(Ticket, ReservationHoldStore.get(reservation_id).ticket_ids[0])
+        taken.status = TicketStatus.SOLD.value
+        db_session.commit()
+
+        _, error = PaymentService.create_payment_intent(reservation_id, raffle.buyer)
+        assert error == "Reserved tickets are no longer available"
+        assert db_session.query(TicketReservation).count() == 0
+
+    def test_snapshot_round_trip(self, app, db_session, raffle, store, clock, tmp_path):
+        kept, lapsing = _reserve(raffle, 2), _reserve(raffle, 2)
+        ReservationHoldStore._holds[lapsing].expires_at = clock[0] + 1
+        path = tmp_path / 'holds-0.json'
+
+        assert ReservationHoldStore.snapshot(path) is True
+        assert ReservationHoldStore.snapshot(path) is False   # unchanged since
+
+        ReservationHoldStore.reset()
+        clock[0] += 5
+        assert ReservationHoldStore.recover(path) == 1
+        assert ReservationHoldStore.get(kept) is not None
+        # The recovered hold's tickets are excluded when the shard reloads
+        other = ReservationHoldStore.get(_reserve(raffle, 6))
+        assert not set(other.ticket_ids) & set(ReservationHoldStore.get(kept).ticket_ids)
+
+    def test_only_the_holder_can_materialize(self, app, db_session, raffle, store):
+        reservation_id = _reserve(raffle, 2)
+        assert ReservationHoldStore.materialize(reservation_id, raffle.buyer + 1) == \
+            "Not authorized to pay for this reservation"
+        assert ReservationHoldStore.get(reservation_id) is not None
+        assert db_session.query(TicketReservation).count() == 0
+
+    def test_failed_materialize_returns_remaining_tickets(self, app, db_session, raffle, store):
+        reservation_id = _reserve(raffle, 8)
+        held = ReservationHoldStore.get(reservation_id).ticket_ids
+        db_session.get(Ticket, held[0]).status = TicketStatus.SOLD.value
+        db_session.commit()
+
+        assert ReservationHoldStore.materialize(reservation_id, raffle.buyer) == \
+            "Reserved tickets are no longer available"
+        assert ReservationHoldStore.get(reservation_id) is None
+        assert set(ReservationHoldStore.get(_reserve(raffle, 7)).ticket_ids) == set(held[1:])
+
+    def test_direct_purchases_skip_held_tickets(self, app, db_session, raffle, store):
+        held = set(ReservationHoldStore.get(_reserve(raffle, 5)).ticket_ids)
+
+        tickets, error = TicketService.purchase_tickets(raffle.buyer, raffle.raffle, 3)
+        assert error is None and not {t.id for t in tickets} & held
+        _, error = TicketService.purchase_tickets(raffle.buyer, raffle.raffle, 1)
+        assert error == "Not enough tickets available"
+        request = PurchaseRequest(raffle.buyer, 1)
+        PurchaseCoalescer.process_batch(raffle.raffle, [request])
+        assert request.error == "Not enough tickets available"
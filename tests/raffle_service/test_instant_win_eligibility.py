@@ -0,0 +1,70 @@
+# tests/raffle_service/test_instant_win_eligibility.py
+
+import random
+import pytest
+from sqlalchemy import update
+from src.raffle_service.models import Raffle, Ticket, TicketStatus
+from src.raffle_service.services.raffle_service import RaffleService
+from src.raffle_service.services.ticket_service import TicketService, sample_ordinals
+from src.prize_service.models import PrizePool, PoolStatus
+
+@pytest.fixture
+def raffle(db_session, make_raffle):
+    """An active 1,200-ticket raffle backed by a locked prize pool"""
+    ids = make_raffle(tickets=0, total_tickets=1200)
+    pool = PrizePool(name='Eligibility Pool', created_by_id=ids.buyer, status=PoolStatus.LOCKED.value)
+    db_session.add(pool)
+    db_session.flush()
+    db_session.get(Raffle, ids.raffle).prize_pool_id = pool.id
+    db_session.commit()
+    ids.pool = pool.id
+    db_session.expunge_all()
+    return ids
+
+def _eligible(db_session, raffle_id):
+    return {t.ordinal for t in db_session.query(Ticket).filter_by(raffle_id=raffle_id, instant_win_eligible=True)}
+
+class TestInstantWinEligibility:
+    def test_sample_ordinals(self):
+        assert sample_ordinals(random.Random(3), 50, 10) == sample_ordinals(random.Random(3), 50, 10)
+        picked = sample_ordinals(random.Random(), 50, 10, exclude=set(range(1, 20)))
+        assert len(set(picked)) == 10 and all(20 <= o <= 50 for o in picked)
+        assert sorted(sample_ordinals(random.Random(), 50, 10, exclude=set(range(1, 46)))) == [46, 47, 48, 49, 50]
+
+    def test_generation_flags_sampled_tickets(self, app, db_session, raffle, query_budget):
+        with query_budget(max_statements=3):
+            assert RaffleService._generate_tickets(raffle.raffle, 1200, 25, raffle.pool, seed=7)
+        flagged = _eligible(db_session, raffle.raffle)
+        assert flagged == set(sample_ordinals(random.Random(7), 1200, 25))
+        assert db_session.query(Ticket).filter_by(instant_win=True).count() == 25
+
+    def test_generation_refuses_unlocked_pool(self, app, db_session, raffle):
+        db_session.get(PrizePool, raffle.pool).status = PoolStatus.UNLOCKED.value
+        db_session.commit()
+        assert not RaffleService._generate_tickets(raffle.raffle, 1200, 25, raffle.pool)
+        db_session.rollback()
+        assert db_session.query(Ticket).count() == 0
+
+    def test_marking_never_reads_inventory(self, app, db_session, raffle, query_budget):
+        assert RaffleService._generate_tickets(raffle.raffle, 1200)
+        with query_budget(max_statements=5) as stats:
+            marked, error = TicketService.mark_instant_win_eligible(raffle.raffle, 600, seed=1)
+        assert error is None and len(marked) == 600
+        assert not any(shape.lower().startswith('select') and 'from tickets' in shape.lower()
+                       for shape in stats.shapes)
+        assert _eligible(db_session, raffle.raffle) == set(marked)
+
+    def test_marking_tops_up_around_taken_tickets(self, app, db_session, raffle):
+        assert RaffleService._generate_tickets(raffle.raffle, 1200)
+        db_session.execute(update(Ticket).where(Ticket.ordinal <= 900).values(status=TicketStatus.SOLD.value))
+        db_session.execute(update(Ticket).where(Ticket.ordinal > 1100).values(instant_win_eligible=True))
+        db_session.commit()
+
+        marked, error = TicketService.mark_instant_win_eligible(raffle.raffle, 150, seed=2)
+        assert error is None and len(marked) == 150
+        assert all(900 < o <= 1100 for o in marked)
+        assert len(_eligible(db_session, raffle.raffle)) == 250
+
+        _, error = TicketService.mark_instant_win_eligible(raffle.raffle, 51)
+        assert error == "Not enough available tickets. Found 50, needed 51"
+        assert len(_eligible(db_session, raffle.raffle)) == 250
@@ -0,0 +1,111 @@
+# tests/raffle_service/test_purchase_coalescer.py
+
+import threading
+import pytest
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus, UserRaffleStats
+from src.raffle_service.services.purchase_coalescer import PurchaseCoalescer, PurchaseRequest, _RaffleWorker
+from src.raffle_service.services.ticket_service import TicketService
+from src.user_service.models import User
+
+@pytest.fixture
+def raffle(db_session, make_raffle):
+    """An active raffle with 12 available tickets and three buyers, the first holding 2"""
+    ids = make_raffle(tickets=12, limit=5, buyers=3)
+    db_session.add(UserRaffleStats(user_id=ids.buyers[0], raffle_id=ids.raffle, tickets_purchased=2))
+    db_session.commit()
+    return ids
+
+@pytest.fixture
+def coalescing(app):
+    overrides = {'PURCHASE_COALESCING_ENABLED': True, 'PURCHASE_COALESCE_WINDOW_MS': 20}
+    previous = {key: app.config[key] for key in overrides}
+    app.config.update(overrides)
+    yield
+    app.config.update(previous)
+
+def _purchased(db_session, raffle_id, user_id):
+    return db_session.query(UserRaffleStats).filter_by(raffle_id=raffle_id, user_id=user_id).one().tickets_purchased
+
+class TestPurchaseCoalescer:
+    def test_batch_serves_each_caller_individually(self, app, db_session, raffle, query_budget):
+        first, second, third = raffle.buyers
+        requests = [
+            PurchaseRequest(first, 2, transaction_id=11),
+            PurchaseRequest(second, 3, transaction_id=12),
+            PurchaseRequest(first, 2),    # would take the first buyer past 5
+            PurchaseRequest(third, 4),
+        ]
+        # Per request: a savepoint, the limit claim and one ticket UPDATE
+        with query_budget(max_statements=30, max_repeats=len(requests)):
+            PurchaseCoalescer.process_batch(raffle.raffle, requests)
+
+        assert all(r.done.is_set() for r in requests)
+        assert [len(r.ticket_ids or []) for r in requests] == [2, 3, 0, 4]
+        assert 'exceed limit' in requests[2].error
+        assert len({t for r in requests for t in (r.ticket_ids or [])}) == 9
+
+        sold = db_session.query(Ticket).filter_by(raffle_id=raffle.raffle, status=TicketStatus.SOLD.value).all()
+        owners = {t.id: (t.user_id, t.transaction_id) for t in sold}
+        assert all(owners[t] == (second, 12) for t in requests[1].ticket_ids)
+        assert _purchased(db_session, raffle.raffle, first) == 4
+        assert _purchased(db_session, raffle.raffle, third) == 4
+
+    def test_short_supply_fails_only_the_unserved(self, app, db_session, raffle):
+        first, second, third = raffle.buyers
+        requests = [PurchaseRequest(second, 5), PurchaseRequest(third, 5), PurchaseRequest(first, 2)]
+        PurchaseCoalescer.process_batch(raffle.raffle, requests)
+
+        assert [len(r.ticket_ids or []) for r in requests] == [5, 5, 2]
+        more = [PurchaseRequest(first, 1)]
+        PurchaseCoalescer.process_batch(raffle.raffle, more)
+        assert more[0].error == "Not enough tickets available"
+        assert _purchased(db_session, raffle.raffle, first) == 4
+
+    def test_unknown_raffle(self, app, db_session):
+        request = PurchaseRequest(1, 1)
+        PurchaseCoalescer.process_batch(999, [request])
+        assert request.error == "Raffle not found"
+
+    def test_concurrent_callers_share_a_worker(self, app, db_session, raffle, coalescing):
+        results = {}
+
+        def buy(user_id):
+            with app.app_context():
+                tickets, error = TicketService.purchase_tickets(user_id, raffle.raffle, 3)
+                results[user_id] = ([t.id for t in tickets] if tickets else None, error)
+
+        threads = [threading.Thread(target=buy, args=(uid,)) for uid in raffle.buyers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert all(error is None for _, error in results.values())
+        assert len({t for ids, _ in results.values() for t in ids}) == 9
+        assert _purchased(db_session, raffle.raffle, raffle.buyers[0]) == 5
+
+    def test_tier_multiplier_and_raffle_status(self, app, db_session, raffle, monkeypatch):
+        first, second, _ = raffle.buyers
+        monkeypatch.setattr(User, 'tier_benefits', property(lambda self: {'purchase_limit_multiplier': 2.0}))
+        requests = [PurchaseRequest(second, 7)]
+        PurchaseCoalescer.process_batch(raffle.raffle, requests)
+        assert requests[0].error is None and len(requests[0].ticket_ids) == 7
+
+        db_session.get(Raffle, raffle.raffle).status = RaffleStatus.INACTIVE.value
+        db_session.commit()
+        closed = [PurchaseRequest(first, 1)]
+        PurchaseCoalescer.process_batch(raffle.raffle, closed)
+        assert closed[0].error == f"Cannot purchase tickets for raffle in {RaffleStatus.INACTIVE.value} status"
+
+    def test_timed_out_request_is_withdrawn(self, app, db_session, raffle):
+        worker = _RaffleWorker(app, raffle.raffle, window=0, max_batch=10, idle_timeout=0)
+        waiting, taken = PurchaseRequest(raffle.buyers[0], 1), PurchaseRequest(raffle.buyers[1], 1)
+        worker.submit(taken)
+        assert worker._take_batch() == [taken]
+        worker.submit(waiting)
+
+        assert worker.cancel(waiting) and not worker.queue
+        assert not worker.cancel(taken)
+        worker.submit(PurchaseRequest(raffle.buyers[2], 1))
+        worker.queue.appendleft(waiting)
+        assert [r.user_id for r in worker._take_batch()] == [raffle.buyers[2]]
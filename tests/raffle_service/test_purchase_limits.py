@@ -0,0 +1,53 @@
+# tests/raffle_service/test_purchase_limits.py
+
+import pytest
+from src.raffle_service.models import Ticket, TicketStatus, UserRaffleStats
+from src.raffle_service.services.purchase_limit_service import PurchaseLimitService
+from src.raffle_service.services.ticket_service import TicketService
+from src.user_service.models import User
+
+@pytest.fixture
+def raffle(make_raffle):
+    """An active raffle with 10 available tickets and a limit of 4 per user"""
+    return make_raffle(tickets=10, limit=4)
+
+def _purchased(db_session, raffle):
+    stats = db_session.query(UserRaffleStats).filter_by(user_id=raffle.buyer, raffle_id=raffle.raffle).first()
+    return stats.tickets_purchased if stats else None
+
+class TestPurchaseLimits:
+    def test_claim_checks_and_increments_in_one_statement(self, app, db_session, raffle, query_budget):
+        with query_budget(max_statements=4):
+            total, error = PurchaseLimitService.claim_purchase(raffle.buyer, raffle.raffle, 3)
+        assert (total, error) == (3, None)
+
+        total, error = PurchaseLimitService.claim_purchase(raffle.buyer, raffle.raffle, 2)
+        assert total is None
+        assert error == "Purchase would exceed limit of 4 tickets per user for this raffle. You currently have 3 tickets."
+        assert PurchaseLimitService.claim_purchase(raffle.buyer, raffle.raffle, 1) == (4, None)
+        db_session.commit()
+        assert _purchased(db_session, raffle) == 4
+
+    def test_rejected_first_claim_writes_nothing(self, app, db_session, raffle):
+        _, error = PurchaseLimitService.claim_purchase(raffle.buyer, raffle.raffle, 5)
+        assert error.startswith("Purchase would exceed limit of 4")
+        assert _purchased(db_session, raffle) is None
+
+    def test_check_is_read_only(self, app, db_session, raffle):
+        assert PurchaseLimitService.check_purchase_limit(raffle.buyer, raffle.raffle, 2) == (True, None)
+        assert db_session.query(UserRaffleStats).count() == 0
+
+    def test_tier_multiplier_raises_limit(self, app, db_session, raffle, monkeypatch):
+        monkeypatch.setattr(User, 'tier_benefits', property(lambda self: {'purchase_limit_multiplier': 1.5}))
+        assert PurchaseLimitService.check_purchase_limit(raffle.buyer, raffle.raffle, 6) == (True, None)
+        assert PurchaseLimitService.claim_purchase(raffle.buyer, raffle.raffle, 6) == (6, None)
+
+    def test_purchase_counts_once(self, app, db_session, raffle):
+        tickets, error = TicketService.purchase_tickets(raffle.buyer, raffle.raffle, 3)
+        assert error is None and len(tickets) == 3
+        _, error = TicketService.purchase_tickets(raffle.buyer, raffle.raffle, 2)
+        assert error.startswith("Purchase would exceed limit")
+
+        db_session.expire_all()
+        assert _purchased(db_session, raffle) == 3
+        assert db_session.query(Ticket).filter_by(status=TicketStatus.SOLD.value).count() == 3
@@ -0,0 +1,104 @@
+# tests/raffle_service/test_reservation_holds.py
+
+import pytest
+from datetime import timedelta
+from src.raffle_service.models import (
+    Ticket, TicketStatus, TicketReservation, ReservedTicket, ReservationStatus
+)
+from src.raffle_service.models.ticket_reservation import utcnow
+from src.raffle_service.services.reservation_service import ReservationService
+from src.raffle_service.services.payment_service import PaymentService
+
+@pytest.fixture
+def raffle(make_raffle):
+    """An active raffle with 10 available tickets and a buyer with credits"""
+    return make_raffle(tickets=10, limit=10, credits=100, price=2.0)
+
+def _held(db_session, reservation_id):
+    return {t.id for t in db_session.query(Ticket).filter_by(reservation_id=reservation_id,
+                                                             status=TicketStatus.RESERVED.value)}
+
+class TestReservationHolds:
+    def test_reservations_hold_disjoint_tickets(self, app, db_session, raffle, query_budget):
+        with query_budget(max_statements=10):
+            first, error = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 4)
+        assert error is None
+        second, error = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 4)
+        assert error is None
+
+        held_first = _held(db_session, first['reservation']['id'])
+        held_second = _held(db_session, second['reservation']['id'])
+        assert len(held_first) == len(held_second) == 4
+        assert not held_first & held_second
+        assert db_session.query(ReservedTicket).count() == 8
+
+        _, error = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 3)
+        assert error == "Not enough tickets available"
+        assert db_session.query(Ticket).filter_by(status=TicketStatus.AVAILABLE.value).count() == 2
+        assert db_session.query(TicketReservation).count() == 2
+
+    def test_is_expired_in_python_and_sql(self, app, db_session, raffle):
+        result, _ = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 1)
+        reservation = db_session.get(TicketReservation, result['reservation']['id'])
+
+        assert reservation.expires_at.tzinfo is None
+        assert not reservation.is_expired()
+        later = utcnow() + timedelta(minutes=10)
+        assert reservation.is_expired(later)
+        assert db_session.query(TicketReservation).filter(TicketReservation.is_expired(later)).count() == 1
+        assert db_session.query(TicketReservation).filter(TicketReservation.is_expired()).count() == 0
+
+    def test_sweeper_releases_lapsed_holds_in_chunks(self, app, db_session, raffle):
+        ids = [ReservationService.create_reservation(raffle.buyer, raffle.raffle, 2)[0]['reservation']['id']
+               for _ in range(4)]
+        paid = db_session.get(TicketReservation, ids[0])
+        paid.status = ReservationStatus.CONFIRMED.value
+        db_session.commit()
+
+        released, error = ReservationService.release_expired(now=utcnow() + timedelta(minutes=10), chunk_size=2)
+        assert (released, error) == (3, None)
+
+        db_session.expire_all()
+        statuses = {r.id: r.status for r in db_session.query(TicketReservation)}
+        assert statuses[ids[0]] == ReservationStatus.CONFIRMED.value
+        assert all(statuses[i] == ReservationStatus.EXPIRED.value for i in ids[1:])
+        assert len(_held(db_session, ids[0])) == 2
+        assert db_session.query(Ticket).filter_by(status=TicketStatus.AVAILABLE.value).count() == 8
+
+        assert ReservationService.release_expired(now=utcnow() + timedelta(minutes=10)) == (0, None)
+
+    def test_confirm_refuses_released_reservation(self, app, db_session, raffle):
+        result, _ = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 2)
+        reservation_id = result['reservation']['id']
+        ReservationService.release_expired(now=utcnow() + timedelta(minutes=10))
+
+        _, error = PaymentService.confirm_payment(f"pi_{reservation_id}", raffle.buyer)
+        assert error == "Reservation has expired"
+
+    def test_confirm_sells_held_tickets(self, app, db_session, raffle):
+        result, _ = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 3)
+        reservation_id = result['reservation']['id']
+
+        confirmed, error = PaymentService.confirm_payment(f"pi_{reservation_id}", raffle.buyer)
+        assert error is None and len(confirmed['tickets']) == 3
+        sold = db_session.query(Ticket).filter_by(reservation_id=reservation_id).all()
+        assert {t.status for t in sold} == {TicketStatus.SOLD.value}
+        assert all(t.reserved_until is None and t.user_id == raffle.buyer for t in sold)
+
+    def test_confirm_is_one_bulk_update(self, app, db_session, raffle, query_budget):
+        result, _ = ReservationService.create_reservation(raffle.buyer, raffle.raffle, 6)
+        reservation_id = result['reservation']['id']
+
+        with query_budget(max_statements=4, max_repeats=1):
+            confirmed, error = PaymentService.confirm_payment(f"pi_{reservation_id}", raffle.buyer)
+        assert error is None
+        assert sorted(t['ticket_number'] for t in confirmed['tickets']) == sorted(
+            t.ticket_number for t in db_session.query(Ticket).filter_by(reservation_id=reservation_id)
+        )
+
+    def test_bulk_reveal_applies_listener_side_effects(self, app, db_session, raffle):
+        rows = Ticket.bulk_set_status([Ticket.raffle_id == raffle.raffle, Ticket.id <= 3], TicketStatus.REVEALED.value)
+        db_session.commit()
+        assert len(rows) == 3
+        revealed = db_session.query(Ticket).filter_by(status=TicketStatus.REVEALED.value).all()
+        assert all(t.reveal_time is not None for t in revealed)
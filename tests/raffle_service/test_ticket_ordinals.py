@@ -0,0 +1,76 @@
+# tests/raffle_service/test_ticket_ordinals.py
+
+from types import SimpleNamespace
+import pytest
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import select
+from src.shared.auth import create_token
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus
+from src.raffle_service.services.raffle_service import RaffleService
+from src.raffle_service.services.ticket_service import TicketService
+from src.user_service.models import User
+
+@pytest.fixture
+def raffle(db_session):
+    """An active raffle with 1,005 generated tickets, 3 of them sold to a buyer"""
+    buyer = User(username='counter', email='counter@test.com')
+    db_session.add(buyer)
+    db_session.flush()
+    raffle = Raffle(
+        title='Big',
+        total_tickets=1005,
+        ticket_price=1.0,
+        start_time=datetime.now(timezone.utc) - timedelta(hours=1),
+        end_time=datetime.now(timezone.utc) + timedelta(days=1),
+        status=RaffleStatus.ACTIVE.value,
+        max_tickets_per_user=10,
+        created_by_id=buyer.id
+    )
+    db_session.add(raffle)
+    db_session.commit()
+    assert RaffleService._generate_tickets(raffle.id, 1005)
+    for ticket in Ticket.query.filter(Ticket.raffle_id == raffle.id, Ticket.ordinal.in_([7, 999, 1005])):
+        ticket.status = TicketStatus.SOLD.value
+        ticket.user_id = buyer.id
+    db_session.commit()
+    ids = SimpleNamespace(raffle=raffle.id, buyer=buyer.id)
+    db_session.expunge_all()
+    return ids
+
+class TestTicketOrdinals:
+    def test_display_ids_are_derived(self, app, db_session, raffle):
+        ticket, error = TicketService.get_ticket_by_number(raffle.raffle, '1005')
+        assert error is None
+        assert (ticket.ordinal, ticket.ticket_number, ticket.ticket_id) == (1005, '1005', f'{raffle.raffle}-1005')
+
+        padded, _ = TicketService.get_ticket_by_number(raffle.raffle, '007')
+        assert padded.to_dict()['ticket_id'] == f'{raffle.raffle}-007'
+        assert TicketService.get_ticket_by_number(raffle.raffle, 'abc') == (None, "Ticket not found")
+
+    def test_sql_expressions_match_python(self, app, db_session, raffle):
+        rows = db_session.execute(
+            select(Ticket.ordinal, Ticket.ticket_id, Ticket.ticket_number)
+            .where(Ticket.ordinal.in_([1, 42, 999, 1005]))
+        ).all()
+        assert [(row.ticket_id, row.ticket_number) for row in rows] == [
+            (f'{raffle.raffle}-{n:03d}', f'{n:03d}') for n in (1, 42, 999, 1005)
+        ]
+        assert db_session.query(Ticket).filter(Ticket.ticket_id == f'{raffle.raffle}-042').one().ordinal == 42
+
+    def test_legacy_string_constructor(self, app, db_session, raffle):
+        ticket = Ticket(ticket_id='12-034', ticket_number='034')
+        assert (ticket.raffle_id, ticket.ordinal) == (12, 34)
+        with pytest.raises(ValueError):
+            Ticket(raffle_id=1, ticket_number='x1')
+
+    def test_reveal_by_string_ids(self, app, db_session, raffle):
+        ids = [f'{raffle.raffle}-007', f'{raffle.raffle}-1005', 'bogus', f'{raffle.raffle}-008']
+        revealed, error = TicketService.reveal_tickets(raffle.buyer, ids)
+        assert error is None
+        assert sorted(t.ordinal for t in revealed) == [7, 1005]
+
+    def test_ticket_route_accepts_padded_number(self, client, db_session, raffle):
+        headers = {'Authorization': f'Bearer {create_token(raffle.buyer)}'}
+        response = client.get(f'/api/tickets/api/raffles/{raffle.raffle}/tickets/007', headers=headers)
+        assert response.status_code == 200
+        assert response.get_json()['ticketNumber'] == '007'
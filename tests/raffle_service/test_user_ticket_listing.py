@@ -0,0 +1,94 @@
+# tests/raffle_service/test_user_ticket_listing.py
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from src.shared import db
+from src.shared.auth import create_token
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus
+from src.user_service.models import User
+
+URL = '/api/tickets/api/raffles/tickets'
+
+@pytest.fixture
+def player(db_session):
+    user = User(username='player', email='player@test.com')
+    user.set_password('secret123')
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+@pytest.fixture
+def player_headers(app, player):
+    return {'Authorization': f'Bearer {create_token(player)}'}
+
+def _buy(db_session, user_id, raffle_count, tickets_per_raffle):
+    for r in range(raffle_count):
+        raffle = Raffle(
+            title=f'Raffle {r}',
+            total_tickets=tickets_per_raffle,
+            ticket_price=1.0,
+            start_time=datetime.now(timezone.utc),
+            end_time=datetime.now(timezone.utc) + timedelta(days=1),
+            status=RaffleStatus.ACTIVE.value,
+            max_tickets_per_user=tickets_per_raffle,
+            created_by_id=1
+        )
+        db_session.add(raffle)
+        db_session.flush()
+        db_session.add_all([
+            Ticket(
+                raffle_id=raffle.id,
+                ticket_id=f"{raffle.id}-{n:03d}",
+                ticket_number=f"{n:03d}",
+                status=TicketStatus.SOLD.value,
+                user_id=user_id,
+                instant_win=n == 1
+            )
+            for n in range(1, tickets_per_raffle + 1)
+        ])
+    db_session.commit()
+    db_session.expunge_all()
+
+class TestUserTicketListing:
+    def test_grouped_by_raffle(self, client, db_session, player, player_headers):
+        _buy(db_session, player, raffle_count=3, tickets_per_raffle=4)
+
+        page = client.get(URL, headers=player_headers).get_json()
+
+        assert [g['raffleTitle'] for g in page['raffles']] == ['Raffle 0', 'Raffle 1', 'Raffle 2']
+        assert all(g['ticketCount'] == 4 and len(g['tickets']) == 4 for g in page['raffles'])
+        assert page['raffles'][0]['instantWinCount'] == 1
+        assert page['has_more'] is False
+
+    def test_paginates_raffles(self, client, db_session, player, player_headers):
+        _buy(db_session, player, raffle_count=3, tickets_per_raffle=2)
+
+        first = client.get(URL, query_string={'limit': 2}, headers=player_headers).get_json()
+        assert len(first['raffles']) == 2 and first['has_more']
+
+        second = client.get(
+            URL, query_string={'limit': 2, 'after': first['next_cursor']}, headers=player_headers
+        ).get_json()
+        assert [g['raffleTitle'] for g in second['raffles']] == ['Raffle 2']
+        assert second['next_cursor'] is None
+
+    def test_summary_mode(self, client, db_session, player, player_headers):
+        _buy(db_session, player, raffle_count=2, tickets_per_raffle=3)
+
+        page = client.get(URL, query_string={'summary': 'true'}, headers=player_headers).get_json()
+
+        assert [g['ticketCount'] for g in page['raffles']] == [3, 3]
+        assert all('tickets' not in g for g in page['raffles'])
+
+    def test_constant_statement_count(self, client, db_session, player, player_headers, query_budget):
+        _buy(db_session, player, raffle_count=1, tickets_per_raffle=2)
+        with query_budget(max_statements=5, max_repeats=1) as few:
+            client.get(URL, headers=player_headers)
+        db.session.expunge_all()
+
+        _buy(db_session, player, raffle_count=10, tickets_per_raffle=20)
+        with query_budget(max_statements=5, max_repeats=1) as many:
+            response = client.get(URL, headers=player_headers)
+
+        assert sum(g['ticketCount'] for g in response.get_json()['raffles']) == 202
+        assert few.statement_count == many.statement_count
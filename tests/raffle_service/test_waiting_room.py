@@ -0,0 +1,174 @@
+# tests/raffle_service/test_waiting_room.py
+
+import heapq
+import time
+from collections import Counter
+from types import SimpleNamespace
+import pytest
+from datetime import datetime, timezone, timedelta
+from src.shared.auth import create_token
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus
+from src.raffle_service.services import waiting_room
+from src.raffle_service.services.waiting_room import WaitingRoomService, QUEUE_TOKEN_HEADER
+from src.user_service.models import User
+
+RATE = 10
+BURST = 5
+
+@pytest.fixture
+def clock(monkeypatch):
+    current = [time.time()]
+    monkeypatch.setattr(waiting_room, 'time', SimpleNamespace(time=lambda: current[0]))
+    return current
+
+@pytest.fixture
+def room(app, clock):
+    overrides = {
+        'WAITING_ROOM_ENABLED': True,
+        'WAITING_ROOM_ADMIT_RATE': RATE,
+        'WAITING_ROOM_BURST': BURST,
+        'WAITING_ROOM_LAUNCH_WINDOW': 900,
+    }
+    previous = {key: app.config[key] for key in overrides}
+    app.config.update(overrides)
+    WaitingRoomService.reset()
+    yield
+    app.config.update(previous)
+    WaitingRoomService.reset()
+
+@pytest.fixture
+def launch(db_session):
+    """An active raffle that started just now, plus a buyer with credits"""
+    buyer = User(username='buyer', email='buyer@test.com', site_credits=100)
+    db_session.add(buyer)
+    db_session.flush()
+    raffle = Raffle(
+        title='Launch',
+        total_tickets=20,
+        ticket_price=1.0,
+        start_time=datetime.now(timezone.utc) - timedelta(seconds=1),
+        end_time=datetime.now(timezone.utc) + timedelta(days=1),
+        status=RaffleStatus.ACTIVE.value,
+        max_tickets_per_user=10,
+        created_by_id=buyer.id
+    )
+    db_session.add(raffle)
+    db_session.flush()
+    db_session.add_all([
+        Ticket(raffle_id=raffle.id, ticket_id=f"{raffle.id}-{n:03d}", ticket_number=f"{n:03d}",
+               status=TicketStatus.AVAILABLE.value)
+        for n in range(1, 21)
+    ])
+    db_session.commit()
+    ids = SimpleNamespace(raffle=raffle.id, buyer=buyer.id)
+    db_session.expunge_all()
+    return ids
+
+def _headers(user_id, queue_token=None):
+    headers = {'Authorization': f'Bearer {create_token(user_id)}'}
+    if queue_token:
+        headers[QUEUE_TOKEN_HEADER] = queue_token
+    return headers
+
+class TestWaitingRoom:
+    def test_positions_and_rejoin(self, app, room, launch):
+        with app.test_request_context():
+            first, _ = WaitingRoomService.join(launch.raffle, 1)
+            second, _ = WaitingRoomService.join(launch.raffle, 2)
+            again, _ = WaitingRoomService.join(launch.raffle, 1)
+
+        assert (first['position'], second['position']) == (1, 2)
+        assert again['position'] == 1 and again['queue_token'] == first['queue_token']
+
+    def test_rejoin_after_admission_lapsed(self, app, room, launch, clock):
+        ttl = app.config['WAITING_ROOM_ADMISSION_TTL']
+        real_now = clock[0]
+        clock[0] = real_now - 2 * ttl   # admitted long ago
+        with app.test_request_context():
+            stale, _ = WaitingRoomService.join(launch.raffle, launch.buyer)
+            clock[0] = real_now
+            assert WaitingRoomService.check_admission(launch.raffle, launch.buyer, stale['queue_token'])[1] == 403
+
+            again, _ = WaitingRoomService.join(launch.raffle, launch.buyer)
+            assert again['position'] == stale['position'] and again['admitted']
+            assert WaitingRoomService.check_admission(launch.raffle, launch.buyer, again['queue_token']) is None
+
+    def test_purchase_requires_admitted_token(self, app, client, room, launch, clock):
+        url = f'/api/tickets/api/raffles/{launch.raffle}/tickets'
+        body = {'quantity': 1}
+        with app.test_request_context():
+            for filler in range(1000, 1000 + BURST + 1):
+                WaitingRoomService.join(launch.raffle, filler)
+
+        assert client.post(url, json=body, headers=_headers(launch.buyer)).status_code == 403
+
+        joined = client.post(f'/api/raffles/{launch.raffle}/queue', headers=_headers(launch.buyer)).get_json()
+        assert not joined['admitted']
+        token = joined['queue_token']
+
+        waiting = client.post(url, json=body, headers=_headers(launch.buyer, token))
+        assert waiting.status_code == 429
+        assert int(waiting.headers['Retry-After']) >= 1
+
+        clock[0] += joined['retry_after']
+        status = client.get(f'/api/raffles/{launch.raffle}/queue', headers=_headers(launch.buyer, token))
+        assert status.get_json()['admitted']
+
+        # Past the gate the request reaches the purchase service
+        bought = client.post(url, json=body, headers=_headers(launch.buyer, token))
+        assert bought.status_code not in (403, 429)
+        assert 'queue_required' not in bought.get_json()
+
+    def test_string_raffle_id_is_gated(self, client, room, launch):
+        url = '/api/reservations/tickets'
+        denied = client.post(url, json={'raffle_id': str(launch.raffle), 'quantity': 1},
+                             headers=_headers(launch.buyer))
+        assert denied.status_code == 403 and denied.get_json()['queue_required']
+
+        invalid = client.post(url, json={'raffle_id': 'five', 'quantity': 1}, headers=_headers(launch.buyer))
+        assert invalid.status_code == 400
+
+    def test_token_bound_to_user_and_raffle(self, app, client, room, launch):
+        token = client.post(f'/api/raffles/{launch.raffle}/queue',
+                            headers=_headers(launch.buyer)).get_json()['queue_token']
+        with app.test_request_context():
+            assert WaitingRoomService.check_admission(launch.raffle, launch.buyer + 1, token)[1] == 403
+            assert WaitingRoomService.check_admission(launch.raffle + 1, launch.buyer, token) is None
+
+    def test_no_gate_after_launch_window(self, app, room, launch, clock):
+        clock[0] += 901
+        with app.test_request_context():
+            assert WaitingRoomService.check_admission(launch.raffle, launch.buyer, None) is None
+            assert WaitingRoomService.join(launch.raffle, launch.buyer)[0]['admitted']
+
+class TestWaitingRoomLoad:
+    def test_admissions_follow_configured_rate(self, app, room, launch, clock):
+        """2,000 users arrive in the first second; admissions stay at RATE per second"""
+        users = range(1, 2001)
+        start = clock[0]
+        with app.test_request_context():
+            tokens = {}
+            for n, user_id in enumerate(users):
+                clock[0] = start + n / 2000
+                tokens[user_id] = WaitingRoomService.join(launch.raffle, user_id)[0]['queue_token']
+
+            # Clients poll again after the Retry-After they were given
+            polls = [(start + 1, user_id) for user_id in users]
+            heapq.heapify(polls)
+            admitted_at = {}
+            while polls:
+                clock[0], user_id = heapq.heappop(polls)
+                denied = WaitingRoomService.check_admission(launch.raffle, user_id, tokens[user_id])
+                if denied is None:
+                    admitted_at[user_id] = clock[0]
+                else:
+                    heapq.heappush(polls, (clock[0] + max(1, denied[0]['retry_after']), user_id))
+            pending = set(users) - set(admitted_at)
+
+        assert not pending
+        per_second = Counter(int(t - start) for t in admitted_at.values())
+        # The head start is admitted at once; afterwards the write rate is flat
+        assert per_second[1] <= BURST + 2 * RATE
+        assert max(count for second, count in per_second.items() if second > 1) <= RATE + 1
+        expected = (len(users) - BURST) / RATE
+        assert max(admitted_at.values()) - start == pytest.approx(expected, abs=1.5)
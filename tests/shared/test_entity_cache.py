@@ -0,0 +1,75 @@
+# tests/shared/test_entity_cache.py
+
+from types import SimpleNamespace
+import pytest
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import update
+from src.shared import db
+from src.shared.auth import create_token
+from src.shared.entity_cache import EntityCache
+from src.raffle_service.models import Raffle, RaffleStatus, Ticket, TicketStatus
+from src.user_service.models import User
+
+@pytest.fixture
+def raffle(db_session):
+    """An active raffle with 5 available tickets and a buyer with credits"""
+    buyer = User(username='cached', email='cached@test.com', site_credits=50)
+    db_session.add(buyer)
+    db_session.flush()
+    raffle = Raffle(
+        title='Cached',
+        total_tickets=5,
+        ticket_price=1.0,
+        start_time=datetime.now(timezone.utc) - timedelta(hours=1),
+        end_time=datetime.now(timezone.utc) + timedelta(days=1),
+        status=RaffleStatus.ACTIVE.value,
+        max_tickets_per_user=5,
+        created_by_id=buyer.id
+    )
+    db_session.add(raffle)
+    db_session.flush()
+    db_session.add_all([
+        Ticket(raffle_id=raffle.id, ticket_id=f"{raffle.id}-{n:03d}", ticket_number=f"{n:03d}",
+               status=TicketStatus.AVAILABLE.value)
+        for n in range(1, 6)
+    ])
+    db_session.commit()
+    ids = SimpleNamespace(raffle=raffle.id, buyer=buyer.id)
+    db_session.expunge_all()
+    return ids
+
+class TestEntityCache:
+    def test_lookup_survives_commit_within_request(self, app, db_session, raffle, query_budget):
+        with app.test_request_context():
+            first = EntityCache.get(Raffle, raffle.raffle)
+            db.session.commit()
+
+            with query_budget(max_statements=0) as stats:
+                again = EntityCache.get(Raffle, raffle.raffle)
+                assert again.title == 'Cached' and again.max_tickets_per_user == 5
+            assert again is first
+            assert stats.counters['entity_cache_hits'] == 1
+
+    def test_flushed_change_is_reloaded(self, app, db_session, raffle):
+        with app.test_request_context():
+            EntityCache.get(Raffle, raffle.raffle).title = 'Renamed'
+            db.session.commit()
+            assert EntityCache.get(Raffle, raffle.raffle).title == 'Renamed'
+
+            db.session.execute(update(Raffle).where(Raffle.id == raffle.raffle).values(title='Bulk'),
+                               execution_options={'synchronize_session': False})
+            db.session.commit()
+            assert EntityCache.get(Raffle, raffle.raffle).title == 'Bulk'
+
+    def test_no_memoization_outside_a_request(self, app, db_session, raffle, query_budget):
+        EntityCache.get(Raffle, raffle.raffle)
+        db.session.commit()
+        with query_budget(max_statements=1) as stats:
+            EntityCache.get(Raffle, raffle.raffle).title
+        assert stats.statement_count == 1 and not stats.counters
+
+    def test_purchase_reports_hits(self, client, db_session, raffle):
+        headers = {'Authorization': f'Bearer {create_token(raffle.buyer)}'}
+        response = client.post(f'/api/raffles/{raffle.raffle}/tickets', json={'quantity': 2}, headers=headers)
+        assert response.status_code == 201, response.get_json()
+        assert int(response.headers['X-Entity-Cache-Hits']) >= 2
@@ -0,0 +1,136 @@
+# tests/shared/test_idempotency.py
+
+import threading
+import time
+import pytest
+from datetime import datetime, timezone, timedelta
+from src.shared import db
+from src.shared.auth import create_token
+from src.shared.idempotency import Idempotency, IdempotencyRecord, IDEMPOTENCY_KEY_HEADER, REPLAYED_HEADER
+from src.raffle_service.services.payment_service import PaymentService
+from src.raffle_service.services.reservation_service import ReservationService
+from src.user_service.models import User
+
+@pytest.fixture
+def buyer(db_session):
+    user = User(username='retrier', email='retrier@test.com')
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+    db_session.expunge_all()
+    Idempotency.clear()
+    yield user_id
+    Idempotency.clear()
+
+@pytest.fixture
+def confirm_calls(monkeypatch):
+    """Replace payment confirmation with a slow counter"""
+    calls = []
+
+    def confirm(payment_intent_id, user_id):
+        calls.append(payment_intent_id)
+        time.sleep(0.05)
+        return {'intent': payment_intent_id, 'call': len(calls)}, None
+
+    monkeypatch.setattr(PaymentService, 'confirm_payment', staticmethod(confirm))
+    return calls
+
+def _headers(user_id, key):
+    return {'Authorization': f'Bearer {create_token(user_id)}', IDEMPOTENCY_KEY_HEADER: key}
+
+class TestIdempotency:
+    def test_duplicate_is_replayed_without_rerunning(self, client, buyer, confirm_calls):
+        first = client.post('/api/payments/intents/pi_1/confirm', headers=_headers(buyer, 'k1'))
+        Idempotency.clear()   # force the second lookup through the table
+        second = client.post('/api/payments/intents/pi_1/confirm', headers=_headers(buyer, 'k1'))
+        third = client.post('/api/payments/intents/pi_1/confirm', headers=_headers(buyer, 'k1'))
+
+        assert confirm_calls == ['pi_1']
+        assert first.get_json() == second.get_json() == third.get_json() == {'intent': 'pi_1', 'call': 1}
+        assert REPLAYED_HEADER not in first.headers
+        assert second.headers[REPLAYED_HEADER] == 'true'
+
+    def test_without_key_every_request_runs(self, client, buyer, confirm_calls):
+        headers = {'Authorization': f'Bearer {create_token(buyer)}'}
+        client.post('/api/payments/intents/pi_1/confirm', headers=headers)
+        client.post('/api/payments/intents/pi_1/confirm', headers=headers)
+        assert len(confirm_calls) == 2
+
+    def test_key_reused_for_a_different_request(self, client, buyer, monkeypatch):
+        monkeypatch.setattr(ReservationService, 'create_reservation',
+                            staticmethod(lambda user_id, raffle_id, quantity: ({'quantity': quantity}, None)))
+        ok = client.post('/api/reservations/tickets', json={'raffle_id': 1, 'quantity': 2},
+                         headers=_headers(buyer, 'k2'))
+        other = client.post('/api/reservations/tickets', json={'raffle_id': 1, 'quantity': 3},
+                            headers=_headers(buyer, 'k2'))
+        assert ok.status_code == 200
+        assert other.status_code == 422
+
+    def test_concurrent_duplicates_wait_for_the_first(self, app, buyer, confirm_calls):
+        statuses = []
+        headers = _headers(buyer, 'k3')
+
+        def post():
+            response = app.test_client().post('/api/payments/intents/pi_2/confirm', headers=headers)
+            statuses.append((response.status_code, response.get_json()['call']))
+
+        threads = [threading.Thread(target=post) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert confirm_calls == ['pi_2']
+        assert statuses == [(200, 1)] * 5
+
+    def test_server_error_releases_the_key(self, client, buyer, monkeypatch):
+        outcomes = iter([RuntimeError('gateway down'), ({'ok': True}, None)])
+
+        def confirm(payment_intent_id, user_id):
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(PaymentService, 'confirm_payment', staticmethod(confirm))
+        assert client.post('/api/payments/intents/pi_3/confirm', headers=_headers(buyer, 'k4')).status_code == 500
+        retry = client.post('/api/payments/intents/pi_3/confirm', headers=_headers(buyer, 'k4'))
+        assert retry.status_code == 200 and REPLAYED_HEADER not in retry.headers
+
+    def test_in_flight_elsewhere_then_abandoned(self, app, client, db_session, buyer, confirm_calls):
+        key_hash = Idempotency.digest('payment.confirm_payment', buyer, 'k5')
+        fingerprint = Idempotency.digest('POST', '/api/payments/intents/pi_4/confirm', '')
+        now = datetime.now(timezone.utc)
+        db_session.add(IdempotencyRecord(key_hash=key_hash, fingerprint=fingerprint,
+                                         created_at=now, expires_at=now + timedelta(days=1)))
+        db_session.commit()
+
+        previous = app.config['IDEMPOTENCY_WAIT_TIMEOUT']
+        app.config['IDEMPOTENCY_WAIT_TIMEOUT'] = 0.1
+        try:
+            busy = client.post('/api/payments/intents/pi_4/confirm', headers=_headers(buyer, 'k5'))
+            assert busy.status_code == 409 and busy.headers['Retry-After'] == '1'
+
+            # A worker that died mid-request leaves its claim; it is taken over after the lock timeout
+            db.session.execute(
+                IdempotencyRecord.__table__.update().values(created_at=now - timedelta(minutes=5))
+            )
+            db.session.commit()
+            taken = client.post('/api/payments/intents/pi_4/confirm', headers=_headers(buyer, 'k5'))
+        finally:
+            app.config['IDEMPOTENCY_WAIT_TIMEOUT'] = previous
+
+        assert taken.status_code == 200
+        assert confirm_calls == ['pi_4']
+
+    def test_purge_expired(self, app, db_session, buyer):
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            IdempotencyRecord(key_hash=b'a' * 32, fingerprint=b'x' * 32, status_code=200, response=b'{}',
+                              created_at=now - timedelta(days=2), expires_at=now - timedelta(days=1)),
+            IdempotencyRecord(key_hash=b'b' * 32, fingerprint=b'x' * 32, status_code=200, response=b'{}',
+                              created_at=now, expires_at=now + timedelta(days=1)),
+        ])
+        db_session.commit()
+        assert Idempotency.purge_expired() == 1
+        assert db_session.query(IdempotencyRecord).count() == 1
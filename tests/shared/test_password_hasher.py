@@ -0,0 +1,129 @@
+# tests/shared/test_password_hasher.py
+
+import threading
+from types import SimpleNamespace
+import pytest
+from src.shared import password_hasher
+from src.shared.password_hasher import PasswordHasher, FailedLoginCache, HashingUnavailable
+from src.shared.auth import create_token
+from src.user_service.models import User
+
+LOGIN_URL = '/api/users/login'
+
+@pytest.fixture
+def member(db_session):
+    user = User(username='member', email='member@test.com', auth_provider='local')
+    user.set_password('correct-horse')
+    db_session.add(user)
+    db_session.commit()
+    db_session.expunge_all()
+    FailedLoginCache.clear()
+    yield user
+    FailedLoginCache.clear()
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+    real = password_hasher.check_password_hash
+
+    def counting(password_hash, password):
+        calls.append(password)
+        return real(password_hash, password)
+
+    monkeypatch.setattr(password_hasher, 'check_password_hash', counting)
+    return calls
+
+class TestPasswordHasher:
+    def test_hash_and_verify_round_trip(self, app):
+        hashed = PasswordHasher.hash('secret')
+        assert PasswordHasher.verify(hashed, 'secret')
+        assert not PasswordHasher.verify(hashed, 'wrong')
+
+    def test_saturated_pool_fails_fast(self, app):
+        PasswordHasher.configure(workers=1, queue_size=0)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+
+        blocker = threading.Thread(target=PasswordHasher._run, args=(slow,))
+        blocker.start()
+        try:
+            started.wait(5)
+            with pytest.raises(HashingUnavailable):
+                PasswordHasher.hash('secret')
+        finally:
+            release.set()
+            blocker.join()
+            PasswordHasher.configure(
+                workers=app.config['PASSWORD_HASH_WORKERS'],
+                queue_size=app.config['PASSWORD_HASH_QUEUE_SIZE']
+            )
+
+        # Slot released once the blocking job finished
+        assert PasswordHasher.verify(PasswordHasher.hash('secret'), 'secret')
+
+    def test_saturated_password_change_is_429(self, client, db_session, member, monkeypatch):
+        token = create_token(db_session.query(User.id).filter_by(username='member').scalar())
+
+        def saturated(fn, *args):
+            raise HashingUnavailable("Server busy, please retry shortly")
+        monkeypatch.setattr(PasswordHasher, '_run', staticmethod(saturated))
+
+        response = client.put('/api/users/password/change',
+                              headers={'Authorization': f'Bearer {token}'},
+                              json={'current_password': 'correct-horse', 'new_password': 'N3w-password!'})
+
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '1'
+
+class TestFailedLoginCache:
+    def test_repeated_failures_skip_hashing(self, client, member, hash_calls):
+        bad = {'username': 'member', 'password': 'wrong'}
+        for _ in range(FailedLoginCache.DEFAULT_LIMITS['user']):
+            assert client.post(LOGIN_URL, json=bad).status_code == 401
+        hashed_so_far = len(hash_calls)
+
+        response = client.post(LOGIN_URL, json={'username': 'member', 'password': 'correct-horse'})
+
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) > 0
+        assert len(hash_calls) == hashed_so_far
+
+    def test_success_clears_username_failures(self, client, member):
+        client.post(LOGIN_URL, json={'username': 'member', 'password': 'wrong'})
+
+        response = client.post(LOGIN_URL, json={'username': 'member', 'password': 'correct-horse'})
+
+        assert response.status_code == 200
+        assert ('user', 'member') not in FailedLoginCache.snapshot()
+
+    def test_ip_limit_spans_usernames(self, app):
+        FailedLoginCache.configure(window=60, user_limit=100, ip_limit=3)
+        try:
+            for n in range(3):
+                FailedLoginCache.record_failure(f'user{n}', '10.0.0.1')
+            with pytest.raises(HashingUnavailable):
+                FailedLoginCache.check('someone-else', '10.0.0.1')
+            FailedLoginCache.check('someone-else', '10.0.0.2')
+        finally:
+            FailedLoginCache.configure(
+                window=app.config['LOGIN_FAILURE_WINDOW'],
+                user_limit=app.config['LOGIN_FAILURE_LIMIT_USER'],
+                ip_limit=app.config['LOGIN_FAILURE_LIMIT_IP']
+            )
+
+    def test_window_expiry(self, app, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(password_hasher, 'time', SimpleNamespace(monotonic=lambda: clock[0]))
+        for _ in range(FailedLoginCache.DEFAULT_LIMITS['user']):
+            FailedLoginCache.record_failure('member')
+        with pytest.raises(HashingUnavailable):
+            FailedLoginCache.check('member')
+
+        clock[0] += FailedLoginCache.DEFAULT_WINDOW
+
+        FailedLoginCache.check('member')
+        FailedLoginCache.clear()
@@ -0,0 +1,80 @@
+# tests/shared/test_query_profiler.py
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import text
+from src.shared import db
+from src.shared.query_profiler import QueryProfiler, fingerprint
+from src.raffle_service.models import Raffle, RaffleStatus
+
+@pytest.fixture
+def raffle(db_session):
+    raffle = Raffle(
+        title='Profiled Raffle',
+        total_tickets=10,
+        ticket_price=5.0,
+        start_time=datetime.now(timezone.utc),
+        end_time=datetime.now(timezone.utc) + timedelta(days=1),
+        status=RaffleStatus.DRAFT.value,
+        max_tickets_per_user=5,
+        created_by_id=1
+    )
+    db_session.add(raffle)
+    db_session.commit()
+    raffle_id = raffle.id
+    # Start each request from a cold identity map
+    db_session.expunge_all()
+    return raffle_id
+
+class TestFingerprint:
+    def test_literals_collapse(self):
+        assert fingerprint("SELECT * FROM users WHERE id = 7") == \
+            fingerprint("SELECT * FROM users WHERE id = 42")
+        assert fingerprint("SELECT * FROM users WHERE name = 'bob'") == \
+            fingerprint("SELECT * FROM users WHERE name = 'alice'")
+
+    def test_in_lists_collapse(self):
+        assert fingerprint("SELECT * FROM tickets WHERE id IN (?, ?, ?)") == \
+            fingerprint("SELECT * FROM tickets WHERE id IN (?)")
+
+class TestQueryProfiler:
+    def test_counts_statements_and_flags_repeats(self, db_session):
+        with QueryProfiler.profile(repeat_threshold=10) as stats:
+            for user_id in range(12):
+                db_session.execute(text("SELECT id FROM users WHERE id = :id"), {'id': user_id})
+            db_session.execute(text("SELECT count(*) FROM raffles"))
+
+        assert stats.statement_count == 13
+        assert stats.total_time > 0
+        repeated = stats.repeated_shapes()
+        assert len(repeated) == 1
+        assert repeated[0][1] == 12
+
+    def test_nested_profiles_both_record(self, db_session):
+        with QueryProfiler.profile() as outer:
+            db_session.execute(text("SELECT 1"))
+            with QueryProfiler.profile() as inner:
+                db_session.execute(text("SELECT 2"))
+
+        assert outer.statement_count == 2
+        assert inner.statement_count == 1
+
+    def test_response_headers(self, client, raffle):
+        response = client.get(f'/api/raffles/{raffle}')
+
+        assert response.status_code == 200
+        assert int(response.headers['X-Query-Count']) >= 1
+        assert 'X-Query-Time-Ms' in response.headers
+        assert 'X-Query-Max-Repeats' in response.headers
+
+    def test_endpoint_budget(self, client, raffle, query_budget):
+        with query_budget(max_statements=2, max_repeats=1) as stats:
+            response = client.get(f'/api/raffles/{raffle}')
+        assert response.status_code == 200
+        assert stats.statement_count >= 1
+
+    def test_budget_failure(self, db_session, query_budget):
+        with pytest.raises(AssertionError, match="Query budget exceeded"):
+            with query_budget(max_statements=1):
+                db_session.execute(text("SELECT 1"))
+                db_session.execute(text("SELECT 2"))
@@ -0,0 +1,150 @@
+# tests/shared/test_rate_limit.py
+
+import threading
+import time
+from typing import Callable, Dict
+import pytest
+from src.shared.auth import create_token
+from src.shared.query_profiler import QueryProfiler
+from src.shared.rate_limit import (
+    RateLimiter, RatePolicy, MemoryBucketBackend, SharedBucketBackend, _TAKE_SCRIPT, _refill
+)
+from src.user_service.models import User
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class FakeRedis:
+    """In-process stand-in for the Redis calls SharedBucketBackend makes.
+
+    register_script returns a callable that runs the bucket script's logic
+    in Python, so tests exercise the shared backend without a server.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def register_script(self, source: str):
+        if source != _TAKE_SCRIPT:
+            raise NotImplementedError("FakeRedis only runs the token bucket script")
+
+        def run(keys, args):
+            key = keys[0]
+            policy = RatePolicy(float(args[0]), int(args[1]))
+            cost = float(args[2])
+            with self._lock:
+                now = self.clock()
+                state = self.hashes.get(key, {})
+                tokens = float(state.get('tokens', policy.burst))
+                tokens = _refill(tokens, float(state.get('ts', now)), now, policy)
+                allowed, wait = 0, 0.0
+                if tokens >= cost:
+                    tokens -= cost
+                    allowed = 1
+                else:
+                    wait = (cost - tokens) / policy.rate
+                self.hashes[key] = {'tokens': str(tokens), 'ts': str(now)}
+            return [allowed, str(wait)]
+
+        return run
+
+@pytest.fixture
+def limiter(app):
+    """Enable the limiter on the shared test app, restoring it afterwards"""
+    def _enable(**kwargs):
+        RateLimiter.configure(app, **kwargs)
+    yield _enable
+    RateLimiter.configure(app, enabled=False)
+
+@pytest.fixture
+def member_headers(app, db_session):
+    user = User(username='member', email='member@test.com')
+    db_session.add(user)
+    db_session.commit()
+    return user.id, {'Authorization': f'Bearer {create_token(user.id)}'}
+
+@pytest.mark.parametrize('make_backend', [
+    lambda clock: MemoryBucketBackend(clock=clock),
+    lambda clock: SharedBucketBackend(FakeRedis(clock=clock)),
+], ids=['memory', 'shared'])
+class TestBuckets:
+    def test_burst_then_refill(self, make_backend):
+        clock = FakeClock()
+        backend = make_backend(clock)
+        policy = RatePolicy(rate=2, burst=3)
+
+        assert [backend.take('k', policy)[0] for _ in range(4)] == [True, True, True, False]
+        allowed, retry_after = backend.take('k', policy)
+        assert not allowed and retry_after == pytest.approx(0.5)
+
+        clock.now += 0.5
+        assert backend.take('k', policy)[0]
+
+    def test_keys_are_independent(self, make_backend):
+        backend = make_backend(FakeClock())
+        policy = RatePolicy(rate=1, burst=1)
+
+        assert backend.take('a', policy)[0]
+        assert not backend.take('a', policy)[0]
+        assert backend.take('b', policy)[0]
+
+class TestMemoryBackend:
+    def test_full_shard_evicts_least_recently_used(self, monkeypatch):
+        monkeypatch.setattr(MemoryBucketBackend, 'MAX_KEYS_PER_SHARD', 2)
+        backend = MemoryBucketBackend(shards=1, clock=FakeClock())
+        policy = RatePolicy(rate=1, burst=1)
+
+        for key in ('a', 'b', 'a', 'c'):
+            backend.take(key, policy)
+
+        assert list(backend._shards[0][1]) == ['a', 'c']
+        assert not backend.take('a', policy)[0]
+        assert backend.take('b', policy)[0]   # evicted, so it starts full again
+
+class TestTokenRequiredLimits:
+    def test_user_bucket_rejects_before_db(self, client, member_headers, limiter):
+        user_id, headers = member_headers
+        limiter(policies={'user.get_user_activities': {'user': (0.01, 2)}})
+        url = f'/api/users/activities/{user_id}'
+
+        assert client.get(url, headers=headers).status_code == 200
+        assert client.get(url, headers=headers).status_code == 200
+        with QueryProfiler.profile() as stats:
+            response = client.get(url, headers=headers)
+
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
+        assert response.get_json()['scope'] == 'user'
+        assert stats.statement_count == 0
+
+    def test_ip_bucket_checked_before_token(self, client, limiter):
+        limiter(defaults={'ip': (0.01, 1)})
+
+        assert client.get('/api/users/activities/1').status_code == 401
+        response = client.get('/api/users/activities/1')
+
+        assert response.status_code == 429
+        assert response.get_json()['scope'] == 'ip'
+
+    def test_endpoint_policy_has_its_own_bucket(self, client, member_headers, limiter):
+        user_id, headers = member_headers
+        limiter(policies={'tickets.reveal_tickets': {'user': (0.01, 1)}})
+
+        client.post('/api/tickets/api/raffles/tickets/reveal', json={'ticket_ids': []}, headers=headers)
+        limited = client.post('/api/tickets/api/raffles/tickets/reveal', json={'ticket_ids': []}, headers=headers)
+
+        assert limited.status_code == 429
+        assert client.get(f'/api/users/activities/{user_id}', headers=headers).status_code == 200
+
+    def test_disabled_limiter_allows_everything(self, client, member_headers, limiter):
+        user_id, headers = member_headers
+        limiter(enabled=False, defaults={'user': (0.01, 1)})
+
+        statuses = {client.get(f'/api/users/activities/{user_id}', headers=headers).status_code for _ in range(3)}
+        assert statuses == {200}
@@ -0,0 +1,105 @@
+# tests/user_service/test_activity_pagination.py
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from src.shared.auth import create_token
+from src.user_service.models import User, UserActivity
+from src.user_service.services.activity_service import ActivityService
+
+@pytest.fixture
+def member(db_session):
+    user = User(username='member', email='member@test.com')
+    user.set_password('secret123')
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+def _log(db_session, user_id, count, activity_type='login', status='success', same_time=False):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    db_session.add_all([
+        UserActivity(
+            user_id=user_id,
+            activity_type=activity_type,
+            status=status,
+            created_at=base if same_time else base + timedelta(minutes=n)
+        )
+        for n in range(count)
+    ])
+    db_session.commit()
+    db_session.expunge_all()
+
+class TestActivityPagination:
+    def test_pages_cover_every_row_once(self, app, db_session, member):
+        # Identical timestamps: the id tie-break must still give a total order
+        _log(db_session, member, 7, same_time=True)
+
+        seen, cursor = [], None
+        while True:
+            page, error = ActivityService.get_user_activities(member, cursor=cursor, limit=3)
+            assert error is None
+            seen.extend(a.id for a in page['activities'])
+            if not page['has_more']:
+                break
+            cursor = page['next_cursor']
+
+        assert len(seen) == 7
+        assert seen == sorted(seen, reverse=True)
+
+    def test_newest_first(self, app, db_session, member):
+        _log(db_session, member, 5)
+
+        page, _ = ActivityService.get_user_activities(member, limit=2)
+
+        times = [a.created_at for a in page['activities']]
+        assert times == sorted(times, reverse=True)
+        assert page['has_more'] and page['next_cursor']
+
+    def test_invalid_cursor(self, app, db_session, member):
+        page, error = ActivityService.get_user_activities(member, cursor='not-a-cursor')
+        assert page is None
+        assert error == "Invalid cursor"
+
+    def test_estimate_is_capped(self, app, db_session, member, monkeypatch):
+        from src.user_service.services import activity_service
+        monkeypatch.setattr(activity_service, 'ACTIVITY_COUNT_CAP', 5)
+        _log(db_session, member, 8, activity_type='login')
+        _log(db_session, member, 2, activity_type='logout')
+
+        capped, _ = ActivityService.estimate_activity_count(activity_type='login')
+        small, _ = ActivityService.estimate_activity_count(activity_type='logout')
+
+        assert capped == {'value': 5, 'exact': False}
+        assert small == {'value': 2, 'exact': True}
+
+class TestActivityEndpoints:
+    def test_admin_filters_and_paginates(self, client, db_session, member, admin_headers):
+        _log(db_session, member, 4, status='success')
+        _log(db_session, member, 3, status='failed')
+
+        first = client.get(
+            '/api/users/admin/activities?status=failed&limit=2&count=estimate',
+            headers=admin_headers
+        ).get_json()
+        second = client.get(
+            f"/api/users/admin/activities?status=failed&limit=2&cursor={first['next_cursor']}",
+            headers=admin_headers
+        ).get_json()
+
+        assert len(first['activities']) == 2 and first['has_more']
+        assert len(second['activities']) == 1 and not second['has_more']
+        assert {a['status'] for a in first['activities'] + second['activities']} == {'failed'}
+        assert first['count_estimate'] == {'value': 3, 'exact': True}
+        assert 'count_estimate' not in second
+
+    def test_user_sees_own_page(self, app, client, db_session, member):
+        _log(db_session, member, 3)
+        headers = {'Authorization': f'Bearer {create_token(member)}'}
+
+        response = client.get(f'/api/users/activities/{member}?limit=2', headers=headers)
+
+        assert response.status_code == 200
+        assert len(response.get_json()['activities']) == 2
+
+    def test_bad_cursor_is_rejected(self, client, db_session, admin_headers):
+        response = client.get('/api/users/admin/activities?cursor=%%%', headers=admin_headers)
+        assert response.status_code == 400
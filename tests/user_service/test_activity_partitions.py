@@ -0,0 +1,109 @@
+# tests/user_service/test_activity_partitions.py
+
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import inspect, text
+from src.shared import db
+from src.user_service.models import User, UserActivity, ActivityPartition, PartitionStatus
+from src.user_service.services.activity_service import ActivityService
+from src.user_service.services.activity_partitions import ActivityPartitionService
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+@pytest.fixture
+def member(db_session):
+    user = User(username='member', email='member@test.com')
+    user.set_password('secret123')
+    db_session.add(user)
+    db_session.commit()
+    yield user.id
+    # Rotated tables are outside the model metadata, so drop_all misses them
+    for name in inspect(db.engine).get_table_names():
+        if name.startswith('user_activities_'):
+            db_session.execute(text(f"DROP TABLE {name}"))
+    db_session.commit()
+
+def _log(db_session, user_id, *days):
+    db_session.add_all([
+        UserActivity(user_id=user_id, activity_type='login', status='success', created_at=day)
+        for day in days
+    ])
+    db_session.commit()
+    db_session.expunge_all()
+
+def _all_pages(**kwargs):
+    seen, cursor = [], None
+    while True:
+        page, error = ActivityService.get_all_activities(cursor=cursor, limit=2, **kwargs)
+        assert error is None
+        seen.extend(page['activities'])
+        if not page['has_more']:
+            return seen
+        cursor = page['next_cursor']
+
+class TestActivityPartitions:
+    def test_rotation_moves_closed_months_out(self, app, db_session, member):
+        _log(db_session, member,
+             datetime(2026, 8, 30), datetime(2026, 9, 2), datetime(2026, 9, 28),
+             datetime(2026, 10, 1), datetime(2026, 10, 5))
+
+        created, error = ActivityPartitionService.ensure_partitions(now=NOW)
+
+        assert error is None and created == ['user_activities_202609']
+        assert UserActivity.query.count() == 2
+        partition = ActivityPartition.query.one()
+        assert partition.range_start == datetime(2026, 8, 1)
+        assert partition.range_end == datetime(2026, 10, 1)
+
+        # Nothing left to rotate until the next month ends
+        assert ActivityPartitionService.ensure_partitions(now=NOW) == ([], None)
+
+    def test_ids_keep_increasing_after_rotation(self, app, db_session, member):
+        _log(db_session, member, datetime(2026, 9, 2), datetime(2026, 9, 3))
+        ActivityPartitionService.ensure_partitions(now=NOW)
+
+        _log(db_session, member, datetime(2026, 10, 2))
+
+        assert UserActivity.query.one().id == 3
+
+    def test_queries_span_and_route_partitions(self, app, db_session, member):
+        _log(db_session, member, datetime(2026, 8, 5), datetime(2026, 9, 5),
+             datetime(2026, 9, 6), datetime(2026, 10, 5))
+        ActivityPartitionService.ensure_partitions(now=datetime(2026, 9, 1, tzinfo=timezone.utc))
+        ActivityPartitionService.ensure_partitions(now=NOW)
+
+        everything = _all_pages()
+        assert [a.created_at.month for a in everything] == [10, 9, 9, 8]
+
+        october = ActivityPartitionService.routed_tables(start_date=datetime(2026, 10, 1))
+        assert [t.name for t in october] == ['user_activities']
+        september = _all_pages(start_date=datetime(2026, 9, 1), end_date=datetime(2026, 9, 30))
+        assert [a.created_at.day for a in september] == [6, 5]
+
+        estimate, _ = ActivityService.estimate_activity_count()
+        assert estimate == {'value': 4, 'exact': True}
+
+    def test_purge_drops_whole_partitions(self, app, db_session, member):
+        _log(db_session, member, datetime(2026, 8, 5), datetime(2026, 9, 5), datetime(2026, 10, 5))
+        ActivityPartitionService.ensure_partitions(now=datetime(2026, 9, 1, tzinfo=timezone.utc))
+        ActivityPartitionService.ensure_partitions(now=NOW)
+
+        purged, error = ActivityPartitionService.purge(retention_months=1, now=NOW)
+
+        assert error is None
+        assert [p['name'] for p in purged] == ['user_activities_202608']
+        assert 'user_activities_202608' not in inspect(db.engine).get_table_names()
+        assert [a.created_at.month for a in _all_pages()] == [10, 9]
+
+    def test_detach_keeps_table_but_stops_routing(self, app, db_session, member):
+        _log(db_session, member, datetime(2026, 9, 5), datetime(2026, 10, 5))
+        ActivityPartitionService.ensure_partitions(now=NOW)
+
+        purged, _ = ActivityPartitionService.purge(retention_months=0, mode='detach', now=NOW)
+
+        assert purged[0]['status'] == PartitionStatus.DETACHED.value
+        assert 'user_activities_202609' in inspect(db.engine).get_table_names()
+        assert [a.created_at.month for a in _all_pages()] == [10]
+
+    def test_invalid_mode(self, app, db_session, member):
+        assert ActivityPartitionService.purge(3, mode='truncate')[1] is not None